@@ -1,82 +1,247 @@
-"""Behave environment setup and teardown"""
-import os
-import logging
-from datetime import datetime
-from utils.browser_factory import BrowserFactory
-from utils.config import Config
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-def before_all(context):
-    """Setup before all tests"""
-    # Create necessary directories
-    os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
-    os.makedirs(Config.ALLURE_RESULTS_DIR, exist_ok=True)
-    
-    # Configure context
-    context.config.setup_logging()
-    
-    # Store start time
-    context.start_time = datetime.now()
-    
-    logging.info("Starting test execution")
-
-def before_feature(context, feature):
-    """Setup before each feature"""
-    # Skip features with @skip tag
-    if "skip" in feature.tags:
-        feature.skip("Marked with @skip")
-        return
-    
-    logging.info(f"Starting feature: {feature.name}")
-
-def before_scenario(context, scenario):
-    """Setup before each scenario"""
-    # Skip scenarios with @skip tag
-    if "skip" in scenario.effective_tags:
-        scenario.skip("Marked with @skip")
-        return
-    
-    # Get browser from command line or use default
-    browser_name = context.config.userdata.get("browser", Config.DEFAULT_BROWSER)
-    
-    # Create WebDriver
-    context.driver = BrowserFactory.create_driver(browser_name)
-    
-    logging.info(f"Starting scenario: {scenario.name}")
-
-def after_scenario(context, scenario):
-    """Cleanup after each scenario"""
-
-    if hasattr(context, 'driver'):
-        # Take screenshot on failure
-        if scenario.status == "failed" and Config.TAKE_SCREENSHOT_ON_FAILURE:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_name = f"{scenario.name.replace(' ', '_')}_{timestamp}.png"
-            screenshot_path = os.path.join(Config.SCREENSHOT_DIR, screenshot_name)
-
-            try:
-                context.driver.save_screenshot(screenshot_path)
-                logging.info(f"Screenshot saved: {screenshot_path}")
-            except Exception as e:
-                logging.error(f"Failed to take screenshot: {e}")
-
-        # Quit WebDriver
-        BrowserFactory.quit_driver(context.driver)
-
-    logging.info(f"Completed scenario: {scenario.name} - Status: {scenario.status}")
-
-def after_feature(context, feature):
-    """Cleanup after each feature"""
-    logging.info(f"Completed feature: {feature.name}")
-
-def after_all(context):
-    """Cleanup after all tests"""
-    end_time = datetime.now()
-    duration = end_time - context.start_time
-    
+"""Behave environment setup and teardown"""
+import os
+import json
+import logging
+from datetime import datetime
+import allure
+from utils.browser_factory import BrowserFactory, driver_pool
+from utils.config import Config
+from utils.local_server import LocalAppServer
+from utils.command_tracer import command_tracer
+from utils.screenshot_pipeline import screenshot_pipeline
+from utils.results_store import ResultsStore
+from utils.flakiness import flakiness_tracker, patch_scenario_with_rerun
+from utils.network_blocking import network_blocker
+from utils.profiler import step_profiler
+from utils.browser_memory import memory_monitor
+from utils.test_data import TestDataPool
+from utils.scheduler import scenario_key
+from pages.base_page import BasePage
+from pages.page_registry import PageRegistry
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+def before_all(context):
+    """Setup before all tests"""
+    # Create necessary directories
+    os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
+    os.makedirs(Config.ALLURE_RESULTS_DIR, exist_ok=True)
+    
+    # Configure context
+    context.config.setup_logging()
+    
+    # Select the target environment, e.g. -D test_env=local
+    test_env = context.config.userdata.get("test_env")
+    if test_env:
+        os.environ["TEST_ENV"] = test_env
+    
+    # Serve the local stand-in app when running offline
+    context.local_server = None
+    if Config.get_test_env() == "local":
+        context.local_server = LocalAppServer.ensure_running()
+    
+    # Record DevTools network logs to count what the blocking profiles saved, e.g. -D network_stats=1;
+    # set before any browser starts, since the performance log is a launch option
+    Config.NETWORK_STATS = context.config.userdata.getbool("network_stats", Config.NETWORK_STATS)
+    
+    # Launch the next browser in the background while scenarios run, e.g. -D warm_spares=1
+    warm_spares = int(context.config.userdata.get("warm_spares", Config.WARM_SPARES))
+    BrowserFactory.enable_warm_spares(context.config.userdata.get("browser", Config.DEFAULT_BROWSER), warm_spares)
+    
+    # Rerun failed scenarios in-process up to N more times, e.g. -D rerun=2
+    context.rerun_attempts = int(context.config.userdata.get("rerun", Config.RERUN_ATTEMPTS))
+    
+    # Seeded test data shared by all workers of a run, e.g. -D data_seed=1234 to reproduce one
+    data_seed = context.config.userdata.get("data_seed")
+    if data_seed:
+        os.environ["TEST_DATA_SEED"] = str(data_seed)
+    context.test_data_pool = TestDataPool()
+    logging.info(f"Test data seed: {context.test_data_pool.seed}")
+    
+    # Sample where each step spends its time, e.g. -D profile=1
+    context.profiling = context.config.userdata.getbool("profile", False)
+    if context.profiling:
+        step_profiler.start()
+    
+    # Store start time
+    context.start_time = datetime.now()
+    
+    logging.info("Starting test execution")
+
+def before_feature(context, feature):
+    """Setup before each feature"""
+    # Skip features with @skip tag
+    if "skip" in feature.tags:
+        feature.skip("Marked with @skip")
+        return
+    
+    if context.rerun_attempts:
+        for scenario in feature.scenarios:
+            patch_scenario_with_rerun(scenario, context.rerun_attempts + 1)
+    
+    logging.info(f"Starting feature: {feature.name}")
+
+def before_scenario(context, scenario):
+    """Setup before each scenario"""
+    # Skip scenarios with @skip tag
+    if "skip" in scenario.effective_tags:
+        scenario.skip("Marked with @skip")
+        return
+    
+    if context.profiling:
+        step_profiler.start_scenario()
+    if Config.TRACE_WEBDRIVER_COMMANDS:
+        command_tracer.start_scenario(scenario.name, str(scenario.location))
+    
+    # Get browser from command line or use default
+    browser_name = context.config.userdata.get("browser", Config.DEFAULT_BROWSER)
+    context.browser_name = browser_name
+    
+    # Reuse a pooled WebDriver unless the scenario needs a fresh browser; reruns always get one
+    context.reuse_browser = context.config.userdata.getbool("reuse_browser", Config.REUSE_BROWSER)
+    fresh = (not context.reuse_browser
+             or Config.FRESH_BROWSER_TAG in scenario.effective_tags
+             or context.config.userdata.getbool("fresh_browser", False)
+             or getattr(scenario, "rerun_attempt", 1) > 1)
+    context.driver = driver_pool.acquire(browser_name, fresh=fresh)
+    
+    # Block requests per profile, e.g. -D network_profile=images+fonts or a @network_none tag
+    context.network_profile = network_blocker.profile_for(
+        scenario.effective_tags, context.config.userdata.get("network_profile"))
+    network_blocker.apply(context.driver, context.network_profile)
+    
+    # One page object per class for this scenario
+    context.pages = PageRegistry(context.driver)
+    
+    # This scenario's draws from the seeded test data pool
+    context.test_data = context.test_data_pool.for_scenario(scenario_key(scenario))
+    
+    logging.info(f"Starting scenario: {scenario.name}")
+
+def before_step(context, step):
+    """Group WebDriver commands by step"""
+    if Config.TRACE_WEBDRIVER_COMMANDS:
+        command_tracer.start_step(f"{step.keyword} {step.name}")
+    if context.profiling:
+        step_profiler.start_step(f"{step.keyword} {step.name}")
+
+def after_step(context, step):
+    if Config.TRACE_WEBDRIVER_COMMANDS:
+        command_tracer.end_step()
+    if context.profiling:
+        step_profiler.end_step()
+
+def after_scenario(context, scenario):
+    """Cleanup after each scenario"""
+
+    if hasattr(context, 'driver'):
+        # Take screenshot on failure; it is written to disk in the background
+        if scenario.status == "failed" and Config.TAKE_SCREENSHOT_ON_FAILURE:
+            screenshot_pipeline.capture(context.driver, scenario.name)
+
+        # Count the requests the network profile blocked
+        if Config.NETWORK_STATS:
+            network_blocker.collect(context.driver, context.network_profile)
+
+        # Return WebDriver to the pool, or quit it when reuse is disabled; the pool samples the
+        # session's memory and recycles it past the scenario-count and memory thresholds
+        driver_pool.release(context.driver, context.browser_name, discard=not context.reuse_browser,
+                            label=scenario.name)
+        
+        # Attach the scenario's WebDriver command trace to the Allure result
+        trace = command_tracer.end_scenario() if Config.TRACE_WEBDRIVER_COMMANDS else None
+        if trace:
+            trace["summary"] = command_tracer.summarize_scenario(trace)
+            allure.attach(json.dumps(trace, indent=2), name="WebDriver commands",
+                          attachment_type=allure.attachment_type.JSON)
+
+    # Report how many element lookups the page objects saved
+    if hasattr(context, 'pages'):
+        stats = context.pages.cache_stats()
+        logging.info(f"Element cache: {stats['hits']} hits, {stats['misses']} misses, "
+                     f"{stats['evictions']} evictions")
+    
+    # Report how long the scenario spent synchronizing
+    wait_timings = BasePage.pop_wait_timings()
+    if wait_timings:
+        total_wait = sum(elapsed for _, elapsed in wait_timings)
+        slowest, slowest_elapsed = max(wait_timings, key=lambda timing: timing[1])
+        logging.info(f"Waited {total_wait:.2f}s across {len(wait_timings)} conditions "
+                     f"(slowest: {slowest} {slowest_elapsed:.2f}s)")
+
+    flakiness_tracker.record(scenario)
+    
+    # Generated data is reproduced from the run's seed
+    if scenario.status == "failed" and getattr(context, "test_data", None) and context.test_data.draws:
+        logging.info(f"Scenario used generated test data; reproduce with -D data_seed={context.test_data_pool.seed}")
+    
+    logging.info(f"Completed scenario: {scenario.name} - Status: {scenario.status}")
+    
+    # Write the scenario's collapsed stacks and flamegraph
+    if context.profiling:
+        # Reruns get their own profile, so the failed attempt's samples are kept
+        attempt = getattr(scenario, "rerun_attempt", 1)
+        flamegraph_path = step_profiler.end_scenario(
+            f"{scenario.location.filename}:{scenario.location.line} {scenario.name}"
+            + (f" attempt {attempt}" if attempt > 1 else ""))
+        if flamegraph_path:
+            logging.info(f"Flamegraph written to {flamegraph_path}")
+
+def after_feature(context, feature):
+    """Cleanup after each feature"""
+    logging.info(f"Completed feature: {feature.name}")
+
+def after_all(context):
+    """Cleanup after all tests"""
+    end_time = datetime.now()
+    duration = end_time - context.start_time
+    
+    # Quit pooled WebDrivers and any warm spares
+    driver_pool.shutdown()
+    BrowserFactory.shutdown_spares()
+    
+    # Finish writing failure screenshots and apply the directory's size and age caps
+    screenshot_pipeline.close()
+    
+    # Write the run's WebDriver command trace and summarize the slowest commands
+    if Config.TRACE_WEBDRIVER_COMMANDS and command_tracer.scenarios:
+        trace_path = command_tracer.write_trace()
+        logging.info(f"WebDriver command trace written to {trace_path}")
+        command_tracer.log_summary()
+    
+    # Rank the functions that took the most time, WebDriver waits apart from local Python
+    if context.profiling:
+        step_profiler.stop()
+        logging.info(f"Profile table written to {step_profiler.write_top_table()}")
+        step_profiler.log_summary()
+    
+    # Report browser memory over time, per process and per browser context, and any recycles
+    memory_monitor.log_summary()
+    
+    # Report the requests and bytes the network blocking profiles saved
+    if Config.NETWORK_STATS:
+        network_blocker.log_summary()
+        network_blocker.save_sizes()
+    
+    # Score flakiness, list failures for `behave @reports/rerun.txt` and report flaky scenarios apart
+    flakiness_report = flakiness_tracker.finish_run()
+    flakiness_tracker.write_rerun_file(flakiness_report)
+    flakiness_tracker.log_report(flakiness_report)
+    
+    # Index this run's Allure output; parallel workers leave that to the runner after merging
+    if Config.RESULTS_STORE_ENABLED and "PARALLEL_WORKER_INDEX" not in os.environ:
+        store = ResultsStore()
+        try:
+            store.ingest()
+        finally:
+            store.close()
+    
+    # Stop the local stand-in app if this run started it
+    if context.local_server:
+        context.local_server.stop()
+    
     logging.info(f"Test execution completed in {duration}")
\ No newline at end of file
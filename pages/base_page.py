@@ -1,25 +1,136 @@
 import logging
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import time
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException,
+    ElementNotInteractableException, ElementClickInterceptedException
+)
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from pages.element_cache import ElementCache
+from utils.config import Config
+
+# Scripts returning the text of the first element matching a locator, or null.
+# They run in the page, so absence checks are not slowed down by the implicit wait.
+FIRST_ELEMENT_TEXT_SCRIPTS = {
+    By.ID: "var el = document.getElementById(arguments[0]);",
+    By.CLASS_NAME: "var el = document.getElementsByClassName(arguments[0])[0];",
+    By.CSS_SELECTOR: "var el = document.querySelector(arguments[0]);",
+    By.XPATH: "var el = document.evaluate(arguments[0], document, null, "
+              "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;",
+}
+
+# Counts XHR/fetch requests still in flight (hooks are installed on first use)
+# and running CSS/Web animations.
+PAGE_IDLE_SCRIPT = """
+if (!window.__pendingRequests) {
+    window.__pendingRequests = {count: 0};
+    var pending = window.__pendingRequests;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        pending.count++;
+        this.addEventListener('loadend', function() { pending.count--; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function() {
+            pending.count++;
+            return fetch.apply(this, arguments).finally(function() { pending.count--; });
+        };
+    }
+}
+var animations = document.getAnimations ? document.getAnimations().filter(function(a) {
+    return a.playState === 'running';
+}).length : 0;
+return document.readyState === 'complete' && window.__pendingRequests.count === 0 && animations === 0;
+"""
+
+# Marks the current document, so that with the "none" page-load strategy the page
+# being navigated away from is never mistaken for the new one.
+MARK_DOCUMENT_STALE_SCRIPT = "window.__staleDocument = true;"
+
+# True once a new document is parsed and its ready element (if any) is rendered and enabled
+PAGE_READY_SCRIPT = """
+if (window.__staleDocument || document.readyState === 'loading') {
+    return false;
+}
+if (!arguments[0]) {
+    return true;
+}
+var el = document.querySelector(arguments[0]);
+return !!el && !el.disabled && el.getClientRects().length > 0;
+"""
+
+# Bulk queries: one script call returns everything as JSON-compatible values
+QUERY_TEXTS_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function(el) {
+    return el.innerText.trim();
+});
+"""
+
+QUERY_ROWS_SCRIPT = """
+var fields = arguments[1];
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function(row) {
+    var record = {};
+    Object.keys(fields).forEach(function(key) {
+        var el = row.querySelector(fields[key]);
+        record[key] = el ? el.innerText.trim() : null;
+    });
+    return record;
+});
+"""
+
+PAGE_CONTAINS_SCRIPT = """
+var source = document.documentElement.outerHTML;
+var caseSensitive = arguments[1];
+if (!caseSensitive) {
+    source = source.toLowerCase();
+}
+return arguments[0].filter(function(text) {
+    return source.indexOf(caseSensitive ? text : text.toLowerCase()) !== -1;
+});
+"""
 
 
 class BasePage:
     """Base page class with common functionality for all pages"""
 
+    # (description, seconds) for every synchronization wait, in order
+    wait_timings = []
+
+    # Element whose rendering marks the page as usable; replaces the load event
+    # when the page-load strategy is "eager" or "none"
+    READY_LOCATOR = None
+
     def __init__(self, driver):
         self.driver = driver
         self.logger = logging.getLogger(__name__)
+        self.element_cache = ElementCache()
+
+    def _use_cached_element(self, locator, action, locate, recoverable=(StaleElementReferenceException,)):
+        """Run an action on the cached handle for a locator, locating it again if missing or stale."""
+        element = self.element_cache.get(locator)
+        if element is not None:
+            try:
+                return action(element)
+            except recoverable:
+                self.element_cache.evict(locator)
+        element = locate()
+        self.element_cache.put(locator, element)
+        return action(element)
 
     def find_element(self, locator, timeout=10):
         """Find a single element with an explicit wait."""
         try:
-            return WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located(locator)
             )
         except TimeoutException:
             self.logger.error(f"Element not found with locator: {locator}")
             raise
+        self.element_cache.put(locator, element)
+        return element
 
     def find_elements(self, locator, timeout=10):
         """Find multiple elements with an explicit wait."""
@@ -33,34 +144,55 @@ class BasePage:
 
     def click_element(self, locator, timeout=10):
         """Finds an element, waits for it to be clickable, and then clicks it."""
-        try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
+        def locate():
+            try:
+                return WebDriverWait(self.driver, timeout).until(
+                    EC.element_to_be_clickable(locator)
+                )
+            except TimeoutException:
+                self.logger.error(f"Element with locator {locator} was not clickable.")
+                raise
+
+        def click(element):
             element.click()
             return element
-        except TimeoutException:
-            self.logger.error(f"Element with locator {locator} was not clickable.")
-            raise
+
+        # A cached handle that cannot be clicked yet falls back to waiting for clickability
+        return self._use_cached_element(
+            locator, click, locate,
+            recoverable=(StaleElementReferenceException, ElementNotInteractableException,
+                         ElementClickInterceptedException)
+        )
 
     def send_keys_to_element(self, locator, text, timeout=10):
         """Finds an element, clears its content, and sends keys to it."""
-        element = self.find_element(locator, timeout)
-        element.clear()
-        element.send_keys(text)
-        return element
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+            return element
+
+        return self._use_cached_element(locator, type_text, lambda: self.find_element(locator, timeout))
 
     def get_text(self, locator, timeout=10):
         """Get text from an element."""
-        element = self.find_element(locator, timeout)
-        return element.text
+        return self._use_cached_element(
+            locator, lambda element: element.text, lambda: self.find_element(locator, timeout)
+        )
 
     def is_element_visible(self, locator, timeout=10):
         """Check if an element is visible on the page."""
+        element = self.element_cache.get(locator)
+        if element is not None:
+            try:
+                if element.is_displayed():
+                    return True
+            except StaleElementReferenceException:
+                self.element_cache.evict(locator)
         try:
-            WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, timeout).until(
                 EC.visibility_of_element_located(locator)
             )
+            self.element_cache.put(locator, element)
             return True
         except TimeoutException:
             return False
@@ -75,21 +207,129 @@ class BasePage:
         except TimeoutException:
             return False
 
-    def wait_for_url_contains(self, url_part, timeout=10):
-        """Wait for the URL to contain a specific text."""
+    def wait_until(self, condition, description, timeout=10, poll_frequency=0.05):
+        """Wait until a condition is truthy and record how long the wait took."""
+        start = time.perf_counter()
         try:
-            return WebDriverWait(self.driver, timeout).until(EC.url_contains(url_part))
+            return WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(condition)
         except TimeoutException:
-            self.logger.error(f"URL did not contain '{url_part}' within {timeout}s.")
+            self.logger.error(f"Timed out after {timeout}s waiting for {description}.")
             raise
+        finally:
+            elapsed = time.perf_counter() - start
+            BasePage.wait_timings.append((description, elapsed))
+            self.logger.debug(f"Waited {elapsed:.3f}s for {description}")
+
+    @classmethod
+    def pop_wait_timings(cls):
+        """Return and clear the recorded wait timings."""
+        timings = list(cls.wait_timings)
+        cls.wait_timings.clear()
+        return timings
+
+    @staticmethod
+    def to_css_selector(locator):
+        """Convert an ID, class name or CSS locator into a CSS selector."""
+        by, value = locator
+        if by == By.ID:
+            return f"#{value}"
+        if by == By.CLASS_NAME:
+            return f".{value}"
+        if by == By.CSS_SELECTOR:
+            return value
+        raise ValueError(f"Locator cannot be used in a bulk query: {locator}")
+
+    def query_texts(self, locator):
+        """Get the text of every element matching a locator in one round trip."""
+        return self.driver.execute_script(QUERY_TEXTS_SCRIPT, self.to_css_selector(locator))
+
+    def query_rows(self, row_locator, field_locators):
+        """Get one dict of field texts per row element in one round trip.
+
+        Fields missing from a row are returned as None.
+        """
+        fields = {name: self.to_css_selector(locator) for name, locator in field_locators.items()}
+        return self.driver.execute_script(QUERY_ROWS_SCRIPT, self.to_css_selector(row_locator), fields)
+
+    def page_contains(self, texts, case_sensitive=True):
+        """Return which of the texts occur in the page source, without downloading it."""
+        return self.driver.execute_script(PAGE_CONTAINS_SCRIPT, list(texts), case_sensitive)
+
+    def get_first_element_text(self, locator):
+        """Get the text of the first element matching a locator, or None if absent."""
+        by, value = locator
+        script = FIRST_ELEMENT_TEXT_SCRIPTS[by] + " return el ? el.textContent : null;"
+        return self.driver.execute_script(script, value)
+
+    def open(self, url, timeout=10, or_ready=None):
+        """Load a URL and wait for the page to be ready under the configured page-load strategy.
+
+        or_ready is another page whose readiness also ends the wait, e.g. a redirect target.
+        """
+        strategy = Config.get_page_load_strategy()
+        if strategy == "none":
+            self.driver.execute_script(MARK_DOCUMENT_STALE_SCRIPT)
+        self.driver.get(url)
+        self.element_cache.clear()
+        if strategy != "normal":
+            self.wait_until_ready(timeout, or_ready)
+        return self
+
+    def is_ready(self):
+        """Check the page's ready predicate: a parsed document with READY_LOCATOR usable."""
+        selector = self.to_css_selector(self.READY_LOCATOR) if self.READY_LOCATOR else None
+        return bool(self.driver.execute_script(PAGE_READY_SCRIPT, selector))
+
+    def wait_until_ready(self, timeout=10, or_ready=None):
+        """Wait for the page's ready predicate instead of the full load event."""
+        description = f"{type(self).__name__} to be ready"
+        if or_ready is not None:
+            description += f" or {type(or_ready).__name__} to be ready"
+        return self.wait_until(
+            lambda driver: self.is_ready() or (or_ready is not None and or_ready.is_ready()),
+            description, timeout
+        )
+
+    def wait_for_url_contains(self, url_part, timeout=10):
+        """Wait for the URL to contain a specific text."""
+        return self.wait_until(EC.url_contains(url_part), f"URL to contain '{url_part}'", timeout)
+
+    def wait_for_url_change(self, previous_url, timeout=10):
+        """Wait for the URL to change from a previous value."""
+        return self.wait_until(EC.url_changes(previous_url), f"URL to change from '{previous_url}'", timeout)
 
     def wait_for_page_title_contains(self, title, timeout=10):
         """Wait for the page title to contain a specific text."""
-        try:
-            return WebDriverWait(self.driver, timeout).until(EC.title_contains(title))
-        except TimeoutException:
-            self.logger.error(f"Title did not contain '{title}' within {timeout}s.")
-            raise
+        return self.wait_until(EC.title_contains(title), f"title to contain '{title}'", timeout)
+
+    def wait_for_element_present(self, locator, timeout=10):
+        """Wait for an element to be in the DOM."""
+        return self.wait_until(
+            lambda driver: self.get_first_element_text(locator) is not None,
+            f"{locator} to be present", timeout
+        )
+
+    def wait_for_text_to_be(self, locator, expected_text, timeout=10):
+        """Wait for an element's text to equal a value, or for it to be absent when None."""
+        return self.wait_until(
+            lambda driver: self.get_first_element_text(locator) == expected_text,
+            f"{locator} text to be {expected_text!r}", timeout
+        )
+
+    def wait_for_element_swap(self, old_locator, new_locator, timeout=10):
+        """Wait for one element to be replaced by another, e.g. a toggled button."""
+        return self.wait_until(
+            lambda driver: (self.get_first_element_text(new_locator) is not None
+                            and self.get_first_element_text(old_locator) is None),
+            f"{old_locator} to be replaced by {new_locator}", timeout
+        )
+
+    def wait_for_page_idle(self, timeout=10):
+        """Wait until the document is loaded with no pending XHR/fetch or running animation."""
+        return self.wait_until(
+            lambda driver: driver.execute_script(PAGE_IDLE_SCRIPT),
+            "page to be idle", timeout
+        )
 
     def scroll_to_element(self, locator, timeout=10):
         """Scroll to an element."""
@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.config import Config
 
 class CheckoutPage(BasePage):
     """Checkout page objects for all checkout steps"""
@@ -29,13 +30,21 @@ class CheckoutPage(BasePage):
     COMPLETE_TEXT = (By.CLASS_NAME, "complete-text")
     BACK_HOME_BUTTON = (By.ID, "back-to-products")
     
+    # The only step opened by URL is the information form; ready once it can be submitted
+    READY_LOCATOR = CONTINUE_BUTTON
+    
     def __init__(self, driver):
         super().__init__(driver)
-        self.info_url = "https://www.saucedemo.com/checkout-step-one.html"
-        self.overview_url = "https://www.saucedemo.com/checkout-step-two.html"
-        self.complete_url = "https://www.saucedemo.com/checkout-complete.html"
+        base_url = Config.get_environment_url()
+        self.info_url = base_url + "checkout-step-one.html"
+        self.overview_url = base_url + "checkout-step-two.html"
+        self.complete_url = base_url + "checkout-complete.html"
     
     # Step One Methods
+    def navigate_to_checkout_information(self):
+        """Navigate to the checkout information step"""
+        return self.open(self.info_url)
+    
     def enter_first_name(self, first_name):
         """Enter first name"""
         self.send_keys_to_element(self.FIRST_NAME_FIELD, first_name)
@@ -66,6 +75,15 @@ class CheckoutPage(BasePage):
         self.click_element(self.CONTINUE_BUTTON)
         return self
     
+    def wait_for_continue_result(self, timeout=10):
+        """Wait until continue either reaches the overview or shows an error"""
+        self.wait_until(
+            lambda driver: "checkout-step-two.html" in driver.current_url
+                           or self.get_first_element_text(self.ERROR_MESSAGE) is not None,
+            "checkout overview or error message", timeout
+        )
+        return self
+    
     def click_cancel(self):
         """Click cancel button"""
         self.click_element(self.CANCEL_BUTTON)
@@ -107,16 +125,18 @@ class CheckoutPage(BasePage):
         # Ensure items are loaded before fetching details
         self.find_elements(self.CHECKOUT_SUMMARY_ITEMS)
 
-        names = [el.text for el in self.find_elements(self.CHECKOUT_ITEM_NAMES)]
-        prices = [el.text for el in self.find_elements(self.CHECKOUT_ITEM_PRICES)]
-        quantities = [el.text for el in self.find_elements(self.CHECKOUT_ITEM_QUANTITIES)]
+        rows = self.query_rows(self.CHECKOUT_SUMMARY_ITEMS, {
+            'name': self.CHECKOUT_ITEM_NAMES,
+            'price': self.CHECKOUT_ITEM_PRICES,
+            'quantity': self.CHECKOUT_ITEM_QUANTITIES,
+        })
 
         summary_items = []
-        for i, name in enumerate(names):
+        for row in rows:
             summary_items.append({
-                'name': name,
-                'price': prices[i] if i < len(prices) else 'N/A',
-                'quantity': quantities[i] if i < len(quantities) else 'N/A',
+                'name': row['name'],
+                'price': row['price'] or 'N/A',
+                'quantity': row['quantity'] or 'N/A',
             })
 
         return summary_items
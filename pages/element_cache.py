@@ -0,0 +1,33 @@
+"""Element handle cache shared by the helpers of a page object"""
+
+
+class ElementCache:
+    """Caches located elements by locator until navigation or staleness invalidates them"""
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, locator):
+        """Return the cached element for a locator, or None."""
+        element = self._elements.get(locator)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, locator, element):
+        """Remember the element located for a locator."""
+        self._elements[locator] = element
+
+    def evict(self, locator):
+        """Drop a handle that went stale or could no longer be used."""
+        self._elements.pop(locator, None)
+        self.evictions += 1
+
+    def clear(self):
+        """Drop every handle, e.g. after navigating to a new document."""
+        self._elements.clear()
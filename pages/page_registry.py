@@ -0,0 +1,25 @@
+"""Per-scenario registry of page objects"""
+
+
+class PageRegistry:
+    """Hands out one instance of each page class for the driver of a scenario"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._pages = {}
+
+    def get(self, page_class):
+        """Get the page object for a class, creating it on first use."""
+        page = self._pages.get(page_class)
+        if page is None:
+            page = self._pages[page_class] = page_class(self.driver)
+        return page
+
+    def cache_stats(self):
+        """Sum element cache hits, misses and evictions over all pages."""
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        for page in self._pages.values():
+            stats["hits"] += page.element_cache.hits
+            stats["misses"] += page.element_cache.misses
+            stats["evictions"] += page.element_cache.evictions
+        return stats
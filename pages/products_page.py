@@ -1,94 +1,164 @@
-from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
-
-class ProductsPage(BasePage):
-    """Products page object"""
-    
-    # Locators
-    PRODUCTS_TITLE = (By.CLASS_NAME, "title")
-    PRODUCT_SORT_DROPDOWN = (By.CLASS_NAME, "product_sort_container")
-    CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
-    CART_LINK = (By.ID, "shopping_cart_container")
-    MENU_BUTTON = (By.ID, "react-burger-menu-btn")
-    LOGOUT_LINK = (By.ID, "logout_sidebar_link")
-    INVENTORY_ITEMS = (By.CLASS_NAME, "inventory_item")
-    
-    # Dynamic locators for products
-    PRODUCT_NAME_TEMPLATE = "//div[@class='inventory_item_name' and text()='{}']"
-    ADD_TO_CART_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button[contains(@id,'add-to-cart')]"
-    REMOVE_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button[contains(@id,'remove')]"
-    PRODUCT_PRICE_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//div[@class='inventory_item_price']"
-    
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.url = "https://www.saucedemo.com/inventory.html"
-    
-    def get_page_title_text(self):
-        """Get page title text"""
-        return self.get_text(self.PRODUCTS_TITLE)
-    
-    def is_on_products_page(self):
-        """Verify if on products page"""
-        return self.is_element_visible(self.PRODUCTS_TITLE) and \
-               "inventory.html" in self.get_current_url()
-    
-    def get_cart_badge_count(self):
-        """Get cart badge count"""
-        if self.is_element_visible(self.CART_BADGE):
-            return self.get_text(self.CART_BADGE)
-        return None
-    
-    def is_cart_badge_visible(self):
-        """Check if cart badge is visible"""
-        return self.is_element_visible(self.CART_BADGE)
-    
-    def add_product_to_cart(self, product_name):
-        """Add specific product to cart"""
-        add_button_locator = (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name))
-        self.click_element(add_button_locator)
-        return self
-    
-    def remove_product_from_cart(self, product_name):
-        """Remove specific product from cart"""
-        remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
-        self.click_element(remove_button_locator)
-        return self
-    
-    def get_product_price(self, product_name):
-        """Get price of specific product"""
-        price_locator = (By.XPATH, self.PRODUCT_PRICE_TEMPLATE.format(product_name))
-        return self.get_text(price_locator)
-    
-    def is_product_in_cart(self, product_name):
-        """Check if product add button changed to remove"""
-        remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
-        return self.is_element_visible(remove_button_locator)
-    
-    def get_all_product_names(self):
-        """Get all product names"""
-        product_elements = self.find_elements((By.CLASS_NAME, "inventory_item_name"))
-        return [element.text for element in product_elements]
-    
-    def click_cart(self):
-        """Click cart icon"""
-        self.click_element(self.CART_LINK)
-        return self
-    
-    def open_menu(self):
-        """Open hamburger menu"""
-        self.click_element(self.MENU_BUTTON)
-        return self
-    
-    def logout(self):
-        """Logout from application"""
-        self.open_menu()
-        self.click_element(self.LOGOUT_LINK)
-        return self
-    
-    def sort_products(self, sort_option):
-        """Sort products by given option"""
-        from selenium.webdriver.support.ui import Select
-        dropdown = self.find_element(self.PRODUCT_SORT_DROPDOWN)
-        select = Select(dropdown)
-        select.select_by_visible_text(sort_option)
-        return self
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utils.config import Config
+
+# Reads [name, inventory id] pairs from the rendered inventory list
+CATALOGUE_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll('.inventory_item'), function(item) {
+    var link = item.querySelector('a[id$="_title_link"]');
+    return [item.querySelector('.inventory_item_name').textContent, parseInt(link.id.split('_')[1], 10)];
+});
+"""
+
+SEED_CART_SCRIPT = """
+window.localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));
+window.location.reload();
+"""
+
+class ProductsPage(BasePage):
+    """Products page object"""
+    
+    # Key under which the app keeps the cart's inventory IDs
+    CART_STORAGE_KEY = "cart-contents"
+    
+    # Product name -> inventory ID, read from the page once and shared by all instances
+    _catalogue = {}
+    
+    # Locators
+    PRODUCTS_TITLE = (By.CLASS_NAME, "title")
+    PRODUCT_SORT_DROPDOWN = (By.CLASS_NAME, "product_sort_container")
+    CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
+    CART_LINK = (By.ID, "shopping_cart_container")
+    MENU_BUTTON = (By.ID, "react-burger-menu-btn")
+    LOGOUT_LINK = (By.ID, "logout_sidebar_link")
+    INVENTORY_ITEMS = (By.CLASS_NAME, "inventory_item")
+    
+    # Ready once the inventory list has rendered its items
+    READY_LOCATOR = (By.CSS_SELECTOR, ".inventory_list .inventory_item")
+    
+    # Dynamic locators for products
+    PRODUCT_NAME_TEMPLATE = "//div[@class='inventory_item_name' and text()='{}']"
+    ADD_TO_CART_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button[contains(@id,'add-to-cart')]"
+    REMOVE_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button[contains(@id,'remove')]"
+    PRODUCT_PRICE_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//div[@class='inventory_item_price']"
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.url = Config.get_environment_url() + "inventory.html"
+    
+    def navigate_to_products_page(self):
+        """Navigate to products page"""
+        return self.open(self.url)
+    
+    def get_page_title_text(self):
+        """Get page title text"""
+        return self.get_text(self.PRODUCTS_TITLE)
+    
+    def is_on_products_page(self):
+        """Verify if on products page"""
+        return self.is_element_visible(self.PRODUCTS_TITLE) and \
+               "inventory.html" in self.get_current_url()
+    
+    def get_cart_badge_count(self):
+        """Get cart badge count"""
+        if self.is_element_visible(self.CART_BADGE):
+            return self.get_text(self.CART_BADGE)
+        return None
+    
+    def is_cart_badge_visible(self):
+        """Check if cart badge is visible"""
+        return self.is_element_visible(self.CART_BADGE)
+    
+    def add_product_to_cart(self, product_name):
+        """Add specific product to cart"""
+        add_button_locator = (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name))
+        self.click_element(add_button_locator)
+        return self
+    
+    def remove_product_from_cart(self, product_name):
+        """Remove specific product from cart"""
+        remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
+        self.click_element(remove_button_locator)
+        return self
+    
+    def wait_for_cart_badge_count(self, expected_count, timeout=10):
+        """Wait until the cart badge shows a count, or is gone when None"""
+        expected = None if expected_count is None else str(expected_count)
+        self.wait_for_text_to_be(self.CART_BADGE, expected, timeout)
+        return self
+    
+    def wait_for_product_added(self, product_name, timeout=10):
+        """Wait until the product's add-to-cart button toggles to remove"""
+        self.wait_for_element_swap(
+            (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name)),
+            (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name)),
+            timeout
+        )
+        return self
+    
+    def wait_for_product_removed(self, product_name, timeout=10):
+        """Wait until the product's remove button toggles back to add-to-cart"""
+        self.wait_for_element_swap(
+            (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name)),
+            (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name)),
+            timeout
+        )
+        return self
+    
+    def get_catalogue(self):
+        """Get the product name to inventory ID mapping"""
+        if not ProductsPage._catalogue:
+            self.wait_for_element_present(self.INVENTORY_ITEMS)
+            ProductsPage._catalogue = dict(self.driver.execute_script(CATALOGUE_SCRIPT))
+        return ProductsPage._catalogue
+    
+    def seed_cart(self, product_names):
+        """Put products in the cart by writing the app's cart storage, then verify the badge"""
+        catalogue = self.get_catalogue()
+        unknown = [name for name in product_names if name not in catalogue]
+        if unknown:
+            raise ValueError(f"Unknown products: {unknown}")
+        
+        item_ids = list(dict.fromkeys(catalogue[name] for name in product_names))
+        self.driver.execute_script(SEED_CART_SCRIPT, self.CART_STORAGE_KEY, item_ids)
+        self.element_cache.clear()
+        self.wait_for_cart_badge_count(len(item_ids))
+        return self
+    
+    def get_product_price(self, product_name):
+        """Get price of specific product"""
+        price_locator = (By.XPATH, self.PRODUCT_PRICE_TEMPLATE.format(product_name))
+        return self.get_text(price_locator)
+    
+    def is_product_in_cart(self, product_name):
+        """Check if product add button changed to remove"""
+        remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
+        return self.is_element_visible(remove_button_locator)
+    
+    def get_all_product_names(self):
+        """Get all product names"""
+        return self.query_texts((By.CLASS_NAME, "inventory_item_name"))
+    
+    def click_cart(self):
+        """Click cart icon"""
+        self.click_element(self.CART_LINK)
+        return self
+    
+    def open_menu(self):
+        """Open hamburger menu"""
+        self.click_element(self.MENU_BUTTON)
+        return self
+    
+    def logout(self):
+        """Logout from application"""
+        self.open_menu()
+        self.click_element(self.LOGOUT_LINK)
+        return self
+    
+    def sort_products(self, sort_option):
+        """Sort products by given option"""
+        from selenium.webdriver.support.ui import Select
+        dropdown = self.find_element(self.PRODUCT_SORT_DROPDOWN)
+        select = Select(dropdown)
+        select.select_by_visible_text(sort_option)
+        return self
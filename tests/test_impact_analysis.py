@@ -0,0 +1,23 @@
+"""Regression checks for change-based scenario selection
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+import unittest
+from utils.impact_analysis import SourceIndex, analyse
+
+
+class ReadyLocatorOverrideTest(unittest.TestCase):
+    """BasePage.is_ready reads self.READY_LOCATOR, so each page's override reaches every navigation"""
+
+    def test_products_ready_locator_selects_products_cart_and_checkout_scenarios(self):
+        symbol = SourceIndex().symbols["pages/products_page.py::ProductsPage.READY_LOCATOR"]
+        selected = analyse({symbol["file"]: {symbol["start"]}})
+        features = {location.split(":")[0] for location in selected}
+        self.assertTrue({"features/login.feature", "features/cart.feature", "features/checkout.feature"} <= features)
+        self.assertTrue(any("BasePage.is_ready" in reason
+                            for _, reasons in selected.values() for reason in reasons))
+
+
+if __name__ == "__main__":
+    unittest.main()
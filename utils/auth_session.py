@@ -0,0 +1,82 @@
+"""Cached authenticated sessions that let scenarios skip the UI login"""
+import logging
+import time
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+STORAGE_SNAPSHOT_SCRIPT = "return Object.assign({}, window.localStorage);"
+STORAGE_RESTORE_SCRIPT = """
+var items = arguments[0];
+Object.keys(items).forEach(function(key) { window.localStorage.setItem(key, items[key]); });
+"""
+
+
+class AuthSessionCache:
+    """Logs in through the UI once per user and injects the captured session afterwards"""
+
+    _sessions = {}
+
+    @classmethod
+    def authenticate(cls, driver, username: str):
+        """Leave the driver logged in as the user on the products page"""
+        if username not in Config.VALID_USERS:
+            raise ValueError(f"No cached session support for user: {username}")
+
+        session = cls._sessions.get(username)
+        if session and cls._is_fresh(session) and cls._inject(driver, session):
+            logger.info(f"Injected cached session for {username}")
+            return
+
+        cls._sessions[username] = cls._capture(driver, username)
+
+    @classmethod
+    def clear(cls):
+        """Forget all captured sessions"""
+        cls._sessions.clear()
+
+    @staticmethod
+    def _is_fresh(session) -> bool:
+        """Check the session is younger than the TTL and its cookies are not about to expire"""
+        now = time.time()
+        if now - session["captured_at"] > Config.AUTH_SESSION_TTL:
+            return False
+        expiries = [cookie["expiry"] for cookie in session["cookies"] if "expiry" in cookie]
+        return not expiries or min(expiries) - now > Config.AUTH_SESSION_EXPIRY_MARGIN
+
+    @staticmethod
+    def _capture(driver, username: str):
+        """Log in through the form and snapshot cookies and localStorage"""
+        login_page = LoginPage(driver)
+        login_page.navigate_to_login_page()
+        login_page.login(username, Config.PASSWORD)
+        login_page.wait_for_login_result()
+
+        if "inventory.html" not in login_page.get_current_url():
+            raise AssertionError(f"UI login failed for {username}: {login_page.get_error_message()}")
+
+        logger.info(f"Captured session for {username} through the login form")
+        return {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(STORAGE_SNAPSHOT_SCRIPT),
+            "captured_at": time.time(),
+        }
+
+    @staticmethod
+    def _inject(driver, session) -> bool:
+        """Restore a captured session and open the products page directly"""
+        # Cookies and storage can only be set for the origin currently loaded
+        login_page = LoginPage(driver).navigate_to_login_page()
+        for cookie in session["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(STORAGE_RESTORE_SCRIPT, session["local_storage"])
+
+        # A rejected session is redirected to the login form
+        products_page = ProductsPage(driver)
+        products_page.open(products_page.url, or_ready=login_page)
+        if "inventory.html" not in products_page.get_current_url():
+            logger.warning("Cached session was rejected, logging in again")
+            return False
+        return products_page.is_on_products_page()
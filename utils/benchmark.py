@@ -0,0 +1,262 @@
+"""Benchmarks for page-object operations and full feature runs against the local stand-in
+
+Usage:
+    python -m utils.benchmark [--repeat 20] [--features] [--compare latest]
+"""
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PRODUCTS = ["Sauce Labs Backpack", "Sauce Labs Bike Light"]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(durations, commands=None):
+    """Median/p95 latency in milliseconds, plus median WebDriver commands"""
+    summary = {
+        "runs": len(durations),
+        "median_ms": round(statistics.median(durations) * 1000, 2),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 2),
+        "mean_ms": round(statistics.mean(durations) * 1000, 2),
+    }
+    if commands:
+        summary["commands"] = statistics.median(commands)
+    return summary
+
+
+class PageObjectBenchmarks:
+    """Times core page-object operations with an untimed setup before each run"""
+
+    def __init__(self, driver):
+        from pages.cart_page import CartPage
+        from pages.checkout_page import CheckoutPage
+        from pages.login_page import LoginPage
+        from pages.products_page import ProductsPage
+
+        self.driver = driver
+        self.pages = {
+            "login": LoginPage, "products": ProductsPage,
+            "cart": CartPage, "checkout": CheckoutPage,
+        }
+
+    def _page(self, name):
+        return self.pages[name](self.driver)
+
+    def _logged_in(self, products=None):
+        from utils.auth_session import AuthSessionCache
+        from utils.browser_factory import DriverPool
+
+        DriverPool.reset_driver(self.driver)
+        AuthSessionCache.authenticate(self.driver, "standard_user")
+        if products:
+            self._page("products").seed_cart(products)
+
+    # Each benchmark returns (setup, operation)
+    def login(self):
+        def setup():
+            from utils.browser_factory import DriverPool
+            DriverPool.reset_driver(self.driver)
+            self._page("login").navigate_to_login_page()
+
+        def operation():
+            self._page("login").login("standard_user", Config.PASSWORD).wait_for_login_result()
+        return setup, operation
+
+    def add_product_to_cart(self):
+        def operation():
+            self._page("products").add_product_to_cart(BENCHMARK_PRODUCTS[0]) \
+                .wait_for_product_added(BENCHMARK_PRODUCTS[0])
+        return self._logged_in, operation
+
+    def get_cart_summary(self):
+        def setup():
+            self._logged_in(BENCHMARK_PRODUCTS)
+            self._page("cart").navigate_to_cart()
+
+        def operation():
+            assert len(self._page("cart").get_cart_summary()) == len(BENCHMARK_PRODUCTS)
+        return setup, operation
+
+    def fill_checkout_information(self):
+        def setup():
+            self._logged_in(BENCHMARK_PRODUCTS)
+            self._page("checkout").navigate_to_checkout_information()
+
+        def operation():
+            self._page("checkout").fill_checkout_information("John", "Doe", "12345")
+        return setup, operation
+
+    OPERATIONS = ["login", "add_product_to_cart", "get_cart_summary", "fill_checkout_information"]
+
+    def run(self, name, repeat):
+        """Run one benchmark repeatedly, counting WebDriver commands per run"""
+        from utils.command_tracer import command_tracer
+
+        setup, operation = getattr(self, name)()
+        durations, commands = [], []
+        for _ in range(repeat):
+            setup()
+            command_tracer.start_scenario(f"benchmark: {name}")
+            command_tracer.start_step(name)
+            start = time.perf_counter()
+            operation()
+            durations.append(time.perf_counter() - start)
+            trace = command_tracer.end_scenario()
+            commands.append(len(trace["steps"][0]["commands"]))
+        return summarize(durations, commands)
+
+
+def benchmark_features(feature_paths, repeat):
+    """Time end-to-end runs of feature files through the parallel runner.
+
+    Runs that exit non-zero are not timed: a run that errors out early would look fast.
+    They are counted as failed, and the benchmark then counts as a regression.
+    """
+    results = {}
+    for feature_path in feature_paths:
+        durations, failed = [], 0
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as results_dir:
+                start = time.perf_counter()
+                completed = subprocess.run(
+                    [sys.executable, "-m", "utils.parallel_runner", feature_path, "--workers", "1",
+                     "--results-dir", results_dir, "-D", "test_env=local"],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False
+                )
+                elapsed = time.perf_counter() - start
+            if completed.returncode != 0:
+                failed += 1
+                stderr_tail = "\n".join(completed.stderr.strip().splitlines()[-Config.BENCHMARK_STDERR_LINES:])
+                logger.error(f"Run of {feature_path} exited with code {completed.returncode}:\n{stderr_tail}")
+                continue
+            durations.append(elapsed)
+        summary = summarize(durations) if durations else {"runs": 0}
+        if failed:
+            summary["failed"] = failed
+        results[f"feature: {feature_path}"] = summary
+    return results
+
+
+def save_results(results, benchmark_dir=None):
+    benchmark_dir = benchmark_dir or Config.BENCHMARK_DIR
+    os.makedirs(benchmark_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(benchmark_dir, f"benchmark_{timestamp}.json")
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2)
+    return path
+
+
+def load_baseline(compare, exclude=None):
+    """Load a stored run; 'latest' picks the newest one other than `exclude`"""
+    if compare == "latest":
+        runs = sorted(glob.glob(os.path.join(Config.BENCHMARK_DIR, "benchmark_*.json")))
+        runs = [run for run in runs if run != exclude]
+        if not runs:
+            return None, None
+        compare = runs[-1]
+    with open(compare) as baseline_file:
+        return compare, json.load(baseline_file)
+
+
+def compare_results(current, baseline):
+    """Print median/p95 changes per benchmark and return the regressed names"""
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if result.get("failed"):
+            regressions.append(name)
+            print(f"{name}: {result['failed']} failed runs  <-- REGRESSION")
+            continue
+        if not before:
+            print(f"{name}: new")
+            continue
+        if not before.get("runs"):
+            print(f"{name}: no successful baseline runs")
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"]
+        flag = ""
+        if change > Config.BENCHMARK_REGRESSION_THRESHOLD:
+            regressions.append(name)
+            flag = "  <-- REGRESSION"
+        print(f"{name}: median {before['median_ms']} -> {result['median_ms']}ms ({change:+.1%}), "
+              f"p95 {before['p95_ms']} -> {result['p95_ms']}ms{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark page objects against the local SauceDemo copy")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page-object operation")
+    parser.add_argument("--browser", default=Config.DEFAULT_BROWSER)
+    parser.add_argument("--operations", default=",".join(PageObjectBenchmarks.OPERATIONS),
+                        help="Comma separated page-object benchmarks to run")
+    parser.add_argument("--features", nargs="*", default=None,
+                        help="Also time full runs of these feature files (all when given without paths)")
+    parser.add_argument("--feature-repeat", type=int, default=3, help="Runs per feature file")
+    parser.add_argument("--compare", default=None, help="Stored result file to compare with, or 'latest'")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    os.environ["TEST_ENV"] = "local"
+    # Command counts come from the tracer, so it must wrap the driver
+    Config.TRACE_WEBDRIVER_COMMANDS = True
+    from utils.browser_factory import BrowserFactory
+    from utils.local_server import LocalAppServer
+
+    server = LocalAppServer.ensure_running()
+    driver = BrowserFactory.create_driver(args.browser)
+    results = {"started": datetime.now().isoformat(), "browser": args.browser, "benchmarks": {}}
+    try:
+        benchmarks = PageObjectBenchmarks(driver)
+        for name in filter(None, args.operations.split(",")):
+            results["benchmarks"][name] = benchmarks.run(name, args.repeat)
+            print(f"{name}: {results['benchmarks'][name]}")
+    finally:
+        BrowserFactory.quit_driver(driver)
+
+    try:
+        if args.features is not None:
+            from utils.scenario_collection import find_feature_files
+            feature_results = benchmark_features(find_feature_files(args.features or None), args.feature_repeat)
+            results["benchmarks"].update(feature_results)
+            for name, result in feature_results.items():
+                print(f"{name}: {result}")
+    finally:
+        if server:
+            server.stop()
+
+    path = save_results(results)
+    print(f"Results saved to {path}")
+    failed = [name for name, result in results["benchmarks"].items() if result.get("failed")]
+
+    if args.compare:
+        baseline_path, baseline = load_baseline(args.compare, exclude=path)
+        if baseline is None:
+            print("No earlier benchmark run to compare with")
+            return 1 if failed else 0
+        print(f"Compared with {baseline_path}:")
+        if compare_results(results, baseline):
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
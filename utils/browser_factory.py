@@ -1,87 +1,369 @@
-"""Browser factory for WebDriver management"""
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from utils.config import Config
-import logging
-
-logger = logging.getLogger(__name__)
-
-class BrowserFactory:
-    """Factory class for creating WebDriver instances"""
-    
-    @staticmethod
-    def create_driver(browser_name: str = None):
-        """Create WebDriver instance based on browser name"""
-        browser_name = browser_name or Config.DEFAULT_BROWSER
-        browser_options = Config.get_browser_options(browser_name)
-        
-        logger.info(f"Creating {browser_name} driver with options: {browser_options}")
-        
-        if browser_name.lower() == "chrome":
-            return BrowserFactory._create_chrome_driver(browser_options)
-        elif browser_name.lower() == "firefox":
-            return BrowserFactory._create_firefox_driver(browser_options)
-        else:
-            raise ValueError(f"Unsupported browser: {browser_name}")
-    
-    @staticmethod
-    def _create_chrome_driver(options_dict):
-        """Create Chrome WebDriver"""
-        chrome_options = ChromeOptions()
-        
-        if options_dict.get("headless", False):
-            chrome_options.add_argument("--headless=new")
-        
-        for arg in options_dict.get("args", []):
-            chrome_options.add_argument(arg)
-        
-        # Use WebDriverManager to handle driver installation
-        service = ChromeService()
-        driver = webdriver.Chrome()
-        
-        # Set window size
-        window_size = options_dict.get("window_size", (1920, 1080))
-        driver.set_window_size(*window_size)
-        
-        # Set timeouts
-        driver.implicitly_wait(Config.IMPLICIT_WAIT)
-        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
-        
-        return driver
-    
-    @staticmethod
-    def _create_firefox_driver(options_dict):
-        """Create Firefox WebDriver"""
-        firefox_options = FirefoxOptions()
-        
-        if options_dict.get("headless", False):
-            firefox_options.add_argument("--headless")
-        
-        # Use WebDriverManager to handle driver installation
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=firefox_options)
-        
-        # Set window size
-        window_size = options_dict.get("window_size", (1920, 1080))
-        driver.set_window_size(*window_size)
-        
-        # Set timeouts
-        driver.implicitly_wait(Config.IMPLICIT_WAIT)
-        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
-        
-        return driver
-    
-    @staticmethod
-    def quit_driver(driver):
-        """Safely quit WebDriver"""
-        if driver:
-            try:
-                driver.quit()
-                logger.info("WebDriver quit successfully")
-            except Exception as e:
-                logger.error(f"Error quitting WebDriver: {e}")
\ No newline at end of file
+"""Browser factory for WebDriver management"""
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.command_tracer import command_tracer
+from utils.browser_memory import MB, memory_monitor
+from utils.driver_provisioning import driver_provisioner
+from utils.shared_browser import ContextScopedDriver
+import atexit
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class BrowserFactory:
+    """Factory class for creating WebDriver instances"""
+    
+    # Warm spares: drivers launched in the background for the next scenario
+    warm_spares = 0
+    _spares = {}
+    _spare_threads = {}
+    _spare_lock = threading.Lock()
+    _stopping = threading.Event()
+    
+    @staticmethod
+    def create_driver(browser_name: str = None):
+        """Create WebDriver instance based on browser name"""
+        browser_name = browser_name or Config.DEFAULT_BROWSER
+        browser_options = Config.get_browser_options(browser_name)
+        
+        logger.info(f"Creating {browser_name} driver with options: {browser_options}")
+        
+        start = time.perf_counter()
+        if browser_name.lower() == "chrome":
+            driver = BrowserFactory._create_chrome_driver(browser_options)
+        elif browser_name.lower() == "firefox":
+            driver = BrowserFactory._create_firefox_driver(browser_options)
+        else:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        logger.info(f"{browser_name} driver started in {time.perf_counter() - start:.2f}s")
+        
+        if Config.TRACE_WEBDRIVER_COMMANDS:
+            command_tracer.instrument(driver)
+        return driver
+    
+    @staticmethod
+    def _create_chrome_driver(options_dict):
+        """Create Chrome WebDriver"""
+        chrome_options = ChromeOptions()
+        chrome_options.page_load_strategy = options_dict.get("page_load_strategy", "normal")
+        
+        if options_dict.get("headless", False):
+            chrome_options.add_argument("--headless=new")
+        
+        for arg in options_dict.get("args", []):
+            chrome_options.add_argument(arg)
+        
+        if options_dict.get("performance_log", False):
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
+        # Driver and browser binaries come from the local provisioning cache
+        binaries = driver_provisioner.resolve("chrome")
+        if Config.SHARED_BROWSER_ADDRESS:
+            driver = BrowserFactory._create_context_driver(options_dict, binaries["driver_path"])
+        else:
+            if binaries["browser_path"]:
+                chrome_options.binary_location = binaries["browser_path"]
+            service = ChromeService(executable_path=binaries["driver_path"])
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        # Set window size
+        window_size = options_dict.get("window_size", (1920, 1080))
+        driver.set_window_size(*window_size)
+        
+        # Set timeouts
+        driver.implicitly_wait(Config.get_implicit_wait())
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        
+        return driver
+    
+    @staticmethod
+    def _create_context_driver(options_dict, driver_path):
+        """Attach to the shared Chrome and open a new isolated browser context.
+
+        Launch arguments belong to the shared browser, so only session-level options apply here.
+        """
+        context_options = ChromeOptions()
+        context_options.page_load_strategy = options_dict.get("page_load_strategy", "normal")
+        if options_dict.get("performance_log", False):
+            context_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            context_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        driver = ContextScopedDriver(Config.SHARED_BROWSER_ADDRESS, driver_path, context_options,
+                                     browser_pid=Config.SHARED_BROWSER_PID)
+        logger.info(f"Opened browser context {driver.context_id} in shared Chrome at {Config.SHARED_BROWSER_ADDRESS}")
+        return driver
+    
+    @staticmethod
+    def _create_firefox_driver(options_dict):
+        """Create Firefox WebDriver"""
+        firefox_options = FirefoxOptions()
+        firefox_options.page_load_strategy = options_dict.get("page_load_strategy", "normal")
+        
+        if options_dict.get("headless", False):
+            firefox_options.add_argument("--headless")
+        
+        # Driver and browser binaries come from the local provisioning cache
+        binaries = driver_provisioner.resolve("firefox")
+        if binaries["browser_path"]:
+            firefox_options.binary_location = binaries["browser_path"]
+        service = FirefoxService(executable_path=binaries["driver_path"])
+        driver = webdriver.Firefox(service=service, options=firefox_options)
+        
+        # Set window size
+        window_size = options_dict.get("window_size", (1920, 1080))
+        driver.set_window_size(*window_size)
+        
+        # Set timeouts
+        driver.implicitly_wait(Config.get_implicit_wait())
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        
+        return driver
+    
+    @classmethod
+    def enable_warm_spares(cls, browser_name: str = None, count: int = None):
+        """Keep up to `count` configured drivers launched ahead of time"""
+        cls.warm_spares = Config.WARM_SPARES if count is None else count
+        cls._stopping.clear()
+        if cls.warm_spares > 0:
+            logger.info(f"Keeping {cls.warm_spares} warm spare browser(s)")
+            cls._refill_spares((browser_name or Config.DEFAULT_BROWSER).lower())
+    
+    @classmethod
+    def take_driver(cls, browser_name: str = None):
+        """Take a warm spare if one is ready, otherwise create a driver now"""
+        browser_name = (browser_name or Config.DEFAULT_BROWSER).lower()
+        spares = cls._spares.get(browser_name)
+        driver = None
+        while spares is not None and driver is None:
+            spare = cls._next_spare(browser_name, spares)
+            if spare is None:
+                break
+            if DriverPool.is_healthy(spare):
+                logger.info(f"Using warm spare {browser_name} driver")
+                driver = spare
+            else:
+                cls.quit_driver(spare)
+        
+        if driver is None:
+            driver = cls.create_driver(browser_name)
+        cls._refill_spares(browser_name)
+        return driver
+    
+    @classmethod
+    def _next_spare(cls, browser_name, spares):
+        """Next queued spare; a launch already in flight beats starting another one"""
+        while True:
+            try:
+                return spares.get(timeout=0.1)
+            except queue.Empty:
+                thread = cls._spare_threads.get(browser_name)
+                if not (thread and thread.is_alive()) and spares.empty():
+                    return None
+    
+    @classmethod
+    def _refill_spares(cls, browser_name):
+        """Start a background launch unless one is running or spares are off"""
+        if cls.warm_spares <= 0 or cls._stopping.is_set():
+            return
+        with cls._spare_lock:
+            thread = cls._spare_threads.get(browser_name)
+            if thread and thread.is_alive():
+                return
+            spares = cls._spares.setdefault(browser_name, queue.Queue())
+            thread = threading.Thread(target=cls._warm_spares, args=(browser_name, spares),
+                                      name=f"warm-{browser_name}", daemon=True)
+            cls._spare_threads[browser_name] = thread
+            thread.start()
+    
+    @classmethod
+    def _warm_spares(cls, browser_name, spares):
+        while spares.qsize() < cls.warm_spares and not cls._stopping.is_set():
+            try:
+                driver = cls.create_driver(browser_name)
+            except Exception as e:
+                logger.error(f"Failed to launch warm spare {browser_name} driver: {e}")
+                return
+            if cls._stopping.is_set():
+                cls.quit_driver(driver)
+                return
+            spares.put(driver)
+            logger.info(f"Warm spare {browser_name} driver ready")
+    
+    @classmethod
+    def shutdown_spares(cls):
+        """Stop launching spares and quit any that are waiting"""
+        cls._stopping.set()
+        for thread in list(cls._spare_threads.values()):
+            thread.join(timeout=Config.PAGE_LOAD_TIMEOUT)
+        for spares in cls._spares.values():
+            while True:
+                try:
+                    cls.quit_driver(spares.get_nowait())
+                except queue.Empty:
+                    break
+    
+    @staticmethod
+    def quit_driver(driver):
+        """Safely quit WebDriver"""
+        if driver:
+            try:
+                driver.quit()
+                logger.info("WebDriver quit successfully")
+            except Exception as e:
+                logger.error(f"Error quitting WebDriver: {e}")
+
+
+class DriverPool:
+    """Keeps WebDriver sessions alive across scenarios and resets them between uses"""
+    
+    def __init__(self, max_idle: int = None):
+        self.max_idle = Config.MAX_IDLE_DRIVERS if max_idle is None else max_idle
+        self._idle = {}
+        self._scenario_counts = {}
+    
+    def acquire(self, browser_name: str = None, fresh: bool = False):
+        """Get a healthy pooled driver, or create a new one"""
+        browser_name = (browser_name or Config.DEFAULT_BROWSER).lower()
+        idle = self._idle.setdefault(browser_name, [])
+        
+        if fresh:
+            logger.info(f"Fresh {browser_name} driver requested, bypassing pool")
+            return BrowserFactory.take_driver(browser_name)
+        
+        while idle:
+            driver = idle.pop()
+            if self.is_healthy(driver):
+                logger.info(f"Reusing pooled {browser_name} driver")
+                return driver
+            logger.warning(f"Dropping unhealthy pooled {browser_name} driver")
+            BrowserFactory.quit_driver(driver)
+        
+        return BrowserFactory.take_driver(browser_name)
+    
+    def release(self, driver, browser_name: str = None, discard: bool = False, label: str = None):
+        """Reset a driver and return it to the pool, or quit it.
+
+        The session's memory is sampled first; sessions past a recycling threshold are quit
+        so the next scenario starts with a new browser. A session that does not answer a
+        trivial command within RECYCLE_HEALTH_TIMEOUT is recycled without sampling it.
+        """
+        if not driver:
+            return
+        browser_name = (browser_name or Config.DEFAULT_BROWSER).lower()
+        idle = self._idle.setdefault(browser_name, [])
+        
+        session_id = driver.session_id
+        if not self.responds(driver):
+            reason = f"not responding (health check limit {Config.RECYCLE_HEALTH_TIMEOUT}s)"
+            logger.warning(f"Recycling {browser_name} driver {session_id[:8]}: {reason}")
+            memory_monitor.record_recycle(session_id, reason)
+            self._scenario_counts.pop(session_id, None)
+            # Quitting a hung session can block for the full command timeout, so do it in the background
+            threading.Thread(target=BrowserFactory.quit_driver, args=(driver,),
+                             name="quit-unresponsive-driver", daemon=True).start()
+            return
+        
+        self._scenario_counts[session_id] = self._scenario_counts.get(session_id, 0) + 1
+        sample = memory_monitor.sample(driver, label)
+        if not discard:
+            reason = self.recycle_reason(self._scenario_counts[session_id], sample)
+            if reason:
+                logger.info(f"Recycling {browser_name} driver {session_id[:8]}: {reason}")
+                memory_monitor.record_recycle(session_id, reason)
+                discard = True
+        
+        if discard or len(idle) >= self.max_idle or not self.reset_driver(driver):
+            self._scenario_counts.pop(session_id, None)
+            BrowserFactory.quit_driver(driver)
+            return
+        
+        idle.append(driver)
+    
+    @staticmethod
+    def recycle_reason(scenario_count: int, sample: dict):
+        """Why a session should be replaced, or None to keep it"""
+        if Config.RECYCLE_AFTER_SCENARIOS and scenario_count >= Config.RECYCLE_AFTER_SCENARIOS:
+            return f"ran {scenario_count} scenarios (limit {Config.RECYCLE_AFTER_SCENARIOS})"
+        if sample["rss"] is not None:
+            # A context of a shared browser answers for its share of the process tree
+            rss_mb = sample["rss"] / max(1, sample["contexts"]) / MB
+            if rss_mb > Config.RECYCLE_RSS_MB:
+                return f"process tree RSS {rss_mb:.0f} MB over {Config.RECYCLE_RSS_MB} MB"
+        if sample["js_heap"] is not None:
+            heap_mb = sample["js_heap"] / MB
+            if heap_mb > Config.RECYCLE_JS_HEAP_MB:
+                return f"JS heap {heap_mb:.0f} MB over {Config.RECYCLE_JS_HEAP_MB} MB"
+        return None
+    
+    def shutdown(self):
+        """Quit every idle driver in the pool"""
+        for drivers in self._idle.values():
+            while drivers:
+                BrowserFactory.quit_driver(drivers.pop())
+    
+    @staticmethod
+    def responds(driver, timeout: float = None) -> bool:
+        """Check that the session answers a trivial script within a short timeout.
+
+        A hung renderer blocks WebDriver commands for the full command timeout, so the
+        probe runs in a helper thread and is abandoned when it takes too long.
+        """
+        timeout = Config.RECYCLE_HEALTH_TIMEOUT if timeout is None else timeout
+        finished, result = threading.Event(), {"ok": False}
+        
+        def probe():
+            try:
+                driver.execute_script("return 1")
+                result["ok"] = True
+            except Exception as e:
+                logger.warning(f"Driver responsiveness check failed: {e}")
+            finally:
+                finished.set()
+        
+        threading.Thread(target=probe, name="driver-probe", daemon=True).start()
+        return finished.wait(timeout) and result["ok"]
+    
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """Check that the session still responds to commands"""
+        try:
+            driver.execute_script("return document.readyState")
+            return len(driver.window_handles) > 0
+        except WebDriverException as e:
+            logger.warning(f"Driver health check failed: {e}")
+            return False
+    
+    @staticmethod
+    def reset_driver(driver) -> bool:
+        """Clear cookies and storage, close extra windows and go to about:blank"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            if driver.current_url.startswith("http"):
+                driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear();"
+                )
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            logger.warning(f"Failed to reset driver, it will be discarded: {e}")
+            return False
+
+
+driver_pool = DriverPool()
+
+# Spares are not tied to a scenario, so an interrupted run must not leak them
+atexit.register(BrowserFactory.shutdown_spares)
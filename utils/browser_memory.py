@@ -0,0 +1,130 @@
+"""Memory use of browser sessions: process tree RSS from /proc and JS heap through DevTools"""
+import logging
+import os
+import time
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+SPARK_LEVELS = "._-=+*#@"
+
+
+def process_tree_rss(root_pid: int):
+    """Resident memory of a process and all its descendants in bytes, or None off Linux"""
+    if not root_pid or not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                # The command name may contain spaces, so split after its closing parenthesis
+                fields = stat_file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, pending = 0, [root_pid]
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f"/proc/{pid}/statm") as statm_file:
+                total += int(statm_file.read().split()[1]) * page_size
+        except OSError:
+            continue
+        pending.extend(children.get(pid, []))
+    return total
+
+
+def js_heap_bytes(driver):
+    """Used JS heap of the driver's current page, or None when DevTools is unavailable"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    try:
+        return int(driver.execute_cdp_cmd("Runtime.getHeapUsage", {})["usedSize"])
+    except Exception as e:
+        logger.debug(f"Could not read JS heap size: {e}")
+        return None
+
+
+def context_count(driver) -> int:
+    """Browser contexts sharing the driver's browser process; 1 when unknown"""
+    if not hasattr(driver, "context_count"):
+        return 1
+    try:
+        return driver.context_count()
+    except Exception as e:
+        logger.debug(f"Could not count browser contexts: {e}")
+        return 1
+
+
+class MemoryMonitor:
+    """Memory samples of the run's browser sessions, taken between scenarios"""
+
+    def __init__(self):
+        self.samples = []
+        self.recycles = {}
+
+    def sample(self, driver, label: str = None) -> dict:
+        """Record the session's process tree RSS and JS heap.
+
+        Sessions sharing one browser process report how many browser contexts share that RSS.
+        """
+        root_pid = getattr(driver, "browser_pid", None)
+        if root_pid is None:
+            service = getattr(driver, "service", None)
+            process = getattr(service, "process", None)
+            root_pid = process.pid if process else None
+        sample = {
+            "time": time.time(),
+            "label": label,
+            "session": getattr(driver, "session_id", None),
+            "rss": process_tree_rss(root_pid),
+            "js_heap": js_heap_bytes(driver),
+            "contexts": context_count(driver),
+        }
+        self.samples.append(sample)
+        return sample
+
+    def record_recycle(self, session_id: str, reason: str):
+        self.recycles[session_id] = reason
+
+    @staticmethod
+    def sparkline(values) -> str:
+        """One character per value, scaled between the smallest and largest"""
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        return "".join(SPARK_LEVELS[int((value - low) / span * (len(SPARK_LEVELS) - 1))] for value in values)
+
+    def log_summary(self):
+        """Log memory over time per session, then peak memory per browser process and per context"""
+        with_rss = [sample for sample in self.samples if sample["rss"]]
+        if not with_rss:
+            return
+
+        sessions = {}
+        for sample in with_rss:
+            sessions.setdefault(sample["session"], []).append(sample)
+        logger.info("Browser memory over time (process tree RSS per context after each scenario):")
+        for session_id, samples in sessions.items():
+            values = [sample["rss"] / max(1, sample["contexts"]) / MB for sample in samples]
+            recycled = self.recycles.get(session_id)
+            logger.info(f"  session {(session_id or '?')[:8]}: {values[0]:.0f} -> {values[-1]:.0f} MB "
+                        f"{self.sparkline(values)} over {len(samples)} scenario(s)"
+                        + (f", recycled: {recycled}" if recycled else ""))
+
+        peak = max(with_rss, key=lambda sample: sample["rss"])
+        heaps = [sample["js_heap"] for sample in self.samples if sample["js_heap"]]
+        per_context = peak["rss"] / max(1, peak["contexts"])
+        logger.info(f"Browser memory: peak process tree RSS {peak['rss'] / MB:.0f} MB shared by "
+                    f"{peak['contexts']} context(s), {per_context / MB:.0f} MB per context "
+                    f"(a separate browser is budgeted at {Config.BROWSER_MEMORY_MB} MB)")
+        if heaps:
+            logger.info(f"JS heap per context: mean {sum(heaps) / len(heaps) / MB:.1f} MB, "
+                        f"max {max(heaps) / MB:.1f} MB")
+
+
+memory_monitor = MemoryMonitor()
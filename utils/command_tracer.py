@@ -0,0 +1,168 @@
+"""WebDriver command tracing with per-step and per-scenario round-trip accounting"""
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+HOOKS_STEP = "(hooks)"
+
+
+class CommandTracer:
+    """Records every command sent through instrumented drivers, grouped by scenario and step"""
+
+    def __init__(self):
+        self.scenarios = []
+        self.unscoped = []
+        self._scenario = None
+        self._step = None
+        self._element_locators = {}
+
+    def instrument(self, driver):
+        """Wrap the driver's command executor; WebElement commands go through it too"""
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                response = execute(driver_command, params)
+                if driver_command in FIND_COMMANDS:
+                    self._remember_elements(response, params)
+                return response
+            except Exception as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                self._record(driver_command, params, time.perf_counter() - start, outcome)
+
+        driver.execute = traced_execute
+        return driver
+
+    def start_scenario(self, name: str, location: str = None):
+        self._scenario = {"name": name, "location": location, "steps": []}
+        self._step = None
+        self.scenarios.append(self._scenario)
+
+    def end_scenario(self):
+        """Close the current scenario and return its trace"""
+        scenario, self._scenario, self._step = self._scenario, None, None
+        self._element_locators.clear()
+        return scenario
+
+    def start_step(self, name: str):
+        if self._scenario is not None:
+            self._step = {"name": name, "commands": []}
+            self._scenario["steps"].append(self._step)
+
+    def end_step(self):
+        self._step = None
+
+    def _remember_elements(self, response, params):
+        """Map returned element ids to the locator that found them"""
+        value = (response or {}).get("value")
+        elements = value if isinstance(value, list) else [value]
+        locator = self._format_locator(params)
+        for element in elements:
+            element_id = getattr(element, "id", None)
+            if element_id:
+                self._element_locators[element_id] = locator
+
+    @staticmethod
+    def _format_locator(params):
+        return f"{params.get('using')}={params.get('value')}"
+
+    def _describe_target(self, driver_command, params):
+        """Best description of what a command acted on"""
+        params = params or {}
+        if driver_command in FIND_COMMANDS:
+            return self._format_locator(params)
+        if "id" in params and params["id"] in self._element_locators:
+            return self._element_locators[params["id"]]
+        if "script" in params:
+            return "script: " + " ".join(params["script"].split())[:60]
+        if "url" in params:
+            return params["url"]
+        return None
+
+    def _record(self, driver_command, params, duration, outcome):
+        record = {
+            "command": driver_command,
+            "target": self._describe_target(driver_command, params),
+            "duration_ms": round(duration * 1000, 2),
+            "outcome": outcome,
+        }
+        if self._scenario is None:
+            self.unscoped.append(record)
+            return
+
+        step = self._step
+        if step is None:
+            # Commands sent from hooks, outside of any step
+            steps = self._scenario["steps"]
+            if not steps or steps[-1]["name"] != HOOKS_STEP:
+                steps.append({"name": HOOKS_STEP, "commands": []})
+            step = steps[-1]
+        step["commands"].append(record)
+
+    def all_commands(self):
+        for scenario in self.scenarios:
+            for step in scenario["steps"]:
+                yield from step["commands"]
+        yield from self.unscoped
+
+    @staticmethod
+    def summarize_scenario(scenario):
+        """Commands and time per step of a scenario trace"""
+        return [
+            {
+                "step": step["name"],
+                "commands": len(step["commands"]),
+                "duration_ms": round(sum(command["duration_ms"] for command in step["commands"]), 2),
+            }
+            for step in scenario["steps"]
+        ]
+
+    def top_slowest(self, key: str, limit: int = None):
+        """Aggregate count, total and max latency by command name or target"""
+        limit = limit or Config.TRACE_SUMMARY_SIZE
+        totals = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        for command in self.all_commands():
+            if command[key] is None:
+                continue
+            entry = totals[command[key]]
+            entry["count"] += 1
+            entry["total_ms"] += command["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], command["duration_ms"])
+        ranked = sorted(totals.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return ranked[:limit]
+
+    def write_trace(self, trace_dir: str = None) -> str:
+        """Write the full trace of the run to a JSON file"""
+        trace_dir = trace_dir or Config.TRACE_DIR
+        os.makedirs(trace_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(trace_dir, f"webdriver_trace_{timestamp}_{os.getpid()}.json")
+        with open(path, "w") as trace_file:
+            json.dump({"scenarios": self.scenarios, "unscoped": self.unscoped}, trace_file, indent=2)
+        return path
+
+    def log_summary(self):
+        """Log the slowest commands and locators of the run"""
+        commands = list(self.all_commands())
+        if not commands:
+            return
+        total_ms = sum(command["duration_ms"] for command in commands)
+        logger.info(f"WebDriver commands: {len(commands)} in {total_ms / 1000:.2f}s")
+        for key, title in (("command", "Slowest commands"), ("target", "Slowest locators/targets")):
+            logger.info(f"{title} (count, total, max):")
+            for name, entry in self.top_slowest(key):
+                logger.info(f"  {name}: {entry['count']}x, {entry['total_ms']:.0f}ms, {entry['max_ms']:.0f}ms")
+
+
+command_tracer = CommandTracer()
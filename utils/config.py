@@ -1,73 +1,212 @@
-"""Configuration management for the test suite"""
-import os
-from typing import Dict, Any
-
-class Config:
-    """Configuration class for test settings"""
-    
-    # Base URLs
-    BASE_URL = "https://www.saucedemo.com/"
-    
-    # Browser Configuration
-    DEFAULT_BROWSER = "chrome"
-    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    BROWSER_WIDTH = 1920
-    BROWSER_HEIGHT = 1080
-    
-    # Timeouts
-    IMPLICIT_WAIT = 10
-    EXPLICIT_WAIT = 10
-    PAGE_LOAD_TIMEOUT = 30
-    
-    # Test Data
-    VALID_USERS = [
-        "standard_user",
-        "problem_user", 
-        "performance_glitch_user",
-        "error_user",
-        "visual_user"
-    ]
-    
-    LOCKED_USER = "locked_out_user"
-    PASSWORD = "secret_sauce"
-    
-    # Test Configuration
-    TAKE_SCREENSHOT_ON_FAILURE = True
-    SCREENSHOT_DIR = "reports/screenshots"
-    
-    # Allure Configuration
-    ALLURE_RESULTS_DIR = "reports/allure-results"
-    
-    @classmethod
-    def get_browser_options(cls, browser_name: str) -> Dict[str, Any]:
-        """Get browser-specific options"""
-        if browser_name.lower() == "chrome":
-            return {
-                "headless": cls.HEADLESS,
-                "window_size": (cls.BROWSER_WIDTH, cls.BROWSER_HEIGHT),
-                "args": [
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--disable-extensions"
-                ]
-            }
-        elif browser_name.lower() == "firefox":
-            return {
-                "headless": cls.HEADLESS,
-                "window_size": (cls.BROWSER_WIDTH, cls.BROWSER_HEIGHT)
-            }
-        else:
-            return {}
-    
-    @classmethod
-    def get_environment_url(cls) -> str:
-        """Get environment-specific URL"""
-        env = os.getenv("TEST_ENV", "prod").lower()
-        
-        if env == "staging":
-            return "https://staging.saucedemo.com/"
-        elif env == "dev":
-            return "https://dev.saucedemo.com/"
-        else:
+"""Configuration management for the test suite"""
+import os
+from typing import Dict, Any
+
+class Config:
+    """Configuration class for test settings"""
+    
+    # Base URLs
+    BASE_URL = "https://www.saucedemo.com/"
+    
+    # Local stand-in server (port 0 picks a free port when the server starts)
+    LOCAL_SERVER_HOST = "127.0.0.1"
+    LOCAL_SERVER_PORT = int(os.getenv("LOCAL_SERVER_PORT", "0"))
+    
+    # Browser Configuration
+    DEFAULT_BROWSER = "chrome"
+    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+    BROWSER_WIDTH = 1920
+    BROWSER_HEIGHT = 1080
+    
+    # Network Blocking (Chrome only; NETWORK_PROFILE is the default, @network_<profile> tags override it)
+    NETWORK_PROFILE = os.getenv("NETWORK_PROFILE", "none")
+    NETWORK_PROFILE_TAG_PREFIX = "network_"
+    NETWORK_BLOCKING_PROFILES = {
+        "none": [],
+        "images+fonts": [
+            "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+            "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        ],
+        "third-party": [
+            "*backtrace.io*", "*google-analytics.com*", "*googletagmanager.com*",
+            "*doubleclick.net*", "*optimizely.com*", "*hotjar.com*", "*segment.io*",
+            "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+        ],
+    }
+    NETWORK_STATS = os.getenv("NETWORK_STATS", "false").lower() == "true"
+    NETWORK_SIZES_FILE = "reports/network_sizes.json"
+    NETWORK_DEFAULT_RESOURCE_BYTES = {"Image": 20 * 1024, "Font": 40 * 1024, "Script": 50 * 1024}
+    
+    # Timeouts
+    IMPLICIT_WAIT = 10
+    EXPLICIT_WAIT = 10
+    PAGE_LOAD_TIMEOUT = 30
+    
+    # Page Loading (PAGE_LOAD_STRATEGY overrides the per-environment strategy)
+    # With "eager" or "none", driver.get returns early and page objects wait for their READY_LOCATOR
+    PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY")
+    PAGE_LOAD_STRATEGIES = {
+        "local": "none",
+        "dev": "eager",
+        "staging": "eager",
+        "prod": "eager",
+    }
+    
+    # Driver Provisioning
+    DRIVER_CACHE_DIR = os.getenv("DRIVER_CACHE_DIR", os.path.join("~", ".cache", "saucedemo-tests", "drivers"))
+    OFFLINE = os.getenv("OFFLINE", "false").lower() == "true"
+    
+    # Browser Session Reuse
+    REUSE_BROWSER = os.getenv("REUSE_BROWSER", "true").lower() == "true"
+    FRESH_BROWSER_TAG = "fresh_browser"
+    MAX_IDLE_DRIVERS = 1
+    
+    # Browser Recycling (a pooled session is replaced after N scenarios, above a memory threshold, or when it stops responding)
+    RECYCLE_AFTER_SCENARIOS = int(os.getenv("RECYCLE_AFTER_SCENARIOS", "50"))
+    RECYCLE_RSS_MB = int(os.getenv("RECYCLE_RSS_MB", "1024"))
+    RECYCLE_JS_HEAP_MB = int(os.getenv("RECYCLE_JS_HEAP_MB", "256"))
+    RECYCLE_HEALTH_TIMEOUT = 5
+    
+    # Warm Spare Browsers (launched in the background while a scenario runs)
+    WARM_SPARES = int(os.getenv("WARM_SPARES", "0"))
+    
+    # Parallel Execution
+    PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "0"))
+    BROWSER_MEMORY_MB = 300
+    
+    # Shared Browser (one Chrome process, an isolated browser context per worker)
+    SHARED_BROWSER = os.getenv("SHARED_BROWSER", "false").lower() == "true"
+    SHARED_BROWSER_ADDRESS = os.getenv("SHARED_BROWSER_ADDRESS")
+    SHARED_BROWSER_PID = int(os.getenv("SHARED_BROWSER_PID", "0")) or None
+    BROWSER_CONTEXT_MEMORY_MB = 60
+
+    # Distributed Runs (workers lease batches from the coordinator and heartbeat every quarter lease)
+    COORDINATOR_HOST = os.getenv("COORDINATOR_HOST", "127.0.0.1")
+    COORDINATOR_PORT = int(os.getenv("COORDINATOR_PORT", "8765"))
+    COORDINATOR_TOKEN = os.getenv("COORDINATOR_TOKEN")
+    COORDINATOR_LEASE_SECONDS = int(os.getenv("COORDINATOR_LEASE_SECONDS", "60"))
+    COORDINATOR_BATCH_SIZE = 3
+    COORDINATOR_MAX_ATTEMPTS = 3
+
+    # Scenario Scheduling (median of recent durations; default for scenarios without history)
+    SCHEDULER_HISTORY_RUNS = 5
+    SCHEDULER_DEFAULT_SECONDS = 10.0
+    
+    # Test Data
+    VALID_USERS = [
+        "standard_user",
+        "problem_user", 
+        "performance_glitch_user",
+        "error_user",
+        "visual_user"
+    ]
+    
+    LOCKED_USER = "locked_out_user"
+    PASSWORD = "secret_sauce"
+    
+    # Generated Test Data (TEST_DATA_SEED reproduces a run's data)
+    TEST_DATA_POOL_SIZE = 200
+    TEST_DATA_CACHE_DIR = os.path.join("reports", "test-data")
+    TEST_DATA_CACHE_KEEP = 10
+    TEST_DATA_LOCALES = ["en_US", "de_DE", "fr_FR", "es_ES", "ja_JP"]
+    
+    # Cached Login Sessions (seconds)
+    AUTH_SESSION_TTL = 300
+    AUTH_SESSION_EXPIRY_MARGIN = 60
+    
+    # Reruns and Flakiness (RERUN extra attempts for a failed scenario)
+    RERUN_ATTEMPTS = int(os.getenv("RERUN", "0"))
+    RERUN_FILE = "reports/rerun.txt"
+    FLAKINESS_FILE = "reports/flakiness.json"
+    FLAKINESS_HISTORY_RUNS = 10
+    FLAKY_SCORE_THRESHOLD = 0.2
+    
+    # Test Configuration
+    TAKE_SCREENSHOT_ON_FAILURE = True
+    SCREENSHOT_DIR = "reports/screenshots"
+    SCREENSHOT_MAX_WIDTH = 1280
+    SCREENSHOT_DIR_MAX_MB = 10
+    SCREENSHOT_MAX_AGE_DAYS = 7
+    
+    # Allure Configuration
+    ALLURE_RESULTS_DIR = "reports/allure-results"
+    
+    # Results Store (indexed, deduplicated copy of the Allure output)
+    RESULTS_STORE_ENABLED = os.getenv("RESULTS_STORE_ENABLED", "true").lower() == "true"
+    RESULTS_STORE_DIR = "reports/results-store"
+    RESULTS_EXPORT_DIR = "reports/allure-export"
+    RESULTS_KEEP_UNPACKED_RUNS = 5
+    
+    # WebDriver Command Tracing (off by default; benchmarks always trace)
+    TRACE_WEBDRIVER_COMMANDS = os.getenv("TRACE_WEBDRIVER_COMMANDS", "false").lower() == "true"
+    TRACE_DIR = "reports/traces"
+    TRACE_SUMMARY_SIZE = 10
+    
+    # Step Profiling (behave -D profile=1)
+    PROFILE_DIR = "reports/profiles"
+    PROFILE_SAMPLE_INTERVAL = 0.005
+    PROFILE_TOP_N = 20
+    
+    # Benchmarks
+    BENCHMARK_DIR = "reports/benchmarks"
+    BENCHMARK_REGRESSION_THRESHOLD = 0.10
+    BENCHMARK_STDERR_LINES = 20
+    
+    @classmethod
+    def get_browser_options(cls, browser_name: str) -> Dict[str, Any]:
+        """Get browser-specific options"""
+        if browser_name.lower() == "chrome":
+            return {
+                "headless": cls.HEADLESS,
+                "window_size": (cls.BROWSER_WIDTH, cls.BROWSER_HEIGHT),
+                "args": [
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-gpu",
+                    "--disable-extensions"
+                ],
+                "page_load_strategy": cls.get_page_load_strategy(),
+                # Network events only, for counting what the blocking profile saved
+                "performance_log": cls.NETWORK_STATS
+            }
+        elif browser_name.lower() == "firefox":
+            return {
+                "headless": cls.HEADLESS,
+                "window_size": (cls.BROWSER_WIDTH, cls.BROWSER_HEIGHT),
+                "page_load_strategy": cls.get_page_load_strategy()
+            }
+        else:
+            return {}
+    
+    @classmethod
+    def get_test_env(cls) -> str:
+        """Get the name of the target environment"""
+        return os.getenv("TEST_ENV", "prod").lower()
+    
+    @classmethod
+    def get_page_load_strategy(cls) -> str:
+        """Get the page-load strategy for the target environment: normal, eager or none"""
+        if cls.PAGE_LOAD_STRATEGY:
+            return cls.PAGE_LOAD_STRATEGY.lower()
+        return cls.PAGE_LOAD_STRATEGIES.get(cls.get_test_env(), "normal")
+    
+    @classmethod
+    def get_implicit_wait(cls) -> float:
+        """Get the implicit wait; early-returning strategies rely on explicit waits only"""
+        if cls.get_page_load_strategy() == "normal":
+            return cls.IMPLICIT_WAIT
+        return 0
+    
+    @classmethod
+    def get_environment_url(cls) -> str:
+        """Get environment-specific URL"""
+        env = cls.get_test_env()
+        
+        if env == "local":
+            return f"http://{cls.LOCAL_SERVER_HOST}:{cls.LOCAL_SERVER_PORT}/"
+        elif env == "staging":
+            return "https://staging.saucedemo.com/"
+        elif env == "dev":
+            return "https://dev.saucedemo.com/"
+        else:
             return cls.BASE_URL
\ No newline at end of file
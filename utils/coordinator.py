@@ -0,0 +1,492 @@
+"""Coordinator that hands scenario batches to worker processes on any host over HTTP
+
+The coordinator holds the queue and merges every batch's Allure files into one results
+directory. Workers lease a batch, run it with the usual behave stack, send heartbeats while it
+runs and post the results back. A batch whose lease runs out (its worker died or lost the
+network) goes back to the front of the queue.
+
+Usage:
+    python -m utils.coordinator serve [features/...] [--tags=@smoke] [-D browser=chrome]
+                                      [--host 0.0.0.0] [--port 8765] [--local-workers N]
+    python -m utils.coordinator worker --url http://coordinator-host:8765
+"""
+import argparse
+import base64
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from utils.config import Config
+from utils.profiler import merge_worker_profiles
+from utils.results_store import ResultsStore
+from utils.scenario_collection import collect_scenarios
+from utils.scheduler import DurationHistory, scenario_key
+from utils.test_data import TestDataPool, resolve_seed
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = "X-Coordinator-Token"
+# How long an idle worker waits before asking again while other workers hold the last batches
+WAIT_SECONDS = 1.0
+
+
+def plan_batches(scenarios: list, batch_size: int = None, history: DurationHistory = None) -> List[Dict]:
+    """Group scenarios into batches of one feature file, longest and last-failed batches first.
+
+    Scenarios of a file stay together so a batch pays for its browser and login once.
+    """
+    batch_size = batch_size or Config.COORDINATOR_BATCH_SIZE
+    history = history or DurationHistory().load()
+    by_file = {}
+    for scenario in scenarios:
+        by_file.setdefault(scenario.location.filename, []).append(scenario)
+
+    batches = []
+    for file_scenarios in by_file.values():
+        for start in range(0, len(file_scenarios), batch_size):
+            chunk = file_scenarios[start:start + batch_size]
+            batches.append({
+                "locations": [str(scenario.location) for scenario in chunk],
+                "seconds": sum(history.estimate(scenario_key(scenario)) for scenario in chunk),
+                "failed_last_time": any(history.failed_last_time(scenario_key(scenario)) for scenario in chunk),
+            })
+    batches.sort(key=lambda batch: (not batch["failed_last_time"], -batch["seconds"]))
+    return batches
+
+
+class WorkQueue:
+    """Batches waiting, leased and finished; every method is safe to call from handler threads"""
+
+    def __init__(self, batches: List[Dict], lease_seconds: float = None, max_attempts: int = None):
+        self.lease_seconds = lease_seconds or Config.COORDINATOR_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.COORDINATOR_MAX_ATTEMPTS
+        self.units = {index: dict(batch, id=index, attempts=0) for index, batch in enumerate(batches)}
+        self.pending = deque(self.units)
+        self.leases = {}
+        self.expired = {}
+        self.completed = {}
+        self.lost = []
+        self.workers = set()
+        self._lease_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.finished = threading.Event()
+        self._check_finished()
+
+    def lease(self, worker: str):
+        """Hand the next batch to a worker; None while batches are out but none is waiting"""
+        with self._lock:
+            self.workers.add(worker)
+            while self.pending:
+                unit = self.units[self.pending.popleft()]
+                if unit["id"] in self.completed:
+                    continue
+                unit["attempts"] += 1
+                lease_id = str(next(self._lease_ids))
+                self.leases[lease_id] = {"unit": unit["id"], "worker": worker,
+                                         "deadline": time.monotonic() + self.lease_seconds}
+                logger.info(f"Leased batch {unit['id']} ({len(unit['locations'])} scenarios, "
+                            f"attempt {unit['attempts']}) to {worker}")
+                return lease_id, unit
+            return None
+
+    def heartbeat(self, lease_id: str) -> bool:
+        """Extend a lease; False once it has expired and the batch went back to the queue"""
+        with self._lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return False
+            lease["deadline"] = time.monotonic() + self.lease_seconds
+            return True
+
+    def complete(self, lease_id: str, return_code: int, failed: List[str]) -> bool:
+        """Record a batch's outcome; results for a batch finished by another worker are refused"""
+        with self._lock:
+            # A late result from an expired lease still counts if nobody finished the batch since
+            lease = self.leases.pop(lease_id, None) or self.expired.pop(lease_id, None)
+            if lease is None or lease["unit"] in self.completed:
+                return False
+            unit_id = lease["unit"]
+            for other_id, other in list(self.leases.items()):
+                if other["unit"] == unit_id:
+                    del self.leases[other_id]
+            if unit_id in self.pending:
+                self.pending.remove(unit_id)
+            if unit_id in self.lost:
+                self.lost.remove(unit_id)
+            self.completed[unit_id] = {"return_code": return_code, "failed": failed, "worker": lease["worker"]}
+            self._check_finished()
+            done = len(self.completed) + len(self.lost)
+            logger.info(f"Batch {unit_id} {'failed' if return_code else 'passed'} on {lease['worker']} "
+                        f"({done}/{len(self.units)} batches done)")
+            return True
+
+    def accepts(self, lease_id: str) -> bool:
+        with self._lock:
+            lease = self.leases.get(lease_id) or self.expired.get(lease_id)
+            return lease is not None and lease["unit"] not in self.completed
+
+    def requeue_expired(self):
+        """Put batches whose worker stopped sending heartbeats back at the front of the queue"""
+        now = time.monotonic()
+        with self._lock:
+            for lease_id, lease in list(self.leases.items()):
+                if lease["deadline"] > now:
+                    continue
+                self.expired[lease_id] = self.leases.pop(lease_id)
+                unit = self.units[lease["unit"]]
+                if unit["id"] in self.completed or any(other["unit"] == unit["id"] for other in self.leases.values()):
+                    continue
+                if unit["attempts"] >= self.max_attempts:
+                    logger.error(f"Batch {unit['id']} lost after {unit['attempts']} attempts: "
+                                 f"{', '.join(unit['locations'])}")
+                    self.lost.append(unit["id"])
+                else:
+                    logger.warning(f"Lease of batch {unit['id']} by {lease['worker']} expired, requeueing")
+                    self.pending.appendleft(unit["id"])
+            self._check_finished()
+
+    def _check_finished(self):
+        if len(self.completed) + len(self.lost) >= len(self.units):
+            self.finished.set()
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "batches": len(self.units),
+                "pending": len(self.pending),
+                "leased": len(self.leases),
+                "completed": len(self.completed),
+                "lost": len(self.lost),
+                "workers": sorted(self.workers),
+            }
+
+
+class CoordinatorRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints: POST /lease, /heartbeat and /results; GET /status"""
+
+    def do_GET(self):
+        if self.path != "/status":
+            self.send_error(404)
+            return
+        self._reply(self.server.queue.status())
+
+    def do_POST(self):
+        if Config.COORDINATOR_TOKEN and self.headers.get(TOKEN_HEADER) != Config.COORDINATOR_TOKEN:
+            self.send_error(403)
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self.send_error(400)
+            return
+
+        queue = self.server.queue
+        if self.path == "/lease":
+            if queue.finished.is_set():
+                self._reply({"done": True})
+                return
+            leased = queue.lease(body.get("worker", self.client_address[0]))
+            if leased is None:
+                self._reply({"wait": WAIT_SECONDS})
+                return
+            lease_id, unit = leased
+            self._reply({"lease": lease_id, "locations": unit["locations"],
+                         "behave_args": self.server.behave_args, "lease_seconds": queue.lease_seconds})
+        elif self.path == "/heartbeat":
+            self._reply({"ok": queue.heartbeat(body.get("lease"))})
+        elif self.path == "/results":
+            self._reply({"accepted": self.server.submit(body)})
+        else:
+            self.send_error(404)
+
+    def _reply(self, payload: Dict):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.client_address[0]} - {format % args}")
+
+
+class Coordinator:
+    """HTTP server around a work queue, merging the Allure files workers send back"""
+
+    def __init__(self, queue: WorkQueue, behave_args: List[str], host: str = None, port: int = None,
+                 results_dir: str = None):
+        self.queue = queue
+        self.host = host or Config.COORDINATOR_HOST
+        self.port = Config.COORDINATOR_PORT if port is None else port
+        self.results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+        self.behave_args = behave_args
+        self.merged = 0
+        self._httpd = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), CoordinatorRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.queue = self.queue
+        self._httpd.behave_args = self.behave_args
+        self._httpd.submit = self.submit
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="coordinator", daemon=True)
+        self._thread.start()
+        logger.info(f"Coordinator serving {len(self.queue.units)} batches at {self.url}")
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def submit(self, body: Dict) -> bool:
+        """Merge a batch's results unless another worker already reported the same batch.
+
+        Allure file names are UUIDs, so batches never overwrite each other's files.
+        """
+        with self._lock:
+            lease_id = body.get("lease")
+            if not self.queue.accepts(lease_id):
+                return False
+            os.makedirs(self.results_dir, exist_ok=True)
+            for name, content in body.get("files", {}).items():
+                with open(os.path.join(self.results_dir, os.path.basename(name)), "wb") as result_file:
+                    result_file.write(base64.b64decode(content))
+                self.merged += 1
+            # Completed last, so the run only counts as finished once the files are on disk
+            return self.queue.complete(lease_id, body.get("return_code", 1), body.get("failed", []))
+
+    def wait(self, workers: List[subprocess.Popen] = ()):
+        """Requeue expired leases until every batch is done, or every local worker has exited"""
+        while not self.queue.finished.wait(1.0):
+            self.queue.requeue_expired()
+            if workers and all(worker.poll() is not None for worker in workers):
+                logger.error("All local workers exited with batches left")
+                break
+
+
+def run_coordinator(paths: List[str], tags: List[str], defines: List[str], host: str = None,
+                    port: int = None, local_workers: int = 0, results_dir: str = None) -> int:
+    """Serve the selected scenarios to workers until every batch is done, then merge the results"""
+    scenarios = collect_scenarios(paths, tags)
+    if not scenarios:
+        logger.warning("No scenarios matched the given paths and tags")
+        return 0
+
+    # Workers on every host draw from the same seeded test data pool; local workers load the one built here
+    seed = resolve_seed()
+    TestDataPool(seed).build()
+    logger.info(f"Test data seed: {seed}")
+    behave_args = [f"--tags={tag}" for tag in tags]
+    for define in defines:
+        behave_args.extend(["-D", define])
+    behave_args.extend(["-D", f"data_seed={seed}"])
+
+    queue = WorkQueue(plan_batches(scenarios))
+    coordinator = Coordinator(queue, behave_args, host, port, results_dir).start()
+
+    # Local workers share one copy of the stand-in app through LOCAL_SERVER_PORT
+    local_server, workers = None, []
+    if local_workers and any(define.lower() == "test_env=local" for define in defines):
+        from utils.local_server import LocalAppServer
+        local_server = LocalAppServer.ensure_running()
+    try:
+        worker_url = f"http://127.0.0.1:{coordinator.port}"
+        workers = [subprocess.Popen([sys.executable, "-m", "utils.coordinator", "worker", "--url", worker_url,
+                                     "--name", f"{socket.gethostname()}-local-{index}"])
+                   for index in range(local_workers)]
+        coordinator.wait(workers)
+        # Let local workers hear that the run is done before the server goes away
+        for worker in workers:
+            try:
+                worker.wait(timeout=WAIT_SECONDS * 5)
+            except subprocess.TimeoutExpired:
+                worker.terminate()
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.kill()
+        coordinator.stop()
+        if local_server:
+            local_server.stop()
+
+    logger.info(f"Merged {coordinator.merged} Allure files from {len(queue.workers)} workers "
+                f"into {coordinator.results_dir}")
+    if Config.RESULTS_STORE_ENABLED and coordinator.results_dir == Config.ALLURE_RESULTS_DIR:
+        store = ResultsStore()
+        try:
+            store.ingest(coordinator.results_dir)
+        finally:
+            store.close()
+
+    # Profiles of workers on this machine; remote workers keep theirs
+    profile_table = merge_worker_profiles()
+    if profile_table:
+        logger.info(f"Merged local workers' profiles into {profile_table}")
+
+    failed = [location for result in queue.completed.values() for location in result["failed"]]
+    lost = [location for unit_id in queue.lost for location in queue.units[unit_id]["locations"]]
+    os.makedirs(os.path.dirname(Config.RERUN_FILE) or ".", exist_ok=True)
+    with open(Config.RERUN_FILE, "w") as rerun_file:
+        rerun_file.writelines(f"{location}\n" for location in failed + lost)
+
+    unfinished = len(queue.units) - len(queue.completed)
+    if unfinished or any(result["return_code"] for result in queue.completed.values()):
+        logger.error(f"{len(failed)} failed scenarios, {unfinished} batches not run")
+        return 1
+    return 0
+
+
+class CoordinatorClient:
+    """The worker's side of the protocol"""
+
+    def __init__(self, url: str, worker: str):
+        self.url = url.rstrip("/")
+        self.worker = worker
+
+    def post(self, path: str, payload: Dict, timeout: float = 30) -> Dict:
+        request = urllib.request.Request(f"{self.url}{path}", data=json.dumps(payload).encode(),
+                                         headers={"Content-Type": "application/json"})
+        if Config.COORDINATOR_TOKEN:
+            request.add_header(TOKEN_HEADER, Config.COORDINATOR_TOKEN)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+
+
+def run_batch(locations: List[str], behave_args: List[str], results_dir: str) -> int:
+    """Run a batch in a fresh process, since behave's step registry cannot be loaded twice"""
+    from utils.parallel_runner import run_shard
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_shard, os.getpid(), locations, behave_args, results_dir).result()
+
+
+def read_failed_locations() -> List[str]:
+    """Take the rerun file the batch wrote for this worker's PARALLEL_WORKER_INDEX"""
+    root, extension = os.path.splitext(Config.RERUN_FILE)
+    path = f"{root}-worker-{os.getpid()}{extension}"
+    if not os.path.isfile(path):
+        return []
+    with open(path) as rerun_file:
+        failed = [line.strip() for line in rerun_file if line.strip()]
+    os.remove(path)
+    return failed
+
+
+def run_worker(url: str, name: str = None, connect_timeout: float = None) -> int:
+    """Lease and run batches until the coordinator says the run is done"""
+    client = CoordinatorClient(url, name or f"{socket.gethostname()}-{os.getpid()}")
+    connect_timeout = Config.COORDINATOR_LEASE_SECONDS if connect_timeout is None else connect_timeout
+    unreachable_since = None
+    batches = 0
+    while True:
+        try:
+            reply = client.post("/lease", {"worker": client.worker})
+            unreachable_since = None
+        except (urllib.error.URLError, OSError) as e:
+            # Covers a coordinator that is not up yet and one that finished and went away
+            unreachable_since = unreachable_since or time.monotonic()
+            if time.monotonic() - unreachable_since > connect_timeout:
+                logger.info(f"Coordinator at {url} unreachable ({e}), stopping after {batches} batches")
+                return 0
+            time.sleep(WAIT_SECONDS)
+            continue
+
+        if reply.get("done"):
+            logger.info(f"Run finished, {client.worker} ran {batches} batches")
+            return 0
+        if "wait" in reply:
+            time.sleep(reply["wait"])
+            continue
+
+        lease_id = reply["lease"]
+        stop_heartbeat = threading.Event()
+
+        def send_heartbeats():
+            while not stop_heartbeat.wait(reply["lease_seconds"] / 4):
+                try:
+                    if not client.post("/heartbeat", {"lease": lease_id}).get("ok"):
+                        logger.warning(f"Lease {lease_id} expired; its batch was handed to another worker")
+                        return
+                except (urllib.error.URLError, OSError) as e:
+                    logger.warning(f"Heartbeat for lease {lease_id} failed: {e}")
+
+        heartbeat = threading.Thread(target=send_heartbeats, name="coordinator-heartbeat", daemon=True)
+        heartbeat.start()
+        results_dir = tempfile.mkdtemp(prefix="coordinator-batch-")
+        try:
+            return_code = run_batch(reply["locations"], reply["behave_args"], results_dir)
+        except Exception as e:
+            logger.error(f"Batch of lease {lease_id} crashed: {e}")
+            return_code = 1
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        files = {}
+        for file_name in os.listdir(results_dir):
+            with open(os.path.join(results_dir, file_name), "rb") as result_file:
+                files[file_name] = base64.b64encode(result_file.read()).decode()
+        shutil.rmtree(results_dir, ignore_errors=True)
+        try:
+            reply = client.post("/results", {"lease": lease_id, "return_code": return_code,
+                                             "failed": read_failed_locations(), "files": files}, timeout=120)
+            if not reply.get("accepted"):
+                logger.warning(f"Results of lease {lease_id} discarded, another worker finished the batch")
+        except (urllib.error.URLError, OSError) as e:
+            # The lease runs out and the coordinator hands the batch to someone else
+            logger.error(f"Could not send results of lease {lease_id}: {e}")
+        batches += 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Distribute behave scenarios to workers over HTTP")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Hold the scenario queue and merge results")
+    serve.add_argument("paths", nargs="*", default=["features"], help="Feature files or directories")
+    serve.add_argument("-t", "--tags", action="append", default=[], help="Tag expression, as for behave")
+    serve.add_argument("-D", "--define", action="append", default=[], help="Userdata, as for behave")
+    serve.add_argument("--host", default=None, help="Interface to listen on (0.0.0.0 for remote workers)")
+    serve.add_argument("--port", type=int, default=None, help="Port to listen on (0 picks a free one)")
+    serve.add_argument("--local-workers", type=int, default=0, help="Also start N workers on this machine")
+    serve.add_argument("--results-dir", default=None, help="Where to merge Allure results")
+
+    worker = commands.add_parser("worker", help="Run batches leased from a coordinator")
+    worker.add_argument("--url", required=True, help="Coordinator URL, e.g. http://10.0.0.5:8765")
+    worker.add_argument("--name", default=None, help="Worker name shown by the coordinator")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.command == "worker":
+        return run_worker(args.url, args.name)
+    return run_coordinator(args.paths, args.tags, args.define, args.host, args.port,
+                           args.local_workers, args.results_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
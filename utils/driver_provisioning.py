@@ -0,0 +1,236 @@
+"""Resolve WebDriver and browser binaries once per machine and cache them locally
+
+Usage:
+    python -m utils.driver_provisioning [chrome] [firefox] [--refresh]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+DRIVER_NAMES = {"chrome": "chromedriver", "firefox": "geckodriver"}
+BROWSER_NAMES = {
+    "chrome": ["google-chrome", "google-chrome-stable", "chrome", "chromium", "chromium-browser"],
+    "firefox": ["firefox"],
+}
+VERSION_PATTERN = re.compile(r"\d+(\.\d+)+")
+
+
+class DriverProvisioningError(RuntimeError):
+    """Raised when a driver or browser binary cannot be resolved"""
+
+
+class DriverProvisioner:
+    """Finds driver/browser binaries and records them in a versioned cache with a manifest.
+
+    Lookup order: environment override, cached manifest entry, PATH, and unless running offline
+    a one-off webdriver_manager download or Selenium Manager lookup. Whatever is found is cached,
+    so later runs need no network.
+    """
+
+    def __init__(self, cache_dir: str = None, offline: bool = None):
+        self.cache_dir = os.path.expanduser(cache_dir or Config.DRIVER_CACHE_DIR)
+        self.offline = Config.OFFLINE if offline is None else offline
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        self._resolved = {}
+
+    def resolve(self, browser_name: str, refresh: bool = False) -> dict:
+        """Return driver and browser paths and versions for a browser"""
+        browser_name = browser_name.lower()
+        if browser_name not in DRIVER_NAMES:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        if browser_name in self._resolved and not refresh:
+            return self._resolved[browser_name]
+
+        start = time.perf_counter()
+        browser_path = self._find_browser(browser_name)
+        browser_version = self.binary_version(browser_path) if browser_path else None
+
+        entry = None if refresh else self._cached_entry(browser_name, browser_version)
+        if entry is None:
+            driver_path = self._find_driver(browser_name, browser_path, browser_version)
+            driver_version = self.binary_version(driver_path)
+            entry = {
+                "driver_path": self._store_in_cache(browser_name, driver_path, driver_version),
+                "driver_version": driver_version,
+                "browser_path": browser_path,
+                "browser_version": browser_version,
+                "resolved_at": datetime.now().isoformat(),
+            }
+            self._save_entry(browser_name, entry)
+
+        logger.info(f"Provisioned {browser_name}: driver {entry['driver_version']} at {entry['driver_path']}, "
+                    f"browser {entry['browser_version']} ({time.perf_counter() - start:.2f}s)")
+        self._resolved[browser_name] = entry
+        return entry
+
+    def _find_browser(self, browser_name):
+        override = os.getenv(f"{browser_name.upper()}_BINARY")
+        if override:
+            if not os.path.isfile(override):
+                raise DriverProvisioningError(f"{browser_name.upper()}_BINARY points to a missing file: {override}")
+            return override
+        for name in BROWSER_NAMES[browser_name]:
+            path = shutil.which(name)
+            if path:
+                return path
+        # Let Selenium use the platform's default install location
+        return None
+
+    def _find_driver(self, browser_name, browser_path=None, browser_version=None):
+        driver_name = DRIVER_NAMES[browser_name]
+        override = os.getenv(f"{driver_name.upper()}_PATH")
+        if override:
+            if not os.path.isfile(override):
+                raise DriverProvisioningError(f"{driver_name.upper()}_PATH points to a missing file: {override}")
+            return override
+
+        path = shutil.which(driver_name)
+        if path:
+            return path
+
+        if self.offline:
+            raise DriverProvisioningError(
+                f"No cached {driver_name} in {self.cache_dir} and OFFLINE is set. Run "
+                f"'python -m utils.driver_provisioning {browser_name}' once with network access, "
+                f"or set {driver_name.upper()}_PATH."
+            )
+        path = self._download_driver(browser_name, browser_version) or self._selenium_manager_driver(browser_name, browser_path)
+        if not path:
+            raise DriverProvisioningError(
+                f"No cached {driver_name} in {self.cache_dir} and neither webdriver_manager nor "
+                f"Selenium Manager could fetch one. Run 'python -m utils.driver_provisioning {browser_name}' "
+                f"once with network access, or set {driver_name.upper()}_PATH."
+            )
+        return path
+
+    def _download_driver(self, browser_name, browser_version=None):
+        """Fetch the driver with webdriver_manager; only reached on a cache miss.
+
+        Returns None when webdriver_manager is missing, fails, or cannot serve the installed browser.
+        """
+        driver_name = DRIVER_NAMES[browser_name]
+        if browser_name == "chrome" and browser_version and int(browser_version.split(".")[0]) >= 115:
+            # webdriver_manager 3.x only knows the driver index that stopped at Chrome 114
+            logger.info(f"Chrome {browser_version}: asking Selenium Manager for {driver_name}")
+            return None
+        try:
+            if browser_name == "chrome":
+                from webdriver_manager.chrome import ChromeDriverManager as DriverManager
+            else:
+                from webdriver_manager.firefox import GeckoDriverManager as DriverManager
+            path = DriverManager(path=os.path.join(self.cache_dir, "downloads")).install()
+        except Exception as e:
+            logger.info(f"Could not download {driver_name} with webdriver_manager ({e}); asking Selenium Manager")
+            return None
+        return path if path and os.path.isfile(path) else None
+
+    def _selenium_manager_driver(self, browser_name, browser_path=None):
+        """Driver path chosen by Selenium Manager, the same lookup a bare webdriver.Chrome() does; None on failure"""
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+        options = ChromeOptions() if browser_name == "chrome" else FirefoxOptions()
+        if browser_path:
+            options.binary_location = browser_path
+        try:
+            path = SeleniumManager().driver_location(options)
+        except (WebDriverException, OSError, KeyError) as e:
+            logger.warning(f"Selenium Manager could not resolve {DRIVER_NAMES[browser_name]}: {e}")
+            return None
+        return path if path and os.path.isfile(path) else None
+
+    def _store_in_cache(self, browser_name, driver_path, version):
+        """Copy the driver into <cache>/<driver>/<version>/ so it survives PATH changes"""
+        driver_name = DRIVER_NAMES[browser_name]
+        target_dir = os.path.join(self.cache_dir, driver_name, version or "unknown")
+        target = os.path.join(target_dir, os.path.basename(driver_path))
+        if os.path.abspath(driver_path) == os.path.abspath(target):
+            return target
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            if not os.path.isfile(target):
+                shutil.copy2(driver_path, target)
+            return target
+        except OSError as e:
+            logger.warning(f"Could not cache {driver_name} in {target_dir}: {e}")
+            return driver_path
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _cached_entry(self, browser_name, browser_version):
+        """Manifest entry that still exists on disk and matches the installed browser"""
+        if os.getenv(f"{DRIVER_NAMES[browser_name].upper()}_PATH"):
+            return None
+        entry = self._load_manifest().get(browser_name)
+        if not entry or not os.path.isfile(entry.get("driver_path") or ""):
+            return None
+        if browser_version and entry.get("browser_version") != browser_version:
+            logger.info(f"{browser_name} changed from {entry.get('browser_version')} to {browser_version}; "
+                        f"resolving its driver again")
+            return None
+        return entry
+
+    def _save_entry(self, browser_name, entry):
+        """Update the manifest atomically; parallel workers may write it at once"""
+        manifest = self._load_manifest()
+        manifest[browser_name] = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write driver manifest {self.manifest_path}: {e}")
+
+    @staticmethod
+    def binary_version(path):
+        """Version number reported by `<binary> --version`, or None"""
+        if not path:
+            return None
+        try:
+            output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = VERSION_PATTERN.search(output)
+        return match.group(0) if match else None
+
+
+driver_provisioner = DriverProvisioner()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Resolve and cache WebDriver binaries")
+    parser.add_argument("browsers", nargs="*", default=[Config.DEFAULT_BROWSER])
+    parser.add_argument("--refresh", action="store_true", help="Ignore the manifest and resolve again")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        for browser_name in args.browsers:
+            driver_provisioner.resolve(browser_name, refresh=args.refresh)
+    except DriverProvisioningError as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
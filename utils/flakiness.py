@@ -0,0 +1,159 @@
+"""In-process reruns of failed scenarios, rerun files and flakiness scores across runs"""
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from behave.model import ScenarioOutline
+from utils.config import Config
+from utils.scheduler import scenario_key
+
+logger = logging.getLogger(__name__)
+
+PASSED, FAILED = "passed", "failed"
+
+
+def patch_scenario_with_rerun(scenario, max_attempts: int):
+    """Run a scenario (or every row of an outline) up to max_attempts times until it passes.
+
+    Like behave.contrib.scenario_autoretry, but each attempt is numbered on the
+    scenario as ``rerun_attempt`` so hooks can give retries a fresh browser.
+    """
+    def run_with_reruns(row, scenario_run, runner):
+        for attempt in range(1, max_attempts + 1):
+            row.rerun_attempt = attempt
+            failed = scenario_run(runner)
+            if not failed:
+                if attempt > 1:
+                    logger.warning(f"Scenario passed on attempt {attempt}: {row.name}")
+                return False
+            if attempt < max_attempts:
+                logger.warning(f"Scenario failed on attempt {attempt}, rerunning: {row.name}")
+        return True
+
+    rows = scenario.scenarios if isinstance(scenario, ScenarioOutline) else [scenario]
+    for row in rows:
+        row.run = functools.partial(run_with_reruns, row, row.run)
+
+
+def flip_score(outcomes) -> float:
+    """Share of consecutive outcomes that differ: 0 is stable, 1 alternates every time"""
+    if len(outcomes) < 2:
+        return 0.0
+    flips = sum(previous != current for previous, current in zip(outcomes, outcomes[1:]))
+    return flips / (len(outcomes) - 1)
+
+
+class FlakinessTracker:
+    """Collects each attempt's outcome during a run and keeps recent runs in a local JSON file"""
+
+    def __init__(self, path: str = None, history_runs: int = None):
+        self.path = path or Config.FLAKINESS_FILE
+        self.history_runs = history_runs or Config.FLAKINESS_HISTORY_RUNS
+        self.attempts = {}
+
+    def record(self, scenario):
+        """Record the outcome of one attempt; skipped and untested scenarios are ignored"""
+        status = scenario.status.name if hasattr(scenario.status, "name") else str(scenario.status)
+        if status not in (PASSED, FAILED):
+            return
+        entry = self.attempts.setdefault(scenario_key(scenario), {"location": str(scenario.location), "outcomes": []})
+        entry["outcomes"].append(status)
+
+    @contextmanager
+    def _locked(self, timeout: float = 10.0):
+        """Exclusive lock file, so parallel workers do not overwrite each other's history"""
+        lock_path = f"{self.path}.lock"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    # A crashed process left the lock behind
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    deadline = time.monotonic() + timeout
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def _load(self):
+        try:
+            with open(self.path) as flakiness_file:
+                return json.load(flakiness_file)
+        except (OSError, ValueError):
+            return {"scenarios": {}}
+
+    def finish_run(self) -> dict:
+        """Store this run's outcomes and sort its results into failures and flakes"""
+        report = {"failures": [], "known_flaky_failures": [], "passed_on_rerun": []}
+        if not self.attempts:
+            return report
+
+        with self._locked():
+            data = self._load()
+            for key, entry in self.attempts.items():
+                stored = data["scenarios"].setdefault(key, {"runs": []})
+                known_flaky = stored.get("score", 0.0) >= Config.FLAKY_SCORE_THRESHOLD
+                outcomes = entry["outcomes"]
+
+                stored["location"] = entry["location"]
+                stored["runs"] = (stored["runs"] + [outcomes])[-self.history_runs:]
+                stored["score"] = round(flip_score([outcome for run in stored["runs"] for outcome in run]), 3)
+
+                item = {"scenario": key, "location": entry["location"],
+                        "attempts": len(outcomes), "score": stored["score"]}
+                if outcomes[-1] == FAILED:
+                    report["known_flaky_failures" if known_flaky else "failures"].append(item)
+                elif FAILED in outcomes:
+                    report["passed_on_rerun"].append(item)
+
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as flakiness_file:
+                json.dump(data, flakiness_file, indent=2)
+            os.replace(temp_path, self.path)
+
+        self.attempts.clear()
+        return report
+
+    @staticmethod
+    def write_rerun_file(report: dict, path: str = None) -> str:
+        """Write failed locations in the `behave @file` format; an empty file means nothing failed"""
+        path = path or Config.RERUN_FILE
+        worker = os.getenv("PARALLEL_WORKER_INDEX")
+        if worker is not None:
+            # The parallel runner merges the per-worker files
+            root, extension = os.path.splitext(path)
+            path = f"{root}-worker-{worker}{extension}"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as rerun_file:
+            for item in report["failures"] + report["known_flaky_failures"]:
+                rerun_file.write(f"{item['location']}\n")
+        return path
+
+    @staticmethod
+    def log_report(report: dict):
+        """Log real failures apart from known-flaky ones and scenarios that only passed on rerun"""
+        sections = (
+            ("failures", "Failed scenarios", logger.error),
+            ("known_flaky_failures", "Failed scenarios known to be flaky", logger.warning),
+            ("passed_on_rerun", "Flaky scenarios that passed on rerun", logger.warning),
+        )
+        for name, title, log in sections:
+            if report[name]:
+                log(f"{title}:")
+                for item in report[name]:
+                    log(f"  {item['location']} {item['scenario']} "
+                        f"(attempts: {item['attempts']}, flakiness: {item['score']:.2f})")
+
+
+flakiness_tracker = FlakinessTracker()
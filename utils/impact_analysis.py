@@ -0,0 +1,492 @@
+"""Change-based impact analysis: select the scenarios a git diff can affect
+
+Features map to step definitions through behave's step matchers, step definitions
+to the page-object methods and locators they use, and those to their source
+lines. Everything is read with ``ast``, so no step or page module is imported.
+
+Usage:
+    python -m utils.impact_analysis [--base HEAD] [--explain] [--run [--workers N]]
+"""
+import argparse
+import ast
+import glob
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict, deque
+from typing import Dict, List, Set
+from behave.matchers import ParseMatcher
+from behave.parser import parse_file
+from utils.scenario_collection import FEATURES_DIR, STEPS_DIR, collect_scenarios, step_decorators
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT_FILE = os.path.join(FEATURES_DIR, "environment.py")
+PAGES_DIR = "pages"
+UTILS_DIR = "utils"
+BASE_PAGE_KEY = os.path.join(PAGES_DIR, "base_page.py") + "::BasePage"
+
+# Changes here can affect any scenario
+GLOBAL_FILES = {"behave.ini", "requirements.txt"}
+# Non-Python files a module depends on
+DATA_DEPENDENCIES = {os.path.join(UTILS_DIR, "local_server.py"): os.path.join(UTILS_DIR, "local_app") + os.sep}
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+ALL_LINES = None
+
+
+def changed_lines_from_diff(diff_text: str) -> Dict[str, Set[int]]:
+    """Map each file of a unified diff to its changed line numbers in the new version.
+
+    Deleted files map to ALL_LINES. Pure deletions mark the lines around them.
+    """
+    changes = {}
+    path = None
+    for line in diff_text.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:].strip()
+            path = None if target == "/dev/null" else os.path.normpath(target[2:] if target.startswith("b/") else target)
+            if path is not None:
+                changes.setdefault(path, set())
+        elif line.startswith("--- ") and line[4:].strip() != "/dev/null":
+            source = line[4:].strip()
+            deleted = os.path.normpath(source[2:] if source.startswith("a/") else source)
+            if not os.path.exists(deleted):
+                changes[deleted] = ALL_LINES
+        elif path is not None and changes.get(path) is not ALL_LINES:
+            match = HUNK_HEADER.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                changes[path].update(range(start, start + count) if count else (start, start + 1))
+    return changes
+
+
+def git_changes(base: str = "HEAD") -> Dict[str, Set[int]]:
+    """Changed lines of the working tree against `base`, plus untracked files"""
+    diff = subprocess.run(["git", "diff", "-U0", base], capture_output=True, text=True, check=True).stdout
+    changes = changed_lines_from_diff(diff)
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"],
+                               capture_output=True, text=True, check=True).stdout
+    for path in untracked.splitlines():
+        changes[os.path.normpath(path)] = ALL_LINES
+    return changes
+
+
+def symbol_range(node):
+    """First and last line of a definition, counting its decorators"""
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return start, node.end_lineno
+
+
+class SourceIndex:
+    """Symbols of the page objects, step definitions and hooks, and what each one uses.
+
+    Symbols are keyed ``path::Name`` or ``path::Class.member``, for utils/ modules
+    as for pages. Module-level instances such as ``driver_pool = DriverPool()`` are
+    followed to their class, so ``driver_pool.release`` uses ``DriverPool.release``.
+    """
+
+    def __init__(self):
+        self.symbols = {}
+        self.edges = defaultdict(set)
+        self.classes = {}
+        self.instances = {}
+        self.modules = {}
+        self.step_definitions = []
+        self.hook_keys = []
+
+        python_files = (sorted(glob.glob(os.path.join(PAGES_DIR, "*.py")))
+                        + sorted(glob.glob(os.path.join(STEPS_DIR, "*.py")))
+                        + [ENVIRONMENT_FILE]
+                        + sorted(glob.glob(os.path.join(UTILS_DIR, "*.py"))))
+        trees = {path: self._parse(path) for path in python_files if os.path.isfile(path)}
+
+        for path, tree in trees.items():
+            self._index_definitions(path, tree)
+        for info in self.classes.values():
+            info["bases"] = [base for base in (self.resolve_name(info["file"], getattr(node, "id", None))
+                                               for node in info["node"].bases) if base in self.classes]
+        for path, tree in trees.items():
+            self._index_instances(path, tree)
+        for path, tree in trees.items():
+            self._index_uses(path, tree)
+        for path, data_dir in DATA_DEPENDENCIES.items():
+            # Every symbol of the module depends on its path, so they all reach the data
+            self.edges[path].add(data_dir)
+
+    @staticmethod
+    def _parse(path):
+        with open(path) as source_file:
+            return ast.parse(source_file.read(), filename=path)
+
+    @staticmethod
+    def module_path(module_name):
+        path = module_name.replace(".", os.sep) + ".py"
+        return path if os.path.isfile(path) else None
+
+    def _imports(self, tree):
+        """Local name -> (repo file, imported name or None for a module)"""
+        imports = {}
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and node.module:
+                path = self.module_path(node.module)
+                if path:
+                    for alias in node.names:
+                        imports[alias.asname or alias.name] = (path, alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    path = self.module_path(alias.name)
+                    if path:
+                        imports[alias.asname or alias.name.split(".")[0]] = (path, None)
+        return imports
+
+    def _add_symbol(self, key, path, name, node):
+        start, end = symbol_range(node)
+        self.symbols[key] = {"file": path, "name": name, "start": start, "end": end}
+        # Every symbol depends on its module's imports
+        self.edges[key].add(path)
+
+    def _index_definitions(self, path, tree):
+        module = {"imports": self._imports(tree), "symbols": {}, "import_lines": set()}
+        self.modules[path] = module
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                module["import_lines"].update(range(node.lineno, node.end_lineno + 1))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                key = f"{path}::{node.name}"
+                self._add_symbol(key, path, node.name, node)
+                module["symbols"][node.name] = key
+                self._index_step_definition(path, node, key)
+                if path == ENVIRONMENT_FILE:
+                    self.hook_keys.append(key)
+            elif isinstance(node, ast.ClassDef):
+                key = f"{path}::{node.name}"
+                self._add_symbol(key, path, node.name, node)
+                module["symbols"][node.name] = key
+                self.classes[key] = {"node": node, "file": path, "bases": [], "members": {}}
+                for member in node.body:
+                    for name in self._member_names(member):
+                        member_key = f"{key}.{name}"
+                        self._add_symbol(member_key, path, f"{node.name}.{name}", member)
+                        self.classes[key]["members"][name] = member_key
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                for name in self._member_names(node):
+                    key = f"{path}::{name}"
+                    self._add_symbol(key, path, name, node)
+                    module["symbols"][name] = key
+
+    @staticmethod
+    def _member_names(node):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return [node.name]
+        targets = node.targets if isinstance(node, ast.Assign) else \
+            [node.target] if isinstance(node, ast.AnnAssign) else []
+        return [target.id for target in targets if isinstance(target, ast.Name)]
+
+    def _index_step_definition(self, path, node, key):
+        for step_type, pattern, line in step_decorators(node):
+            self.step_definitions.append({
+                "step_type": step_type,
+                "pattern": pattern,
+                "matcher": ParseMatcher(None, pattern),
+                "key": key,
+                "line": line,
+            })
+
+    # Resolution
+    def resolve_name(self, path, name):
+        """Key of a name as seen from a module, or None when it is not from this repo"""
+        module = self.modules.get(path, {})
+        if name in module.get("symbols", {}):
+            return module["symbols"][name]
+        if name in module.get("imports", {}):
+            source, imported = module["imports"][name]
+            source_symbols = self.modules.get(source, {}).get("symbols", {})
+            if imported and imported in source_symbols:
+                return source_symbols[imported]
+            return source
+        return None
+
+    def mro(self, class_key):
+        """Repo classes in lookup order, starting with the class itself"""
+        order, pending = [], [class_key]
+        while pending:
+            key = pending.pop(0)
+            if key in self.classes and key not in order:
+                order.append(key)
+                pending.extend(self.classes[key]["bases"])
+        return order
+
+    def resolve_member(self, class_key, name, skip_self=False):
+        for key in self.mro(class_key)[1 if skip_self else 0:]:
+            if name in self.classes[key]["members"]:
+                return self.classes[key]["members"][name]
+        return None
+
+    def overrides(self, class_key, name):
+        """Members named `name` defined by subclasses of a class, which `self.<name>` may resolve to"""
+        return {info["members"][name] for key, info in self.classes.items()
+                if key != class_key and name in info["members"] and class_key in self.mro(key)}
+
+    def is_page_object(self, class_key):
+        return BASE_PAGE_KEY in self.mro(class_key)
+
+    def _index_instances(self, path, tree):
+        """Module-level names bound to an instance of a repo class"""
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                    and isinstance(node.value.func, ast.Name):
+                class_key = self.resolve_name(path, node.value.func.id)
+                if class_key in self.classes:
+                    for name in self._member_names(node):
+                        self.instances[f"{path}::{name}"] = class_key
+
+    # Uses
+    def _index_uses(self, path, tree):
+        # Steps and hooks reach page objects through context attributes
+        guess_members = path.startswith(STEPS_DIR + os.sep) or path == ENVIRONMENT_FILE
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Assign, ast.AnnAssign)):
+                for name in self._member_names(node):
+                    self.edges[f"{path}::{name}"].update(self._body_uses(path, node, None, guess_members))
+            elif isinstance(node, ast.ClassDef):
+                class_key = f"{path}::{node.name}"
+                for member in node.body:
+                    for name in self._member_names(member):
+                        self.edges[f"{class_key}.{name}"].update(
+                            self._body_uses(path, member, class_key, guess_members))
+
+    def _local_instances(self, path, node):
+        """Local names bound to an instance of a repo class inside a definition, e.g. ``page = ProductsPage(driver)``"""
+        local_instances = {}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Assign) and isinstance(child.value, ast.Call) \
+                    and isinstance(child.value.func, ast.Name):
+                class_key = self.resolve_name(path, child.value.func.id)
+                if class_key in self.classes:
+                    for name in self._member_names(child):
+                        local_instances[name] = class_key
+        return local_instances
+
+    def _body_uses(self, path, node, class_key, guess_members):
+        """Keys a definition uses: own-class members and their overrides, repo names, and page-object methods"""
+        uses, page_classes, unresolved = set(), set(), set()
+        local_instances = self._local_instances(path, node)
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                key = self.resolve_name(path, child.id)
+                if key is None or key == f"{path}::{getattr(node, 'name', None)}":
+                    continue
+                if key in self.classes:
+                    # Using a class means constructing it, and for pages calling its methods
+                    if self.is_page_object(key):
+                        page_classes.add(key)
+                    uses.add(self.resolve_member(key, "__init__") or key)
+                else:
+                    uses.add(key)
+            elif isinstance(child, ast.Attribute):
+                owner = child.value
+                if isinstance(owner, ast.Name) and owner.id in ("self", "cls") and class_key:
+                    member = self.resolve_member(class_key, child.attr)
+                    # On a subclass instance, self.<name> is the subclass's override
+                    uses.update(self.overrides(class_key, child.attr))
+                elif (isinstance(owner, ast.Call) and isinstance(owner.func, ast.Name)
+                      and owner.func.id == "super" and class_key):
+                    member = self.resolve_member(class_key, child.attr, skip_self=True)
+                elif isinstance(owner, ast.Name) and owner.id in local_instances:
+                    member = self.resolve_member(local_instances[owner.id], child.attr)
+                elif isinstance(owner, ast.Name) and self.resolve_name(path, owner.id):
+                    # Names from this repo were handled above; classes and their instances have members
+                    owner_key = self.resolve_name(path, owner.id)
+                    owner_key = self.instances.get(owner_key, owner_key)
+                    member = self.resolve_member(owner_key, child.attr) if owner_key in self.classes else None
+                else:
+                    member = None
+                    unresolved.add(child.attr)
+                if member:
+                    uses.add(member)
+
+        if guess_members:
+            # Steps reach page objects through context attributes, so match methods by name
+            all_pages = [key for key in self.classes if self.is_page_object(key)]
+            for name in unresolved:
+                for candidates in (page_classes, all_pages):
+                    members = set(filter(None, (self.resolve_member(key, name) for key in candidates)))
+                    if members:
+                        uses.update(members)
+                        break
+        return uses
+
+    # Changes
+    def changed_keys(self, changes: Dict[str, Set[int]]) -> Dict[str, str]:
+        """Keys touched by a diff, each with a description of the change"""
+        changed = {}
+        for path, lines in changes.items():
+            for prefix in DATA_DEPENDENCIES.values():
+                if path.startswith(prefix):
+                    changed[prefix] = f"{path} changed"
+            if path in self.modules:
+                changed.update(self._changed_symbols(path, lines))
+            elif path.endswith(".py") and path.startswith((PAGES_DIR + os.sep, STEPS_DIR + os.sep,
+                                                           UTILS_DIR + os.sep)):
+                changed[path] = f"{path} deleted"
+        return changed
+
+    def _changed_symbols(self, path, lines):
+        symbols = {key: symbol for key, symbol in self.symbols.items() if symbol["file"] == path}
+        if lines is ALL_LINES:
+            changed = {key: f"{path} is new" for key in symbols}
+            changed[path] = f"{path} is new"
+            return changed
+
+        changed = {}
+        for line in sorted(lines):
+            if line in self.modules[path]["import_lines"]:
+                changed[path] = f"imports of {path} changed (line {line})"
+                continue
+            # Innermost definition containing the line
+            containing = [key for key, symbol in symbols.items() if symbol["start"] <= line <= symbol["end"]]
+            if not containing:
+                continue
+            key = max(containing, key=lambda candidate: symbols[candidate]["start"])
+            changed.setdefault(key, f"{path}:{line} changed")
+            if key in self.classes:
+                # A change to the class itself, e.g. its bases, reaches every member;
+                # a change inside one member reaches only that member's users
+                for member_key in self.classes[key]["members"].values():
+                    changed.setdefault(member_key, f"{path}:{line} changed (class {symbols[key]['name']})")
+        return changed
+
+    def affected(self, changed: Dict[str, str]) -> Dict[str, str]:
+        """Every key that uses a changed key, mapped to the next key on the way to the change"""
+        users = defaultdict(set)
+        for key, uses in self.edges.items():
+            for used in uses:
+                users[used].add(key)
+        via = {key: None for key in changed}
+        queue = deque(changed)
+        while queue:
+            key = queue.popleft()
+            for user in users[key]:
+                if user not in via:
+                    via[user] = key
+                    queue.append(user)
+        return via
+
+    def describe(self, key):
+        if key in self.symbols:
+            symbol = self.symbols[key]
+            return f"{symbol['name']} ({symbol['file']}:{symbol['start']})"
+        return key
+
+    def chain(self, key, via, changed):
+        """Readable path from a key to the change that reaches it"""
+        parts = []
+        while key is not None:
+            parts.append(self.describe(key))
+            if key in changed:
+                parts.append(f"[{changed[key]}]")
+            key = via.get(key)
+        return " -> ".join(parts)
+
+    def match_step(self, step):
+        for definition in self.step_definitions:
+            if definition["step_type"] in (step.step_type, "step") and \
+                    definition["matcher"].check_match(step.name) is not None:
+                return definition
+        return None
+
+
+def feature_line_changes(feature_file, lines):
+    """Scenario locations selected by changed lines of a feature file, with reasons"""
+    feature = parse_file(feature_file)
+    if feature is None:
+        return {}
+    locations = {str(scenario.location): None for scenario in feature.walk_scenarios()}
+    if lines is ALL_LINES:
+        return {location: f"{feature_file} is new" for location in locations}
+
+    blocks = sorted(([feature.background] if feature.background else []) + list(feature.scenarios),
+                    key=lambda block: block.line)
+    selected = {}
+    for line in sorted(lines):
+        block = next((block for block in reversed(blocks) if block.line <= line), None)
+        if block is None or block is feature.background:
+            # Feature header or Background: every scenario runs it
+            selected.update({location: f"{feature_file}:{line} changed" for location in locations})
+            continue
+        rows = [str(row.location) for row in getattr(block, "scenarios", [])]
+        row = next((row for row in rows if row.endswith(f":{line}")), None)
+        for location in [row] if row else rows or [str(block.location)]:
+            selected.setdefault(location, f"{feature_file}:{line} changed")
+    return selected
+
+
+def analyse(changes: Dict[str, Set[int]], paths: List[str] = None, tags: List[str] = None):
+    """Return {scenario location: (scenario, [reasons])} for the scenarios a change affects"""
+    global_changes = sorted(path for path in changes if path in GLOBAL_FILES)
+    index = SourceIndex()
+    changed = index.changed_keys(changes)
+    via = index.affected(changed)
+
+    feature_reasons = {}
+    for path, lines in changes.items():
+        if path.endswith(".feature") and os.path.isfile(path):
+            feature_reasons.update(feature_line_changes(path, lines))
+
+    hook_reasons = [f"hook {index.chain(key, via, changed)}" for key in index.hook_keys if key in via]
+    selected = {}
+    for scenario in collect_scenarios(paths, tags):
+        location = str(scenario.location)
+        reasons = [f"{path} changed" for path in global_changes] + hook_reasons
+        if location in feature_reasons:
+            reasons.append(feature_reasons[location])
+        for step in scenario.all_steps:
+            definition = index.match_step(step)
+            if definition and definition["key"] in via:
+                reasons.append(f"{step.keyword} {step.name} -> {index.chain(definition['key'], via, changed)}")
+        if reasons:
+            selected[location] = (scenario, reasons)
+    return selected
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Select the scenarios affected by a change")
+    parser.add_argument("paths", nargs="*", default=None, help="Feature files or directories to consider")
+    parser.add_argument("--base", default="HEAD", help="Git revision to diff the working tree against")
+    parser.add_argument("--diff-file", default=None, help="Read a unified diff from a file ('-' for stdin)")
+    parser.add_argument("-t", "--tags", action="append", default=[], help="Tag expression, as for behave")
+    parser.add_argument("--explain", action="store_true", help="Show why each scenario was selected")
+    parser.add_argument("--run", action="store_true", help="Run the selected scenarios with the parallel runner")
+    parser.add_argument("-D", "--define", action="append", default=[], help="Userdata for --run, as for behave")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes for --run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.diff_file:
+        with (sys.stdin if args.diff_file == "-" else open(args.diff_file)) as diff_file:
+            changes = changed_lines_from_diff(diff_file.read())
+    else:
+        changes = git_changes(args.base)
+
+    selected = analyse(changes, args.paths or None, args.tags)
+    for location, (scenario, reasons) in selected.items():
+        print(location)
+        if args.explain:
+            print(f"  {scenario.name}")
+            for reason in reasons:
+                print(f"    {reason}")
+    logger.info(f"{len(selected)} scenarios affected by {len(changes)} changed files")
+
+    if args.run:
+        if not selected:
+            return 0
+        from utils.parallel_runner import run_parallel
+        return run_parallel(list(selected), args.tags, args.define, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+/* Local stand-in for the SauceDemo (Swag Labs) app.
+ *
+ * Mirrors the markup, ids, storage keys and messages the page objects rely on.
+ * Every route is served the same index.html; the page is chosen from the path.
+ */
+(function () {
+    "use strict";
+
+    var SESSION_COOKIE = "session-username";
+    var CART_KEY = "cart-contents";
+    var SESSION_MINUTES = 10;
+    var PASSWORD = "secret_sauce";
+    var USERS = ["standard_user", "locked_out_user", "problem_user",
+                 "performance_glitch_user", "error_user", "visual_user"];
+    var LOCKED_USERS = ["locked_out_user"];
+    var PROTECTED_PAGES = ["/inventory.html", "/inventory-item.html", "/cart.html",
+                           "/checkout-step-one.html", "/checkout-step-two.html",
+                           "/checkout-complete.html"];
+    var TAX_RATE = 0.08;
+
+    var PRODUCTS = [
+        {id: 0, name: "Sauce Labs Bike Light", price: 9.99,
+         desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+        {id: 1, name: "Sauce Labs Bolt T-Shirt", price: 15.99,
+         desc: "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt."},
+        {id: 2, name: "Sauce Labs Onesie", price: 7.99,
+         desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: "Test.allTheThings() T-Shirt (Red)", price: 15.99,
+         desc: "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton."},
+        {id: 4, name: "Sauce Labs Backpack", price: 29.99,
+         desc: "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection."},
+        {id: 5, name: "Sauce Labs Fleece Jacket", price: 49.99,
+         desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."}
+    ];
+
+    var SORTS = {
+        az: {label: "Name (A to Z)", compare: function (a, b) { return a.name.localeCompare(b.name); }},
+        za: {label: "Name (Z to A)", compare: function (a, b) { return b.name.localeCompare(a.name); }},
+        lohi: {label: "Price (low to high)", compare: function (a, b) { return a.price - b.price; }},
+        hilo: {label: "Price (high to low)", compare: function (a, b) { return b.price - a.price; }}
+    };
+
+    var root = document.getElementById("root");
+    var flashError = null;
+
+    // ---- helpers --------------------------------------------------------
+
+    function escapeHtml(value) {
+        return String(value).replace(/[&<>"']/g, function (ch) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[ch];
+        });
+    }
+
+    function slug(name) {
+        return name.toLowerCase().replace(/\s+/g, "-");
+    }
+
+    function money(value) {
+        return "$" + value.toFixed(2);
+    }
+
+    function productById(id) {
+        return PRODUCTS.filter(function (product) { return product.id === id; })[0];
+    }
+
+    function getSessionUser() {
+        var match = document.cookie.match(new RegExp("(?:^|; )" + SESSION_COOKIE + "=([^;]*)"));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function setSessionUser(username) {
+        var expires = new Date(Date.now() + SESSION_MINUTES * 60 * 1000).toUTCString();
+        document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(username) + "; expires=" + expires + "; path=/";
+    }
+
+    function clearSessionUser() {
+        document.cookie = SESSION_COOKIE + "=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/";
+    }
+
+    function getCart() {
+        try {
+            var ids = JSON.parse(window.localStorage.getItem(CART_KEY) || "[]");
+            return Array.isArray(ids) ? ids.filter(function (id) { return productById(id); }) : [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function setCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function navigate(path) {
+        window.location.href = path;
+    }
+
+    function errorBox(message) {
+        if (!message) {
+            return '<div class="error-message-container"></div>';
+        }
+        return '<div class="error-message-container error">' +
+               '<h3 data-test="error">' + escapeHtml(message) +
+               '<button class="error-button" data-test="error-button">x</button></h3></div>';
+    }
+
+    function bindErrorButton() {
+        var button = root.querySelector(".error-button");
+        if (button) {
+            button.addEventListener("click", function () {
+                root.querySelector(".error-message-container").outerHTML = errorBox(null);
+            });
+        }
+    }
+
+    // ---- shared layout --------------------------------------------------
+
+    function header(title, extra) {
+        var count = getCart().length;
+        return '<div id="page_wrapper" class="page_wrapper"><div id="contents_wrapper">' +
+            '<div class="header_container" id="header_container" data-test="header-container">' +
+            '<div class="primary_header" data-test="primary-header">' +
+            '<div id="menu_button_container"><div class="bm-burger-button">' +
+            '<button id="react-burger-menu-btn" type="button">Open Menu</button></div>' +
+            '<div class="bm-menu-wrap" id="menu" aria-hidden="true" hidden><nav class="bm-item-list">' +
+            '<a id="inventory_sidebar_link" class="bm-item menu-item" href="/inventory.html">All Items</a>' +
+            '<a id="about_sidebar_link" class="bm-item menu-item" href="https://saucelabs.com/">About</a>' +
+            '<a id="logout_sidebar_link" class="bm-item menu-item" href="#">Logout</a>' +
+            '<a id="reset_sidebar_link" class="bm-item menu-item" href="#">Reset App State</a>' +
+            '</nav><button id="react-burger-cross-btn" type="button">Close Menu</button></div></div>' +
+            '<div class="header_label"><div class="app_logo">Swag Labs</div></div>' +
+            '<div id="shopping_cart_container" class="shopping_cart_container">' +
+            '<a class="shopping_cart_link" data-test="shopping-cart-link" href="/cart.html">' +
+            (count ? '<span class="shopping_cart_badge" data-test="shopping-cart-badge">' + count + '</span>' : '') +
+            '</a></div></div>' +
+            '<div class="header_secondary_container" data-test="secondary-header">' +
+            '<span class="title" data-test="title">' + escapeHtml(title) + '</span>' + (extra || '') +
+            '</div></div>';
+    }
+
+    function footer() {
+        return '<footer class="footer" data-test="footer"><div class="footer_copy">' +
+               '&copy; 2024 Sauce Labs. All Rights Reserved.</div></footer></div></div>';
+    }
+
+    function bindHeader() {
+        var menu = document.getElementById("menu");
+        document.getElementById("react-burger-menu-btn").addEventListener("click", function () {
+            menu.hidden = false;
+            menu.setAttribute("aria-hidden", "false");
+        });
+        document.getElementById("react-burger-cross-btn").addEventListener("click", function () {
+            menu.hidden = true;
+            menu.setAttribute("aria-hidden", "true");
+        });
+        document.getElementById("logout_sidebar_link").addEventListener("click", function (event) {
+            event.preventDefault();
+            clearSessionUser();
+            navigate("/");
+        });
+        document.getElementById("reset_sidebar_link").addEventListener("click", function (event) {
+            event.preventDefault();
+            setCart([]);
+            render();
+        });
+    }
+
+    function updateBadge() {
+        var link = root.querySelector(".shopping_cart_link");
+        var count = getCart().length;
+        link.innerHTML = count ?
+            '<span class="shopping_cart_badge" data-test="shopping-cart-badge">' + count + '</span>' : '';
+    }
+
+    function cartButton(product, inCart) {
+        return inCart ?
+            '<button class="btn btn_secondary btn_small btn_inventory" id="remove-' + slug(product.name) +
+            '" data-id="' + product.id + '" name="remove-' + slug(product.name) + '">Remove</button>' :
+            '<button class="btn btn_primary btn_small btn_inventory" id="add-to-cart-' + slug(product.name) +
+            '" data-id="' + product.id + '" name="add-to-cart-' + slug(product.name) + '">Add to cart</button>';
+    }
+
+    var onCartChange = null;
+
+    // One delegated listener, so re-rendered buttons never get duplicate handlers
+    root.addEventListener("click", function (event) {
+        var button = event.target.closest("button.btn_inventory");
+        if (!button) {
+            return;
+        }
+        var id = parseInt(button.getAttribute("data-id"), 10);
+        var cart = getCart().filter(function (itemId) { return itemId !== id; });
+        var adding = button.id.indexOf("add-to-cart") === 0;
+        if (adding) {
+            cart.push(id);
+        }
+        setCart(cart);
+        button.outerHTML = cartButton(productById(id), adding);
+        updateBadge();
+        if (onCartChange) {
+            onCartChange();
+        }
+    });
+
+    // ---- pages ----------------------------------------------------------
+
+    function loginPage() {
+        document.body.className = "login";
+        root.innerHTML =
+            '<div class="login_container"><div class="login_logo">Swag Labs</div>' +
+            '<div class="login_wrapper"><div class="login_wrapper-inner"><div id="login_button_container" class="form_column">' +
+            '<div class="login-box"><form>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Username" type="text" ' +
+            'data-test="username" id="user-name" name="user-name" autocorrect="off" autocapitalize="none" value=""></div>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Password" type="password" ' +
+            'data-test="password" id="password" name="password" autocorrect="off" autocapitalize="none" value=""></div>' +
+            errorBox(flashError) +
+            '<input type="submit" class="submit-button btn_action" data-test="login-button" id="login-button" name="login-button" value="Login">' +
+            '</form></div></div></div>' +
+            '<div class="login_credentials_wrap"><div class="login_credentials_wrap-inner">' +
+            '<div id="login_credentials" class="login_credentials" data-test="login-credentials">' +
+            '<h4>Accepted usernames are:</h4>' + USERS.join('<br>') + '</div>' +
+            '<div class="login_password" data-test="login-password"><h4>Password for all users:</h4>' + PASSWORD + '</div>' +
+            '</div></div></div></div>';
+        bindErrorButton();
+
+        root.querySelector("form").addEventListener("submit", function (event) {
+            event.preventDefault();
+            var username = document.getElementById("user-name").value;
+            var password = document.getElementById("password").value;
+            var error = null;
+
+            if (!username) {
+                error = "Epic sadface: Username is required";
+            } else if (!password) {
+                error = "Epic sadface: Password is required";
+            } else if (USERS.indexOf(username) === -1 || password !== PASSWORD) {
+                error = "Epic sadface: Username and password do not match any user in this service";
+            } else if (LOCKED_USERS.indexOf(username) !== -1) {
+                error = "Epic sadface: Sorry, this user has been locked out.";
+            }
+
+            if (error) {
+                root.querySelector(".error-message-container").outerHTML = errorBox(error);
+                bindErrorButton();
+                return;
+            }
+            setSessionUser(username);
+            navigate("/inventory.html");
+        });
+    }
+
+    function inventoryPage() {
+        var sortKey = new URLSearchParams(window.location.search).get("sort") || "az";
+        var sort = SORTS[sortKey] || SORTS.az;
+        var cart = getCart();
+        var options = Object.keys(SORTS).map(function (key) {
+            return '<option value="' + key + '"' + (SORTS[key] === sort ? ' selected' : '') + '>' +
+                   SORTS[key].label + '</option>';
+        }).join('');
+        var items = PRODUCTS.slice().sort(sort.compare).map(function (product) {
+            return '<div class="inventory_item" data-test="inventory-item">' +
+                '<div class="inventory_item_img"><a href="/inventory-item.html?id=' + product.id + '" id="item_' + product.id + '_img_link">' +
+                '<img alt="' + escapeHtml(product.name) + '" class="inventory_item_img" src="/static/media/product-' + product.id + '.svg"></a></div>' +
+                '<div class="inventory_item_description" data-test="inventory-item-description"><div class="inventory_item_label">' +
+                '<a href="/inventory-item.html?id=' + product.id + '" id="item_' + product.id + '_title_link">' +
+                '<div class="inventory_item_name" data-test="inventory-item-name">' + escapeHtml(product.name) + '</div></a>' +
+                '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(product.desc) + '</div></div>' +
+                '<div class="pricebar"><div class="inventory_item_price" data-test="inventory-item-price">' + money(product.price) + '</div>' +
+                cartButton(product, cart.indexOf(product.id) !== -1) + '</div></div></div>';
+        }).join('');
+
+        root.innerHTML = header("Products",
+            '<div class="right_component"><span class="select_container">' +
+            '<select class="product_sort_container" data-test="product-sort-container">' + options + '</select>' +
+            '</span></div>') +
+            '<div id="inventory_container" class="inventory_container"><div>' +
+            '<div class="inventory_list" data-test="inventory-list">' + items + '</div></div></div>' + footer();
+        bindHeader();
+        root.querySelector(".product_sort_container").addEventListener("change", function (event) {
+            window.history.replaceState(null, "", "/inventory.html?sort=" + event.target.value);
+            inventoryPage();
+        });
+    }
+
+    function inventoryItemPage() {
+        var id = parseInt(new URLSearchParams(window.location.search).get("id"), 10);
+        var product = productById(id);
+        if (!product) {
+            navigate("/inventory.html");
+            return;
+        }
+        root.innerHTML = header("", '<button class="btn btn_secondary back btn_large inventory_details_back_button" ' +
+            'id="back-to-products" data-test="back-to-products">Back to products</button>') +
+            '<div class="inventory_details"><div class="inventory_details_container">' +
+            '<img alt="' + escapeHtml(product.name) + '" class="inventory_details_img" src="/static/media/product-' + product.id + '.svg">' +
+            '<div class="inventory_details_desc_container">' +
+            '<div class="inventory_details_name large_size" data-test="inventory-item-name">' + escapeHtml(product.name) + '</div>' +
+            '<div class="inventory_details_desc large_size" data-test="inventory-item-desc">' + escapeHtml(product.desc) + '</div>' +
+            '<div class="inventory_details_price" data-test="inventory-item-price">' + money(product.price) + '</div>' +
+            cartButton(product, getCart().indexOf(product.id) !== -1) +
+            '</div></div></div>' + footer();
+        bindHeader();
+        document.getElementById("back-to-products").addEventListener("click", function () {
+            navigate("/inventory.html");
+        });
+    }
+
+    function cartItems(withRemove) {
+        return getCart().map(function (id) {
+            var product = productById(id);
+            return '<div class="cart_item" data-test="inventory-item">' +
+                '<div class="cart_quantity" data-test="item-quantity">1</div>' +
+                '<div class="cart_item_label"><a href="/inventory-item.html?id=' + product.id + '" id="item_' + product.id + '_title_link">' +
+                '<div class="inventory_item_name" data-test="inventory-item-name">' + escapeHtml(product.name) + '</div></a>' +
+                '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(product.desc) + '</div>' +
+                '<div class="item_pricebar"><div class="inventory_item_price" data-test="inventory-item-price">' + money(product.price) + '</div>' +
+                (withRemove ? cartButton(product, true) : '') + '</div></div></div>';
+        }).join('');
+    }
+
+    function cartPage() {
+        root.innerHTML = header("Your Cart") +
+            '<div id="cart_contents_container" class="cart_contents_container"><div>' +
+            '<div class="cart_list" data-test="cart-list"><div class="cart_quantity_label">QTY</div>' +
+            '<div class="cart_desc_label">Description</div>' + cartItems(true) + '</div>' +
+            '<div class="cart_footer">' +
+            '<button class="btn btn_secondary back btn_medium" id="continue-shopping" data-test="continue-shopping">Continue Shopping</button>' +
+            '<button class="btn btn_action btn_medium checkout_button" id="checkout" data-test="checkout">Checkout</button>' +
+            '</div></div></div>' + footer();
+        bindHeader();
+        onCartChange = function () {
+            Array.prototype.forEach.call(root.querySelectorAll(".cart_item"), function (item) {
+                if (item.querySelector("button[id^='add-to-cart']")) {
+                    item.parentNode.removeChild(item);
+                }
+            });
+        };
+        document.getElementById("continue-shopping").addEventListener("click", function () {
+            navigate("/inventory.html");
+        });
+        document.getElementById("checkout").addEventListener("click", function () {
+            navigate("/checkout-step-one.html");
+        });
+    }
+
+    function checkoutStepOnePage() {
+        root.innerHTML = header("Checkout: Your Information") +
+            '<div id="checkout_info_container" class="checkout_info_container"><div class="checkout_info_wrapper"><form>' +
+            '<div class="checkout_info">' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="First Name" type="text" data-test="firstName" id="first-name" name="firstName" value=""></div>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Last Name" type="text" data-test="lastName" id="last-name" name="lastName" value=""></div>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Zip/Postal Code" type="text" data-test="postalCode" id="postal-code" name="postalCode" value=""></div>' +
+            errorBox(null) + '</div>' +
+            '<div class="checkout_buttons">' +
+            '<button class="btn btn_secondary back btn_medium cart_cancel_link" type="button" id="cancel" data-test="cancel">Cancel</button>' +
+            '<input type="submit" class="submit-button btn btn_primary cart_button btn_action" data-test="continue" id="continue" name="continue" value="Continue">' +
+            '</div></form></div></div>' + footer();
+        bindHeader();
+        document.getElementById("cancel").addEventListener("click", function () {
+            navigate("/cart.html");
+        });
+        root.querySelector("form").addEventListener("submit", function (event) {
+            event.preventDefault();
+            var error = null;
+            if (!document.getElementById("first-name").value) {
+                error = "Error: First Name is required";
+            } else if (!document.getElementById("last-name").value) {
+                error = "Error: Last Name is required";
+            } else if (!document.getElementById("postal-code").value) {
+                error = "Error: Postal Code is required";
+            }
+            if (error) {
+                root.querySelector(".error-message-container").outerHTML = errorBox(error);
+                bindErrorButton();
+                return;
+            }
+            navigate("/checkout-step-two.html");
+        });
+    }
+
+    function checkoutStepTwoPage() {
+        var subtotal = getCart().reduce(function (sum, id) { return sum + productById(id).price; }, 0);
+        var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+        root.innerHTML = header("Checkout: Overview") +
+            '<div id="checkout_summary_container" class="checkout_summary_container"><div>' +
+            '<div class="cart_list" data-test="cart-list"><div class="cart_quantity_label">QTY</div>' +
+            '<div class="cart_desc_label">Description</div>' + cartItems(false) + '</div>' +
+            '<div class="summary_info">' +
+            '<div class="summary_info_label" data-test="payment-info-label">Payment Information:</div>' +
+            '<div class="summary_value_label" data-test="payment-info-value">SauceCard #31337</div>' +
+            '<div class="summary_info_label" data-test="shipping-info-label">Shipping Information:</div>' +
+            '<div class="summary_value_label" data-test="shipping-info-value">Free Pony Express Delivery!</div>' +
+            '<div class="summary_info_label" data-test="total-info-label">Price Total</div>' +
+            '<div class="summary_subtotal_label" data-test="subtotal-label">Item total: ' + money(subtotal) + '</div>' +
+            '<div class="summary_tax_label" data-test="tax-label">Tax: ' + money(tax) + '</div>' +
+            '<div class="summary_info_label summary_total_label" data-test="total-label">Total: ' + money(subtotal + tax) + '</div>' +
+            '<div class="cart_footer">' +
+            '<button class="btn btn_secondary back btn_medium cart_cancel_link" id="cancel" data-test="cancel">Cancel</button>' +
+            '<button class="btn btn_action btn_medium cart_button" id="finish" data-test="finish">Finish</button>' +
+            '</div></div></div></div>' + footer();
+        bindHeader();
+        document.getElementById("cancel").addEventListener("click", function () {
+            navigate("/inventory.html");
+        });
+        document.getElementById("finish").addEventListener("click", function () {
+            setCart([]);
+            navigate("/checkout-complete.html");
+        });
+    }
+
+    function checkoutCompletePage() {
+        root.innerHTML = header("Checkout: Complete!") +
+            '<div id="checkout_complete_container" class="checkout_complete_container">' +
+            '<img alt="Pony Express" class="pony_express" src="/static/media/pony-express.svg">' +
+            '<h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>' +
+            '<div class="complete-text" data-test="complete-text">Your order has been dispatched, ' +
+            'and will arrive just as fast as the pony can get there!</div>' +
+            '<button class="btn btn_primary btn_small" id="back-to-products" data-test="back-to-products">Back Home</button>' +
+            '</div>' + footer();
+        bindHeader();
+        document.getElementById("back-to-products").addEventListener("click", function () {
+            navigate("/inventory.html");
+        });
+    }
+
+    var ROUTES = {
+        "/": loginPage,
+        "/index.html": loginPage,
+        "/inventory.html": inventoryPage,
+        "/inventory-item.html": inventoryItemPage,
+        "/cart.html": cartPage,
+        "/checkout-step-one.html": checkoutStepOnePage,
+        "/checkout-step-two.html": checkoutStepTwoPage,
+        "/checkout-complete.html": checkoutCompletePage
+    };
+
+    function render() {
+        var path = window.location.pathname;
+        if (PROTECTED_PAGES.indexOf(path) !== -1 && !getSessionUser()) {
+            // Like the real app: back to the login form with an explanation
+            flashError = "Epic sadface: You can only access '" + path + "' when you are logged in.";
+            window.history.replaceState(null, "", "/");
+            path = "/";
+        }
+        (ROUTES[path] || loginPage)();
+    }
+
+    render();
+}());
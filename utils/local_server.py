@@ -0,0 +1,131 @@
+"""Local HTTP server hosting a stand-in copy of the SauceDemo app
+
+Usage:
+    python -m utils.local_server [--port 8000]
+"""
+import argparse
+import logging
+import os
+import socket
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_app")
+
+# Client-side routes; each one is served the app shell
+APP_ROUTES = {
+    "/",
+    "/index.html",
+    "/inventory.html",
+    "/inventory-item.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+}
+
+
+class LocalAppRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the app shell for known routes and static assets for everything else"""
+
+    def do_GET(self):
+        if urlsplit(self.path).path in APP_ROUTES:
+            self.path = "/index.html"
+        elif not self.path.startswith("/static/"):
+            self.send_error(404)
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        # Let the browser cache assets like it does for the hosted app
+        if self.path.startswith("/static/"):
+            self.send_header("Cache-Control", "public, max-age=3600")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class LocalAppServer:
+    """Threaded local server for the stand-in app"""
+
+    def __init__(self, host: str = None, port: int = None):
+        self.host = host or Config.LOCAL_SERVER_HOST
+        self.port = Config.LOCAL_SERVER_PORT if port is None else port
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """Start serving in a background thread and publish the bound port"""
+        handler = partial(LocalAppRequestHandler, directory=APP_DIR)
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-app-server", daemon=True)
+        self._thread.start()
+
+        # Page objects, and any child processes, read the port from here
+        Config.LOCAL_SERVER_PORT = self.port
+        os.environ["LOCAL_SERVER_PORT"] = str(self.port)
+
+        logger.info(f"Local SauceDemo server running at {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server and wait for its thread"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            logger.info("Local SauceDemo server stopped")
+
+    @staticmethod
+    def is_running(host: str, port: int) -> bool:
+        """Check whether something already accepts connections on the port"""
+        if not port:
+            return False
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            return False
+
+    @classmethod
+    def ensure_running(cls):
+        """Start a server unless one is already listening on the configured port.
+
+        Returns the started server, or None when an existing one is reused.
+        """
+        if cls.is_running(Config.LOCAL_SERVER_HOST, Config.LOCAL_SERVER_PORT):
+            logger.info(f"Reusing local SauceDemo server on port {Config.LOCAL_SERVER_PORT}")
+            return None
+        return cls().start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local SauceDemo stand-in")
+    parser.add_argument("--host", default=Config.LOCAL_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.LOCAL_SERVER_PORT or 8000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = LocalAppServer(args.host, args.port).start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
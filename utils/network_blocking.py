@@ -0,0 +1,110 @@
+"""Request blocking profiles applied through the Chrome DevTools Network domain"""
+import json
+import logging
+import os
+from collections import Counter
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class NetworkBlocker:
+    """Applies a blocking profile to a Chrome session and counts what it kept from loading"""
+
+    def __init__(self, sizes_file: str = None):
+        self.sizes_file = sizes_file or Config.NETWORK_SIZES_FILE
+        self.blocked_requests = Counter()
+        self.bytes_saved = Counter()
+        self._sizes = None
+        self._requests = {}
+        self._warned = set()
+
+    def profile_for(self, tags, default: str = None) -> str:
+        """Profile named by a @network_<profile> tag, else the run's default"""
+        for tag in tags:
+            if tag.startswith(Config.NETWORK_PROFILE_TAG_PREFIX):
+                return self.known_profile(tag[len(Config.NETWORK_PROFILE_TAG_PREFIX):])
+        return self.known_profile(default or Config.NETWORK_PROFILE)
+
+    def known_profile(self, profile: str) -> str:
+        """The profile itself, or "none" with a warning when it is not defined"""
+        if profile in Config.NETWORK_BLOCKING_PROFILES:
+            return profile
+        if profile not in self._warned:
+            self._warned.add(profile)
+            logger.warning(f"Unknown network profile '{profile}', expected one of "
+                           f"{', '.join(Config.NETWORK_BLOCKING_PROFILES)}; blocking nothing")
+        return "none"
+
+    @staticmethod
+    def supports(driver) -> bool:
+        return hasattr(driver, "execute_cdp_cmd")
+
+    def apply(self, driver, profile: str) -> bool:
+        """Block the profile's URL patterns on this session; profile "none" lifts any earlier block"""
+        profile = self.known_profile(profile)
+        if not self.supports(driver):
+            if profile != "none":
+                logger.debug(f"Network profile '{profile}' needs Chrome DevTools, not applied")
+            return False
+
+        patterns = Config.NETWORK_BLOCKING_PROFILES[profile]
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+
+    def collect(self, driver, profile: str):
+        """Read the session's performance log and count the requests the profile blocked"""
+        if not self.supports(driver):
+            return
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            # Sessions started without performance logging have nothing to read
+            logger.debug(f"No performance log to read: {e}")
+            return
+
+        sizes = self._known_sizes()
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self._requests[params["requestId"]] = (params["request"]["url"], params.get("type", "Other"))
+            elif method == "Network.loadingFinished":
+                url, _ = self._requests.pop(params["requestId"], (None, None))
+                if url and params.get("encodedDataLength"):
+                    sizes[url] = int(params["encodedDataLength"])
+            elif method == "Network.loadingFailed":
+                url, resource_type = self._requests.pop(params["requestId"], (None, params.get("type", "Other")))
+                if params.get("blockedReason") and url:
+                    self.blocked_requests[profile] += 1
+                    self.bytes_saved[profile] += sizes.get(
+                        url, Config.NETWORK_DEFAULT_RESOURCE_BYTES.get(resource_type, 0))
+
+    def _known_sizes(self):
+        """Transfer sizes of URLs seen loading, kept across runs to estimate what a block saves"""
+        if self._sizes is None:
+            try:
+                with open(self.sizes_file) as sizes_file:
+                    self._sizes = json.load(sizes_file)
+            except (OSError, ValueError):
+                self._sizes = {}
+        return self._sizes
+
+    def save_sizes(self):
+        if not self._sizes:
+            return
+        os.makedirs(os.path.dirname(self.sizes_file) or ".", exist_ok=True)
+        temp_path = f"{self.sizes_file}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as sizes_file:
+            json.dump(self._sizes, sizes_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.sizes_file)
+
+    def log_summary(self):
+        """Log the requests and (estimated) bytes each profile saved"""
+        for profile, count in sorted(self.blocked_requests.items()):
+            logger.info(f"Network profile '{profile}' blocked {count} requests, "
+                        f"saving about {self.bytes_saved[profile] / 1024:.1f} KiB")
+
+
+network_blocker = NetworkBlocker()
@@ -0,0 +1,202 @@
+"""Parallel behave runner that shards scenarios across a process pool
+
+Usage:
+    python -m utils.parallel_runner [features/...] [--tags=@smoke] [-D browser=firefox] [--workers N]
+                                    [--shared-browser]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from utils.config import Config
+from utils.profiler import merge_worker_profiles
+from utils.results_store import ResultsStore
+from utils.scenario_collection import collect_scenarios
+from utils.scheduler import plan_shards
+from utils.test_data import TestDataPool, resolve_seed
+
+logger = logging.getLogger(__name__)
+
+ALLURE_FORMATTER = "allure_behave.formatter:AllureFormatter"
+WORKER_RESULTS_DIR = os.path.join("reports", ".parallel")
+
+
+def available_memory_bytes():
+    """Return the memory available for new processes, or None if unknown"""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_worker_count(shared_browser: bool = False) -> int:
+    """Size the pool by CPU count and by how many browsers fit in free RAM"""
+    if Config.PARALLEL_WORKERS > 0:
+        return Config.PARALLEL_WORKERS
+
+    workers = os.cpu_count() or 1
+    memory = available_memory_bytes()
+    if memory is not None:
+        # Each worker runs its current browser plus any warm spares; in a shared browser
+        # each of those is a browser context on top of the one shared process
+        browsers_per_worker = 1 + Config.WARM_SPARES
+        if shared_browser:
+            memory -= Config.BROWSER_MEMORY_MB * 1024 * 1024
+            per_browser_mb = Config.BROWSER_CONTEXT_MEMORY_MB
+        else:
+            per_browser_mb = Config.BROWSER_MEMORY_MB
+        workers = min(workers, memory // (per_browser_mb * browsers_per_worker * 1024 * 1024))
+    return max(1, workers)
+
+
+def run_shard(worker_index: int, locations: List[str], behave_args: List[str], results_dir: str) -> int:
+    """Run one shard of scenarios with behave inside a pool worker process"""
+    from behave.__main__ import run_behave
+    from behave.configuration import Configuration
+    from behave.formatter.base import StreamOpener
+
+    os.environ["PARALLEL_WORKER_INDEX"] = str(worker_index)
+    config = Configuration(behave_args + locations)
+
+    # Point this worker's Allure formatter at its own results directory
+    for index, format_name in enumerate(config.format or []):
+        if format_name == ALLURE_FORMATTER and index < len(config.outputs):
+            config.outputs[index] = StreamOpener(results_dir)
+
+    return run_behave(config)
+
+
+def merge_allure_results(worker_dirs: List[str], target_dir: str = None) -> int:
+    """Move every worker's Allure files into the shared results directory"""
+    target_dir = target_dir or Config.ALLURE_RESULTS_DIR
+    os.makedirs(target_dir, exist_ok=True)
+
+    merged = 0
+    for worker_dir in worker_dirs:
+        if not os.path.isdir(worker_dir):
+            continue
+        for name in os.listdir(worker_dir):
+            shutil.move(os.path.join(worker_dir, name), os.path.join(target_dir, name))
+            merged += 1
+        shutil.rmtree(worker_dir, ignore_errors=True)
+    return merged
+
+
+def merge_rerun_files(worker_count: int, rerun_file: str = None) -> int:
+    """Combine the workers' rerun files into one, in the `behave @file` format"""
+    rerun_file = rerun_file or Config.RERUN_FILE
+    root, extension = os.path.splitext(rerun_file)
+    locations = []
+    for index in range(worker_count):
+        worker_file = f"{root}-worker-{index}{extension}"
+        if os.path.isfile(worker_file):
+            with open(worker_file) as rerun_input:
+                locations.extend(line.strip() for line in rerun_input if line.strip())
+            os.remove(worker_file)
+    with open(rerun_file, "w") as rerun_output:
+        rerun_output.writelines(f"{location}\n" for location in locations)
+    return len(locations)
+
+
+def run_parallel(paths: List[str], tags: List[str], defines: List[str], workers: int = None,
+                 results_dir: str = None, shared_browser: bool = None) -> int:
+    """Collect, shard and run scenarios in parallel, then merge the Allure output"""
+    scenarios = collect_scenarios(paths, tags)
+    if not scenarios:
+        logger.warning("No scenarios matched the given paths and tags")
+        return 0
+
+    shared_browser = Config.SHARED_BROWSER if shared_browser is None else shared_browser
+    if shared_browser and any(define.lower() == "browser=firefox" for define in defines):
+        logger.warning("A shared browser needs Chrome DevTools, running a browser per worker instead")
+        shared_browser = False
+
+    # Balance shards by historical duration, with last run's failures first
+    workers = min(workers or default_worker_count(shared_browser), len(scenarios))
+    plans = plan_shards(scenarios, workers)
+    shards = [plan["locations"] for plan in plans]
+
+    # Every worker draws from the same seeded test data pool; building it here means workers only load it
+    pool = TestDataPool(resolve_seed()).build()
+    logger.info(f"Test data seed: {pool.seed}")
+
+    behave_args = [f"--tags={tag}" for tag in tags]
+    for define in defines:
+        behave_args.extend(["-D", define])
+
+    worker_dirs = [os.path.join(WORKER_RESULTS_DIR, f"worker-{index}") for index in range(len(shards))]
+    logger.info(f"Running {len(scenarios)} scenarios on {len(shards)} workers, predicted "
+                f"{max(plan['seconds'] for plan in plans):.0f}s")
+
+    # Workers inherit the shared browser's address through the environment
+    browser = None
+    if shared_browser:
+        # Imported here so collecting and scheduling never load Selenium in the parent
+        from utils.shared_browser import SharedBrowser
+        browser = SharedBrowser().start()
+    try:
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(run_shard, index, shard, behave_args, worker_dirs[index])
+                for index, shard in enumerate(shards)
+            ]
+            return_codes = [future.result() for future in futures]
+    finally:
+        if browser:
+            browser.stop(workers=len(shards))
+
+    results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+    merged = merge_allure_results(worker_dirs, results_dir)
+    logger.info(f"Merged {merged} Allure files into {results_dir}")
+
+    if Config.RESULTS_STORE_ENABLED and results_dir == Config.ALLURE_RESULTS_DIR:
+        store = ResultsStore()
+        try:
+            store.ingest(results_dir)
+        finally:
+            store.close()
+
+    merge_rerun_files(len(shards))
+    profile_table = merge_worker_profiles()
+    if profile_table:
+        logger.info(f"Merged the workers' profiles into {profile_table}")
+
+    failed = [index for index, code in enumerate(return_codes) if code != 0]
+    if failed:
+        logger.error(f"Workers with failures: {failed}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run behave scenarios in parallel")
+    parser.add_argument("paths", nargs="*", default=["features"], help="Feature files or directories")
+    parser.add_argument("-t", "--tags", action="append", default=[], help="Tag expression, as for behave")
+    parser.add_argument("-D", "--define", action="append", default=[], help="Userdata, as for behave")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--results-dir", default=None, help="Where to merge Allure results")
+    parser.add_argument("--shared-browser", action="store_true", default=None,
+                        help="Run every worker in its own browser context of one shared Chrome")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    return run_parallel(args.paths, args.tags, args.define, args.workers, args.results_dir,
+                        args.shared_browser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""Sampling profiler for scenarios and steps, with collapsed stacks and flamegraph SVGs
+
+Enabled with `behave -D profile=1`. A background thread samples the main thread's stack,
+so the profile shows where wall time goes, including time blocked on WebDriver round trips.
+"""
+import glob
+import html
+import json
+import logging
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+HOOKS_FRAME = "(hooks)"
+RUNNER_FRAME = "(behave)"
+
+# Frames of the WebDriver client and its HTTP transport: time under them is spent waiting on the browser
+WEBDRIVER_PREFIXES = ("selenium/", "urllib3/", "http/client.py", "socket.py", "ssl.py", "selectors.py")
+# Frames of the test runner itself, trimmed from the root of every stack
+RUNNER_PREFIXES = ("behave/", "behave:", "runpy.py", "parse.py", "parse_type/")
+
+# Per-worker function totals, merged into the run-wide table by the parallel runner and coordinator
+WORKER_FUNCTIONS_PATTERN = "functions-worker-*.json"
+TOP_TABLE_FILE = "top_functions.txt"
+
+FRAME_HEIGHT = 16
+FLAMEGRAPH_WIDTH = 1200
+CHAR_WIDTH = 7
+
+
+class StepProfiler:
+    """Samples the main thread while a scenario runs and attributes the samples to its steps"""
+
+    def __init__(self, interval: float = None, profile_dir: str = None):
+        self.interval = interval or Config.PROFILE_SAMPLE_INTERVAL
+        self.profile_dir = profile_dir or Config.PROFILE_DIR
+        self.root_dir = os.path.abspath(os.getcwd()) + os.sep
+        self.stdlib_dir = os.path.abspath(sysconfig.get_paths()["stdlib"]) + os.sep
+        self.functions = defaultdict(lambda: {"webdriver": 0.0, "python": 0.0, "samples": 0})
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._stacks = None
+        self._step = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._target_id = None
+
+    def start(self):
+        """Start sampling the calling thread"""
+        self._target_id = threading.get_ident()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._sample, name="step-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Profiling steps every {self.interval * 1000:.0f}ms into {self.profile_dir}")
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+        self._thread = None
+
+    def start_scenario(self):
+        with self._lock:
+            self._stacks = Counter()
+            self._step = HOOKS_FRAME
+
+    def start_step(self, name: str):
+        self._step = name.replace(";", ",")
+
+    def end_step(self):
+        self._step = HOOKS_FRAME
+
+    def end_scenario(self, name: str):
+        """Stop attributing samples to the scenario and write its collapsed stacks and flamegraph"""
+        with self._lock:
+            stacks, self._stacks = self._stacks, None
+        if not stacks:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, re.sub(r"[^\w.-]+", "_", name).strip("_")[:100])
+        with open(f"{base}.collapsed", "w") as collapsed_file:
+            for stack, count in sorted(stacks.items()):
+                collapsed_file.write(f"{stack} {count}\n")
+        write_flamegraph(stacks, f"{base}.svg", f"{name} ({sum(stacks.values())} samples, "
+                                                   f"{self.interval * 1000:.0f}ms interval)")
+        return f"{base}.svg"
+
+    def _sample(self):
+        last = time.perf_counter()
+        while not self._stopping.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            with self._lock:
+                if self._stacks is None:
+                    continue
+                labels = self._stack_labels(frame)
+                self._stacks[";".join([self._step] + labels)] += 1
+                self._attribute(labels, elapsed)
+
+    def _stack_labels(self, frame):
+        """Root-first frame labels with the runner's own frames trimmed from the root"""
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        start = 0
+        while start < len(labels) and (labels[start].startswith(RUNNER_PREFIXES)
+                                       or labels[start].startswith("<frozen")):
+            start += 1
+        return labels[start:] or [RUNNER_FRAME]
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            path = os.path.abspath(code.co_filename)
+            if "site-packages" + os.sep in path:
+                path = path.split("site-packages" + os.sep, 1)[1]
+            elif path.startswith(self.root_dir):
+                path = path[len(self.root_dir):]
+            elif path.startswith(self.stdlib_dir):
+                path = path[len(self.stdlib_dir):]
+            else:
+                path = os.path.basename(path)
+            label = f"{path.replace(os.sep, '/')}:{code.co_name}".replace(";", ",").replace(" ", "_")
+            self._labels[code] = label
+        return label
+
+    def _attribute(self, labels, elapsed):
+        """Charge a sample to the innermost frame outside the WebDriver client.
+
+        It counts as WebDriver time when the sampled thread was inside the client.
+        """
+        index = len(labels) - 1
+        while index > 0 and labels[index].startswith(WEBDRIVER_PREFIXES):
+            index -= 1
+        entry = self.functions[labels[index]]
+        entry["webdriver" if labels[-1].startswith(WEBDRIVER_PREFIXES) else "python"] += elapsed
+        entry["samples"] += 1
+
+    def top_functions(self, limit: int = None):
+        return rank_functions(self.functions, limit)
+
+    def write_top_table(self, limit: int = None) -> str:
+        """Write the table of the functions that took the most time in this process.
+
+        A parallel worker writes its own table, plus its totals for the runner to merge.
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        worker = os.getenv("PARALLEL_WORKER_INDEX")
+        if worker is None:
+            return write_function_table(self.top_functions(limit), os.path.join(self.profile_dir, TOP_TABLE_FILE))
+        with open(os.path.join(self.profile_dir, f"functions-worker-{worker}.json"), "w") as functions_file:
+            json.dump(self.functions, functions_file)
+        root, extension = os.path.splitext(TOP_TABLE_FILE)
+        return write_function_table(self.top_functions(limit),
+                                    os.path.join(self.profile_dir, f"{root}-worker-{worker}{extension}"))
+
+    def log_summary(self, limit: int = 10):
+        """Log where the profiled time went, WebDriver waits apart from local Python"""
+        if not self.functions:
+            return
+        webdriver_total = sum(entry["webdriver"] for entry in self.functions.values())
+        python_total = sum(entry["python"] for entry in self.functions.values())
+        logger.info(f"Profiled {webdriver_total + python_total:.2f}s: "
+                    f"{webdriver_total:.2f}s waiting on WebDriver, {python_total:.2f}s in local Python")
+        logger.info("Top functions (total, webdriver, python):")
+        for name, entry in self.top_functions(limit):
+            logger.info(f"  {name}: {entry['webdriver'] + entry['python']:.2f}s, "
+                        f"{entry['webdriver']:.2f}s, {entry['python']:.2f}s")
+
+
+def rank_functions(functions: dict, limit: int = None):
+    limit = limit or Config.PROFILE_TOP_N
+    ranked = sorted(functions.items(), key=lambda item: item[1]["webdriver"] + item[1]["python"], reverse=True)
+    return ranked[:limit]
+
+
+def write_function_table(rows, path: str) -> str:
+    width = max([len("function")] + [len(name) for name, _ in rows])
+    with open(path, "w") as table_file:
+        table_file.write(f"{'function':<{width}}  {'total s':>8}  {'webdriver s':>11}  "
+                         f"{'python s':>8}  {'samples':>7}\n")
+        for name, entry in rows:
+            table_file.write(f"{name:<{width}}  {entry['webdriver'] + entry['python']:>8.2f}  "
+                             f"{entry['webdriver']:>11.2f}  {entry['python']:>8.2f}  "
+                             f"{entry['samples']:>7}\n")
+    return path
+
+
+def merge_worker_profiles(profile_dir: str = None, limit: int = None):
+    """Sum the workers' function totals into the run-wide table; None when no worker profiled"""
+    profile_dir = profile_dir or Config.PROFILE_DIR
+    worker_files = sorted(glob.glob(os.path.join(profile_dir, WORKER_FUNCTIONS_PATTERN)))
+    if not worker_files:
+        return None
+    functions = defaultdict(lambda: {"webdriver": 0.0, "python": 0.0, "samples": 0})
+    for worker_file in worker_files:
+        with open(worker_file) as functions_file:
+            for name, entry in json.load(functions_file).items():
+                for field, value in entry.items():
+                    functions[name][field] += value
+        os.remove(worker_file)
+    return write_function_table(rank_functions(functions, limit), os.path.join(profile_dir, TOP_TABLE_FILE))
+
+
+def write_flamegraph(stacks: Counter, path: str, title: str = ""):
+    """Render collapsed stacks as a flamegraph SVG, roots at the bottom"""
+    root = {"children": {}, "count": 0}
+    for stack, count in stacks.items():
+        root["count"] += count
+        node = root
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"children": {}, "count": 0})
+            node["count"] += count
+
+    def depth_of(node):
+        return 1 + max((depth_of(child) for child in node["children"].values()), default=0)
+
+    depth = depth_of(root) - 1
+    height = (depth + 3) * FRAME_HEIGHT
+    total = root["count"] or 1
+    rects = []
+
+    def render(node, name, x, level):
+        width = node["count"] / total * FLAMEGRAPH_WIDTH
+        if width < 0.5:
+            return
+        y = height - (level + 1) * FRAME_HEIGHT
+        share = node["count"] / total * 100
+        text = name if len(name) * CHAR_WIDTH < width - 4 else name[:max(0, int((width - 4) // CHAR_WIDTH) - 2)] + ".."
+        rects.append(
+            f'<g><title>{html.escape(name)} ({node["count"]} samples, {share:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FRAME_HEIGHT - 1}" '
+            f'fill="{frame_color(name)}" rx="2"/>'
+            + (f'<text x="{x + 3:.1f}" y="{y + FRAME_HEIGHT - 4}">{html.escape(text)}</text>'
+               if len(text) > 2 else "")
+            + '</g>'
+        )
+        child_x = x
+        for child_name, child in sorted(node["children"].items()):
+            render(child, child_name, child_x, level + 1)
+            child_x += child["count"] / total * FLAMEGRAPH_WIDTH
+
+    x = 0.0
+    for name, child in sorted(root["children"].items()):
+        render(child, name, x, 0)
+        x += child["count"] / total * FLAMEGRAPH_WIDTH
+
+    with open(path, "w") as svg_file:
+        svg_file.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{FLAMEGRAPH_WIDTH}" height="{height}" '
+            f'font-family="monospace" font-size="11">\n'
+            f'<text x="{FLAMEGRAPH_WIDTH / 2}" y="{FRAME_HEIGHT}" text-anchor="middle" font-size="13">'
+            f'{html.escape(title)}</text>\n'
+            + "\n".join(rects)
+            + "\n</svg>\n"
+        )
+    return path
+
+
+def frame_color(name: str) -> str:
+    """Blue for WebDriver client frames, warm colours for everything else, stable per name"""
+    shade = zlib.crc32(name.encode()) % 60
+    if name.startswith(WEBDRIVER_PREFIXES):
+        return f"rgb({80 + shade},{140 + shade},230)"
+    return f"rgb(230,{100 + shade * 2},{40 + shade})"
+
+
+step_profiler = StepProfiler()
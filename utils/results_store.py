@@ -0,0 +1,308 @@
+"""Indexed store for Allure results with content-addressed attachments and packed archives
+
+Usage:
+    python -m utils.results_store ingest [--results-dir reports/allure-results]
+    python -m utils.results_store list
+    python -m utils.results_store export [--run ID ...] [--out reports/allure-export]
+    python -m utils.results_store pack [--keep 5]
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tarfile
+import zlib
+from datetime import datetime
+from typing import List
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+RESULT_SUFFIXES = {"-result.json": "result", "-container.json": "container"}
+ATTACHMENT_MARKER = "-attachment"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL,
+    stopped REAL,
+    ingested_at TEXT,
+    archive TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    uuid TEXT PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    kind TEXT,
+    name TEXT,
+    full_name TEXT,
+    status TEXT,
+    start REAL,
+    duration_ms REAL,
+    body BLOB
+);
+CREATE INDEX IF NOT EXISTS results_by_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS results_by_name ON results(full_name, status);
+CREATE TABLE IF NOT EXISTS attachments (
+    sha TEXT PRIMARY KEY,
+    extension TEXT,
+    size INTEGER
+);
+"""
+
+
+def walk_attachments(node):
+    """Yield every attachment entry of a result, including those of nested steps"""
+    if isinstance(node, dict):
+        yield from node.get("attachments", [])
+        for step in node.get("steps", []):
+            yield from walk_attachments(step)
+        for fixture in node.get("befores", []) + node.get("afters", []):
+            yield from walk_attachments(fixture)
+
+
+class ResultsStore:
+    """sqlite index of runs and results, with attachments stored once per content hash"""
+
+    def __init__(self, store_dir: str = None):
+        self.store_dir = store_dir or Config.RESULTS_STORE_DIR
+        self.blob_dir = os.path.join(self.store_dir, "blobs")
+        self.archive_dir = os.path.join(self.store_dir, "archive")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.store_dir, "index.sqlite"), timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # Ingest
+    def ingest(self, results_dir: str = None) -> int:
+        """Index results not seen before as one run, then pack runs beyond RESULTS_KEEP_UNPACKED_RUNS.
+
+        Callers ingest once per run: after_all for a serial run, the runner or coordinator after merging.
+        """
+        results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+        if not os.path.isdir(results_dir):
+            return 0
+
+        # Files are keyed by the id in their name, which is not the uuid inside the result
+        known = {row[0] for row in self.db.execute("SELECT uuid FROM results")}
+        entries = []
+        for file_name in os.listdir(results_dir):
+            suffix = next((suffix for suffix in RESULT_SUFFIXES if file_name.endswith(suffix)), None)
+            if suffix is None or file_name[:-len(suffix)] in known:
+                continue
+            with open(os.path.join(results_dir, file_name)) as result_file:
+                entries.append((file_name[:-len(suffix)], RESULT_SUFFIXES[suffix], json.load(result_file)))
+        if not entries:
+            return 0
+
+        starts = [body["start"] / 1000 for _, _, body in entries if body.get("start")]
+        started = min(starts) if starts else datetime.now().timestamp()
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (started, stopped, ingested_at) VALUES (?, ?, ?)",
+                (started, started, datetime.now().isoformat())
+            ).lastrowid
+            for file_id, kind, body in entries:
+                # Entries without a start time (e.g. containers) count from the run's start
+                start = body["start"] / 1000 if body.get("start") else started
+                self._store_attachments(body, results_dir)
+                stop = (body.get("stop") or 0) / 1000
+                self.db.execute("UPDATE runs SET stopped = MAX(stopped, ?) WHERE id = ?", (stop, run_id))
+                self.db.execute(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (file_id, run_id, kind, body.get("name"), body.get("fullName"), body.get("status"),
+                     start, (stop - start) * 1000 if stop else None,
+                     zlib.compress(json.dumps(body).encode()))
+                )
+        logger.info(f"Indexed {len(entries)} Allure results from {results_dir} as run {run_id}")
+
+        # Older runs live on in the archive, so the formatter output keeps only the newest ones
+        self.pack(results_dir=results_dir)
+        return len(entries)
+
+    def _store_attachments(self, body, results_dir):
+        """Move attachment content into blobs and point the result at its hash"""
+        for attachment in walk_attachments(body):
+            source = attachment.get("source", "")
+            path = os.path.join(results_dir, source)
+            if ATTACHMENT_MARKER not in source or not os.path.isfile(path):
+                continue
+            with open(path, "rb") as attachment_file:
+                content = attachment_file.read()
+            sha = hashlib.sha256(content).hexdigest()
+            extension = source.split(ATTACHMENT_MARKER, 1)[1]
+            blob_path = self._blob_path(sha)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                with open(blob_path, "wb") as blob_file:
+                    blob_file.write(content)
+            self.db.execute("INSERT OR IGNORE INTO attachments VALUES (?, ?, ?)", (sha, extension, len(content)))
+            attachment["source"] = f"{sha}{ATTACHMENT_MARKER}{extension}"
+
+    def _blob_path(self, sha):
+        return os.path.join(self.blob_dir, sha[:2], sha)
+
+    # Queries
+    def list_runs(self):
+        """Per-run counts by status and total duration"""
+        return self.db.execute("""
+            SELECT runs.id, runs.started, runs.stopped, runs.archive, COUNT(results.uuid),
+                   SUM(results.status = 'passed'), SUM(results.status = 'failed'),
+                   SUM(results.status = 'broken'), SUM(results.status = 'skipped')
+            FROM runs LEFT JOIN results ON results.run_id = runs.id AND results.kind = 'result'
+            GROUP BY runs.id ORDER BY runs.id
+        """).fetchall()
+
+    def scenario_history(self, full_name: str):
+        """(run id, status, duration in ms) of a scenario, oldest first"""
+        return self.db.execute(
+            "SELECT run_id, status, duration_ms FROM results WHERE full_name = ? AND kind = 'result' ORDER BY start",
+            (full_name,)
+        ).fetchall()
+
+    def result_history(self):
+        """(file id, full name, name, status, start, duration in ms) of every result, oldest first"""
+        return self.db.execute(
+            "SELECT uuid, full_name, name, status, start, duration_ms FROM results "
+            "WHERE kind = 'result' ORDER BY start"
+        ).fetchall()
+
+    def latest_run_ids(self, count: int) -> List[int]:
+        rows = self.db.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (count,)).fetchall()
+        return sorted(row[0] for row in rows)
+
+    # Export
+    def export(self, run_ids: List[int], out_dir: str = None) -> int:
+        """Write runs back out in the layout Allure tooling reads"""
+        out_dir = out_dir or Config.RESULTS_EXPORT_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        written = 0
+        for run_id in run_ids:
+            archive = self.db.execute("SELECT archive FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if archive is None:
+                raise ValueError(f"No run with id {run_id}")
+            if archive[0]:
+                with tarfile.open(archive[0], "r:xz") as tar:
+                    members = tar.getmembers()
+                    tar.extractall(out_dir, members=members)
+                written += len(members)
+                continue
+            for name, content in self._run_files(run_id):
+                with open(os.path.join(out_dir, name), "wb") as out_file:
+                    out_file.write(content)
+                written += 1
+        logger.info(f"Exported {written} files for runs {run_ids} to {out_dir}")
+        return written
+
+    def _run_files(self, run_id):
+        """(file name, bytes) of every result and attachment of an unpacked run"""
+        shas = {}
+        for uuid, kind, body in self.db.execute(
+                "SELECT uuid, kind, body FROM results WHERE run_id = ?", (run_id,)):
+            result = json.loads(zlib.decompress(body))
+            for attachment in walk_attachments(result):
+                sha, _, extension = attachment.get("source", "").partition(ATTACHMENT_MARKER)
+                shas[sha] = attachment["source"]
+            yield f"{uuid}-{kind}.json", json.dumps(result).encode()
+        for sha, source in shas.items():
+            blob_path = self._blob_path(sha)
+            if os.path.isfile(blob_path):
+                with open(blob_path, "rb") as blob_file:
+                    yield source, blob_file.read()
+
+    # Packing
+    def pack(self, keep: int = None, results_dir: str = None) -> List[int]:
+        """Move all but the newest `keep` runs into tar.xz archives and drop their loose copies"""
+        keep = Config.RESULTS_KEEP_UNPACKED_RUNS if keep is None else keep
+        results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+        recent = set(self.latest_run_ids(keep))
+        run_ids = [row[0] for row in self.db.execute("SELECT id FROM runs WHERE archive IS NULL ORDER BY id")
+                   if row[0] not in recent]
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        for run_id in run_ids:
+            archive_path = os.path.join(self.archive_dir, f"run-{run_id}.tar.xz")
+            with tarfile.open(archive_path, "w:xz") as tar:
+                for name, content in self._run_files(run_id):
+                    info = tarfile.TarInfo(name)
+                    info.size = len(content)
+                    tar.addfile(info, io.BytesIO(content))
+            self._remove_loose_files(run_id, results_dir)
+            with self.db:
+                self.db.execute("UPDATE results SET body = NULL WHERE run_id = ?", (run_id,))
+                self.db.execute("UPDATE runs SET archive = ? WHERE id = ?", (archive_path, run_id))
+            logger.info(f"Packed run {run_id} into {archive_path}")
+
+        if run_ids:
+            self._remove_unreferenced_blobs()
+            self.db.execute("VACUUM")
+        return run_ids
+
+    def _remove_loose_files(self, run_id, results_dir):
+        """Delete a packed run's files from the formatter output directory"""
+        for uuid, kind in self.db.execute("SELECT uuid, kind FROM results WHERE run_id = ?", (run_id,)).fetchall():
+            path = os.path.join(results_dir, f"{uuid}-{kind}.json")
+            if not os.path.isfile(path):
+                continue
+            # The loose JSON still names the formatter's own attachment files
+            with open(path) as result_file:
+                sources = [attachment.get("source") for attachment in walk_attachments(json.load(result_file))]
+            for name in sources + [os.path.basename(path)]:
+                if name and os.path.isfile(os.path.join(results_dir, name)):
+                    os.remove(os.path.join(results_dir, name))
+
+    def _remove_unreferenced_blobs(self):
+        referenced = set()
+        for (body,) in self.db.execute("SELECT body FROM results WHERE body IS NOT NULL"):
+            for attachment in walk_attachments(json.loads(zlib.decompress(body))):
+                referenced.add(attachment.get("source", "").partition(ATTACHMENT_MARKER)[0])
+        with self.db:
+            for (sha,) in self.db.execute("SELECT sha FROM attachments").fetchall():
+                if sha not in referenced:
+                    if os.path.isfile(self._blob_path(sha)):
+                        os.remove(self._blob_path(sha))
+                    self.db.execute("DELETE FROM attachments WHERE sha = ?", (sha,))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Indexed storage for Allure results")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Index new results from the Allure output directory")
+    ingest.add_argument("--results-dir", default=Config.ALLURE_RESULTS_DIR)
+    commands.add_parser("list", help="Show stored runs")
+    export = commands.add_parser("export", help="Write runs out in Allure's results format")
+    export.add_argument("--run", type=int, action="append", help="Run id (default: latest run)")
+    export.add_argument("--out", default=Config.RESULTS_EXPORT_DIR)
+    pack = commands.add_parser("pack", help="Archive all but the newest runs")
+    pack.add_argument("--keep", type=int, default=Config.RESULTS_KEEP_UNPACKED_RUNS)
+    pack.add_argument("--results-dir", default=Config.ALLURE_RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    store = ResultsStore()
+    try:
+        if args.command == "ingest":
+            store.ingest(args.results_dir)
+        elif args.command == "list":
+            print(f"{'run':>4}  {'started':19}  {'secs':>7}  {'total':>5}  {'pass':>4}  {'fail':>4}  "
+                  f"{'broken':>6}  {'skip':>4}  archive")
+            for run_id, started, stopped, archive, total, passed, failed, broken, skipped in store.list_runs():
+                started_text = datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"{run_id:>4}  {started_text}  {stopped - started:>7.1f}  {total:>5}  {passed or 0:>4}  "
+                      f"{failed or 0:>4}  {broken or 0:>6}  {skipped or 0:>4}  {archive or ''}")
+        elif args.command == "export":
+            store.export(args.run or store.latest_run_ids(1), args.out)
+        elif args.command == "pack":
+            store.pack(args.keep, args.results_dir)
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
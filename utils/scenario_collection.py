@@ -0,0 +1,157 @@
+"""Scenario collection and step binding checks from Gherkin feature files
+
+Only behave's parser and step matchers are imported; step modules are read with
+``ast`` rather than imported, so nothing from the browser stack is loaded.
+
+Usage:
+    python -m utils.scenario_collection [features/...] [--tags=@smoke] [--list]
+"""
+import argparse
+import ast
+import glob
+import logging
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+from behave.matchers import ParseMatcher
+from behave.parser import parse_file
+from behave.tag_expression import TagExpression
+
+logger = logging.getLogger(__name__)
+
+FEATURES_DIR = "features"
+STEPS_DIR = os.path.join(FEATURES_DIR, "steps")
+STEP_DECORATORS = {"given", "when", "then", "step"}
+LOCATION_PATTERN = re.compile(r"^(.+\.feature):(\d+)$")
+
+
+def find_feature_files(paths: List[str] = None) -> List[str]:
+    """Expand feature directories into a sorted list of .feature files"""
+    feature_files = []
+    for path in paths or [FEATURES_DIR]:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                feature_files.extend(
+                    os.path.join(root, name) for name in files if name.endswith(".feature")
+                )
+        else:
+            feature_files.append(path)
+    return sorted(os.path.normpath(path) for path in feature_files)
+
+
+def collect_scenarios(paths: List[str] = None, tags: List[str] = None) -> list:
+    """Parse feature files and return runnable scenarios matching the tag expressions.
+
+    Scenario Outlines are expanded so that every Examples row is returned as
+    its own scenario, addressable through its ``file:line`` location. Paths
+    may be such locations, which select just that scenario.
+    """
+    tag_expression = TagExpression(tags or [])
+    whole_paths, selected_lines = [], {}
+    for path in paths or [FEATURES_DIR]:
+        match = LOCATION_PATTERN.match(path)
+        if match:
+            selected_lines.setdefault(os.path.normpath(match.group(1)), set()).add(int(match.group(2)))
+        else:
+            whole_paths.append(path)
+
+    whole_files = set(find_feature_files(whole_paths)) if whole_paths else set()
+    scenarios = []
+    for feature_file in sorted(whole_files | set(selected_lines)):
+        feature = parse_file(feature_file)
+        if feature is None:
+            continue
+        lines = None if feature_file in whole_files else selected_lines[feature_file]
+        for scenario in feature.walk_scenarios():
+            if lines is not None and scenario.location.line not in lines:
+                continue
+            if tag_expression.check(scenario.effective_tags):
+                scenarios.append(scenario)
+    return scenarios
+
+
+def step_decorators(node):
+    """(step type, pattern, line) of each behave step decorator on a function definition"""
+    for decorator in getattr(node, "decorator_list", []):
+        if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name)
+                and decorator.func.id in STEP_DECORATORS and decorator.args
+                and isinstance(decorator.args[0], ast.Constant)):
+            yield decorator.func.id, decorator.args[0].value, decorator.lineno
+
+
+def collect_step_definitions(steps_dir: str = None) -> List[Dict]:
+    """Step definitions of the step modules, in the order behave registers them"""
+    definitions = []
+    for path in sorted(glob.glob(os.path.join(steps_dir or STEPS_DIR, "*.py"))):
+        with open(path) as source_file:
+            tree = ast.parse(source_file.read(), filename=path)
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for step_type, pattern, line in step_decorators(node):
+                    definitions.append({
+                        "step_type": step_type,
+                        "pattern": pattern,
+                        "matcher": ParseMatcher(None, pattern),
+                        "location": f"{path}:{line}",
+                    })
+    return definitions
+
+
+def check_step_bindings(scenarios: list, definitions: List[Dict]) -> Dict[str, List[Dict]]:
+    """Find steps with no matching definition, or with more than one.
+
+    Background steps are checked once per feature. For ambiguous steps behave
+    uses the first definition, as listed.
+    """
+    report = {"undefined": [], "ambiguous": []}
+    seen = set()
+    for scenario in scenarios:
+        for step in list(scenario.background_steps or []) + list(scenario.steps):
+            key = (step.filename, step.line, step.name)
+            if key in seen:
+                continue
+            seen.add(key)
+            matches = [definition for definition in definitions
+                       if definition["step_type"] in (step.step_type, "step")
+                       and definition["matcher"].check_match(step.name) is not None]
+            entry = {"location": f"{step.filename}:{step.line}", "step": f"{step.keyword} {step.name}",
+                     "definitions": [definition["location"] for definition in matches]}
+            if not matches:
+                report["undefined"].append(entry)
+            elif len(matches) > 1:
+                report["ambiguous"].append(entry)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Collect scenarios and check step bindings without starting browsers")
+    parser.add_argument("paths", nargs="*", default=[FEATURES_DIR], help="Feature files, directories or file:line")
+    parser.add_argument("-t", "--tags", action="append", default=[], help="Tag expression, as for behave")
+    parser.add_argument("--list", action="store_true", help="List the selected scenarios")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    start = time.perf_counter()
+    scenarios = collect_scenarios(args.paths, args.tags)
+    report = check_step_bindings(scenarios, collect_step_definitions())
+    elapsed = time.perf_counter() - start
+
+    if args.list:
+        for scenario in scenarios:
+            print(f"{scenario.location}  {scenario.name}")
+    for entry in report["undefined"]:
+        print(f"Undefined step at {entry['location']}: {entry['step']}")
+    for entry in report["ambiguous"]:
+        print(f"Ambiguous step at {entry['location']}: {entry['step']}")
+        for location in entry["definitions"]:
+            print(f"  matches {location}")
+    print(f"{len(scenarios)} scenarios, {len(report['undefined'])} undefined and "
+          f"{len(report['ambiguous'])} ambiguous steps ({elapsed:.2f}s)")
+    return 1 if report["undefined"] or report["ambiguous"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Duration-aware scenario scheduling from historical Allure results
+
+Usage:
+    python -m utils.scheduler [features/...] [--tags=@smoke] [--workers N] [--plan]
+"""
+import argparse
+import heapq
+import json
+import logging
+import os
+import statistics
+import sys
+from collections import defaultdict
+from typing import Dict, List
+from utils.config import Config
+from utils.results_store import RESULT_SUFFIXES, ResultsStore
+from utils.scenario_collection import collect_scenarios
+
+logger = logging.getLogger(__name__)
+
+OUTLINE_ROW_MARKER = " -- @"
+FAILED_STATUSES = {"failed", "broken"}
+
+
+def history_key(full_name: str, name: str) -> str:
+    """Key of an Allure result; fullName leaves out the Examples row suffix that name keeps"""
+    base_name = name.split(OUTLINE_ROW_MARKER)[0]
+    return f"{full_name}{name[len(base_name):]}".strip()
+
+
+def scenario_key(scenario) -> str:
+    return f"{scenario.feature.name}: {scenario.name}".strip()
+
+
+class DurationHistory:
+    """Median recent duration and last outcome per scenario"""
+
+    def __init__(self, max_runs: int = None, default_seconds: float = None):
+        self.max_runs = max_runs or Config.SCHEDULER_HISTORY_RUNS
+        self.default_seconds = Config.SCHEDULER_DEFAULT_SECONDS if default_seconds is None else default_seconds
+        self.results = defaultdict(list)
+
+    def load(self, store_dir: str = None, results_dir: str = None):
+        """Read the results store, plus Allure files it has not indexed yet"""
+        store_dir = store_dir or Config.RESULTS_STORE_DIR
+        results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+        rows, known = [], set()
+        if os.path.isfile(os.path.join(store_dir, "index.sqlite")):
+            store = ResultsStore(store_dir)
+            try:
+                for file_id, full_name, name, status, start, duration_ms in store.result_history():
+                    known.add(file_id)
+                    rows.append((start, history_key(full_name or "", name or ""), status, duration_ms))
+            finally:
+                store.close()
+
+        if os.path.isdir(results_dir):
+            suffix = next(suffix for suffix, kind in RESULT_SUFFIXES.items() if kind == "result")
+            for file_name in os.listdir(results_dir):
+                if not file_name.endswith(suffix) or file_name[:-len(suffix)] in known:
+                    continue
+                with open(os.path.join(results_dir, file_name)) as result_file:
+                    result = json.load(result_file)
+                start, stop = result.get("start"), result.get("stop")
+                rows.append(((start or 0) / 1000, history_key(result.get("fullName", ""), result.get("name", "")),
+                             result.get("status"), stop - start if start and stop else None))
+
+        for start, key, status, duration_ms in sorted(rows, key=lambda row: row[0] or 0):
+            # Skipped results say nothing about how long a scenario takes
+            if status != "skipped" and duration_ms is not None:
+                self.results[key].append((status, duration_ms / 1000))
+        return self
+
+    def estimate(self, key: str) -> float:
+        recent = self.results.get(key, [])[-self.max_runs:]
+        if not recent:
+            return self.default_seconds
+        return statistics.median(duration for _, duration in recent)
+
+    def has_history(self, key: str) -> bool:
+        return key in self.results
+
+    def failed_last_time(self, key: str) -> bool:
+        recent = self.results.get(key)
+        return bool(recent) and recent[-1][0] in FAILED_STATUSES
+
+
+def plan_shards(scenarios: list, shard_count: int, history: DurationHistory = None) -> List[Dict]:
+    """Longest-processing-time bin packing; within a shard, last run's failures go first.
+
+    Returns one dict per non-empty shard with its scenario locations and predicted seconds.
+    """
+    history = history or DurationHistory().load()
+    estimates = [(history.estimate(scenario_key(scenario)), str(scenario.location), scenario)
+                 for scenario in scenarios]
+    estimates.sort(key=lambda estimate: -estimate[0])
+
+    heap = [(0.0, index) for index in range(max(1, shard_count))]
+    shards = [[] for _ in heap]
+    for seconds, location, scenario in estimates:
+        load, index = heapq.heappop(heap)
+        shards[index].append((seconds, location, scenario))
+        heapq.heappush(heap, (load + seconds, index))
+
+    plans = []
+    for shard in shards:
+        if not shard:
+            continue
+        shard.sort(key=lambda item: not history.failed_last_time(scenario_key(item[2])))
+        plans.append({
+            "locations": [location for _, location, _ in shard],
+            "seconds": sum(seconds for seconds, _, _ in shard),
+        })
+    return plans
+
+
+def predict(scenarios: list, workers: int, history: DurationHistory = None) -> Dict:
+    """Predicted serial and parallel wall time for a selection of scenarios"""
+    history = history or DurationHistory().load()
+    plans = plan_shards(scenarios, workers, history)
+    keys = [scenario_key(scenario) for scenario in scenarios]
+    return {
+        "scenarios": len(scenarios),
+        "with_history": sum(history.has_history(key) for key in keys),
+        "failed_last_time": sum(history.failed_last_time(key) for key in keys),
+        "serial_seconds": sum(history.estimate(key) for key in keys),
+        "wall_seconds": max((plan["seconds"] for plan in plans), default=0.0),
+        "shards": plans,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Predict run time and plan shards from past durations")
+    parser.add_argument("paths", nargs="*", default=["features"], help="Feature files or directories")
+    parser.add_argument("-t", "--tags", action="append", default=[], help="Tag expression, as for behave")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of shards to plan for")
+    parser.add_argument("--plan", action="store_true", help="Also list the scenarios of each shard")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    scenarios = collect_scenarios(args.paths, args.tags)
+    prediction = predict(scenarios, args.workers)
+
+    print(f"{prediction['scenarios']} scenarios, {prediction['with_history']} with history, "
+          f"{prediction['failed_last_time']} failed last time")
+    print(f"Predicted serial time: {prediction['serial_seconds']:.1f}s")
+    print(f"Predicted wall time on {args.workers} worker(s): {prediction['wall_seconds']:.1f}s")
+    if args.plan:
+        for index, plan in enumerate(prediction["shards"]):
+            print(f"Shard {index}: {plan['seconds']:.1f}s")
+            for location in plan["locations"]:
+                print(f"  {location}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Failure screenshots written by a background worker with deduplication and retention caps"""
+import hashlib
+import io
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+import allure
+from utils.config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it images are stored as captured
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 16
+HASH_SUFFIX = re.compile(r"_([0-9a-f]{%d})\.png$" % HASH_LENGTH)
+
+
+class ScreenshotPipeline:
+    """Grabs screenshots on the caller's thread and encodes, dedupes and writes them on a worker"""
+
+    def __init__(self, directory: str = None, max_width: int = None,
+                 max_size_mb: float = None, max_age_days: float = None):
+        self.directory = directory or Config.SCREENSHOT_DIR
+        self.max_width = Config.SCREENSHOT_MAX_WIDTH if max_width is None else max_width
+        self.max_size_mb = Config.SCREENSHOT_DIR_MAX_MB if max_size_mb is None else max_size_mb
+        self.max_age_days = Config.SCREENSHOT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._queue = queue.Queue()
+        self._worker = None
+        self._seen = None
+
+    def capture(self, driver, name: str) -> bool:
+        """Take a screenshot, attach it to the Allure result and queue it for writing"""
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.error(f"Failed to take screenshot: {e}")
+            return False
+
+        # Allure attachments belong to the running scenario, so attach here rather than on the worker
+        allure.attach(png, name="Failure screenshot", attachment_type=allure.attachment_type.PNG)
+
+        self._ensure_worker()
+        self._queue.put((png, name, datetime.now()))
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                logger.error(f"Failed to save screenshot: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, png, name, taken_at):
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha256(png).hexdigest()[:HASH_LENGTH]
+        seen = self._known_hashes()
+        if digest in seen:
+            logger.info(f"Screenshot for '{name}' is identical to {seen[digest]}, not saved again")
+            return
+
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        path = os.path.join(self.directory, f"{safe_name}_{taken_at.strftime('%Y%m%d_%H%M%S')}_{digest}.png")
+        with open(path, "wb") as screenshot_file:
+            screenshot_file.write(self.compress(png, self.max_width))
+        seen[digest] = path
+        logger.info(f"Screenshot saved: {path}")
+        self.prune()
+
+    def _known_hashes(self):
+        """Hashes of screenshots already on disk, including earlier runs"""
+        if self._seen is None:
+            self._seen = {}
+            for file_name in os.listdir(self.directory):
+                match = HASH_SUFFIX.search(file_name)
+                if match:
+                    self._seen[match.group(1)] = os.path.join(self.directory, file_name)
+        return self._seen
+
+    @staticmethod
+    def compress(png: bytes, max_width: int) -> bytes:
+        """Downscale to max_width and re-encode with optimization when Pillow is available"""
+        if Image is None:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if max_width and image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)))
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue() if output.tell() < len(png) else png
+
+    def prune(self):
+        """Delete screenshots past the age cap, then the oldest ones until under the size cap"""
+        if not os.path.isdir(self.directory):
+            return
+        files = []
+        for file_name in os.listdir(self.directory):
+            path = os.path.join(self.directory, file_name)
+            if file_name.endswith(".png") and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        max_age_seconds = self.max_age_days * 24 * 3600
+        max_bytes = self.max_size_mb * 1024 * 1024
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            if time.time() - mtime <= max_age_seconds and total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            match = HASH_SUFFIX.search(path)
+            if match and self._seen:
+                self._seen.pop(match.group(1), None)
+        if removed:
+            logger.info(f"Pruned {removed} old screenshots from {self.directory}")
+
+    def close(self):
+        """Wait for queued screenshots to be written and stop the worker"""
+        if self._worker and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+        self.prune()
+
+
+screenshot_pipeline = ScreenshotPipeline()
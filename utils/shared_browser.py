@@ -0,0 +1,136 @@
+"""One Chrome process hosting an isolated DevTools browser context per WebDriver session"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from utils.browser_memory import MB, process_tree_rss
+from utils.config import Config
+from utils.driver_provisioning import DriverProvisioningError, driver_provisioner
+
+logger = logging.getLogger(__name__)
+
+# Chrome writes its DevTools port here when started with --remote-debugging-port=0
+DEVTOOLS_PORT_FILE = "DevToolsActivePort"
+
+
+class SharedBrowser:
+    """Launches the shared Chrome process and watches its memory while workers use it"""
+
+    def __init__(self):
+        self.process = None
+        self.address = None
+        self.peak_rss = 0
+        self._user_data_dir = None
+        self._stopping = threading.Event()
+        self._watcher = None
+
+    def start(self, timeout: float = 30):
+        """Start Chrome with remote debugging on a free port and export its address to workers"""
+        browser_path = driver_provisioner.resolve("chrome")["browser_path"]
+        if not browser_path:
+            raise DriverProvisioningError("A shared browser needs a Chrome binary on PATH or in CHROME_BINARY")
+
+        self._user_data_dir = tempfile.mkdtemp(prefix="shared-chrome-")
+        args = [browser_path, "--remote-debugging-port=0", f"--user-data-dir={self._user_data_dir}",
+                "--no-first-run", "--no-default-browser-check"]
+        args += Config.get_browser_options("chrome")["args"]
+        if Config.HEADLESS:
+            args.append("--headless=new")
+        self.process = subprocess.Popen(args + ["about:blank"], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+
+        port_file = os.path.join(self._user_data_dir, DEVTOOLS_PORT_FILE)
+        deadline = time.monotonic() + timeout
+        while not self.address:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Shared Chrome exited with code {self.process.returncode}")
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Shared Chrome did not open a DevTools port within {timeout}s")
+            try:
+                with open(port_file) as devtools_file:
+                    port = devtools_file.readline().strip()
+                self.address = f"127.0.0.1:{port}" if port else None
+            except OSError:
+                time.sleep(0.05)
+
+        os.environ["SHARED_BROWSER_ADDRESS"] = self.address
+        os.environ["SHARED_BROWSER_PID"] = str(self.process.pid)
+        self._stopping.clear()
+        self._watcher = threading.Thread(target=self._watch, name="shared-chrome-memory", daemon=True)
+        self._watcher.start()
+        logger.info(f"Shared Chrome listening on {self.address} (pid {self.process.pid})")
+        return self
+
+    def _watch(self):
+        while not self._stopping.wait(1.0):
+            self.peak_rss = max(self.peak_rss, process_tree_rss(self.process.pid) or 0)
+
+    def stop(self, workers: int = None):
+        """Stop Chrome and log its peak memory against separate browsers per worker"""
+        self._stopping.set()
+        if self._watcher:
+            self._watcher.join()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+        os.environ.pop("SHARED_BROWSER_ADDRESS", None)
+        os.environ.pop("SHARED_BROWSER_PID", None)
+        if self.peak_rss and workers:
+            logger.info(f"Shared Chrome peak RSS {self.peak_rss / MB:.0f} MB for {workers} workers "
+                        f"({self.peak_rss / workers / MB:.0f} MB each), vs about "
+                        f"{Config.BROWSER_MEMORY_MB * workers} MB for {workers} separate browsers")
+
+
+class ContextScopedDriver(webdriver.Chrome):
+    """A Chrome WebDriver attached to the shared browser and confined to its own browser context.
+
+    Cookies, storage and cache belong to the context, so sessions do not see each other's state.
+    Window handles are limited to the context's own tabs, so closing "extra" windows never touches
+    another session's page.
+    """
+
+    def __init__(self, address: str, driver_path: str, options: ChromeOptions = None, browser_pid: int = None):
+        options = options or ChromeOptions()
+        options.debugger_address = address
+        service = ChromeService(executable_path=driver_path)
+        super().__init__(service=service, options=options)
+        self.browser_pid = browser_pid
+
+        # The session starts on some tab of the shared browser; move it into a fresh context
+        self.context_id = self.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        target_id = self.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id})["targetId"]
+        self.switch_to.window(target_id)
+
+    @property
+    def window_handles(self):
+        """Handles of this context's pages only"""
+        targets = self.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        own = {target["targetId"] for target in targets
+               if target.get("browserContextId") == self.context_id and target["type"] == "page"}
+        return [handle for handle in super().window_handles if handle in own]
+
+    def context_count(self) -> int:
+        """Number of isolated contexts currently sharing the browser process"""
+        return max(1, len(self.execute_cdp_cmd("Target.getBrowserContexts", {})["browserContextIds"]))
+
+    def quit(self):
+        """Dispose of this context and end the session, leaving the shared browser running"""
+        try:
+            self.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        except Exception as e:
+            logger.warning(f"Failed to dispose browser context {self.context_id}: {e}")
+        super().quit()
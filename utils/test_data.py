@@ -0,0 +1,171 @@
+"""Seeded pool of checkout identities and edge-case strings, generated once and cached by seed
+
+Usage:
+    python -m utils.test_data [--seed N] [--size N] [--show N]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generation below changes, so cached pools are rebuilt
+POOL_VERSION = 2
+
+# Strings that stress the form fields, served only through edge_case(); "blank" values are
+# rejected by the app. All stay in the Basic Multilingual Plane, which ChromeDriver can type.
+EDGE_CASE_STRINGS = {
+    "unicode": ["Zoë", "José", "Łukasz", "Ærøskøbing", "山田", "محمد", "e\u0301lodie"],
+    "punctuation": ["O'Brien", "Anne-Marie", "St. John", "van der Berg"],
+    "long": ["A" * 256, "Ω" * 128, "Bartholomew-" * 20],
+    "xss": ["<script>alert('xss')</script>", "\"><img src=x onerror=alert(1)>",
+            "javascript:alert(1)", "{{7*7}}", "${7*7}"],
+    "injection": ["'; DROP TABLE users;--", "\" OR \"1\"=\"1", "null", "undefined"],
+    "invisible": ["\u200bZero\u200bWidth", "\u202eRTL override"],
+    "blank": ["", " ", "   "],
+}
+
+
+class TestDataPool:
+    """Pre-generated test data, handed out deterministically so a seed reproduces a run"""
+
+    def __init__(self, seed: int = None, size: int = None, cache_dir: str = None):
+        self.seed = seed if seed is not None else resolve_seed()
+        self.size = size or Config.TEST_DATA_POOL_SIZE
+        self.cache_dir = cache_dir or Config.TEST_DATA_CACHE_DIR
+        self._data = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.cache_dir, f"pool-v{POOL_VERSION}-{self.seed}-{self.size}.json")
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = self._load() or self._build()
+        return self._data
+
+    def build(self) -> "TestDataPool":
+        """Load or generate the pool now instead of on first use, so workers only read the file"""
+        self.data
+        return self
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as pool_file:
+                data = json.load(pool_file)
+            # Mark the pool as recently used, so pruning keeps it
+            os.utime(self.path)
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def _build(self) -> dict:
+        """Generate the pool with Faker; loading its providers is the slow part, so it happens once"""
+        from faker import Faker
+
+        fake = Faker(Config.TEST_DATA_LOCALES)
+        fake.seed_instance(self.seed)
+
+        # Identities stay plain, so "valid checkout" scenarios never depend on the seed
+        identities = [{"first_name": fake.first_name(), "last_name": fake.last_name(),
+                       "postal_code": fake.postcode()} for _ in range(self.size)]
+
+        data = {"seed": self.seed, "version": POOL_VERSION, "identities": identities,
+                "edge_cases": EDGE_CASE_STRINGS}
+        # Workers building the same seed at once write identical files, so a plain atomic replace suffices
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as pool_file:
+            json.dump(data, pool_file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+        logger.info(f"Generated test data pool for seed {self.seed} at {self.path}")
+        self._prune()
+        return data
+
+    def _prune(self, keep: int = None):
+        """Delete all but the most recently used pools; each unseeded run adds one"""
+        keep = Config.TEST_DATA_CACHE_KEEP if keep is None else keep
+        pools = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.startswith("pool-") and name.endswith(".json")]
+        pools.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0, reverse=True)
+        for path in pools[keep:]:
+            if path != self.path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Another worker pruned it first
+                    pass
+
+    def _index(self, key: str, draw: int, count: int) -> int:
+        digest = hashlib.sha256(f"{self.seed}:{key}:{draw}".encode()).hexdigest()
+        return int(digest[:12], 16) % count
+
+    def identity(self, key: str, draw: int = 0) -> dict:
+        """The checkout identity for a scenario's n-th draw.
+
+        Depends only on the seed and the scenario, not on run order or on which worker runs it,
+        so parallel workers need no coordination and a failure is reproduced by its seed alone.
+        """
+        identities = self.data["identities"]
+        return dict(identities[self._index(key, draw, len(identities))])
+
+    def edge_case(self, kind: str, key: str, draw: int = 0) -> str:
+        values = self.data["edge_cases"][kind]
+        return values[self._index(f"{kind}:{key}", draw, len(values))]
+
+    def for_scenario(self, key: str) -> "ScenarioData":
+        return ScenarioData(self, key)
+
+
+class ScenarioData:
+    """A scenario's view of the pool; each call draws the next item for that scenario"""
+
+    def __init__(self, pool: TestDataPool, key: str):
+        self.pool = pool
+        self.key = key
+        self.draws = 0
+
+    def identity(self) -> dict:
+        identity = self.pool.identity(self.key, self.draws)
+        self.draws += 1
+        return identity
+
+    def edge_case(self, kind: str) -> str:
+        value = self.pool.edge_case(kind, self.key, self.draws)
+        self.draws += 1
+        return value
+
+
+def resolve_seed() -> int:
+    """The run's seed: TEST_DATA_SEED if set, else a new one exported for parallel workers"""
+    seed = os.getenv("TEST_DATA_SEED")
+    if not seed:
+        seed = str(random.SystemRandom().randrange(1, 10 ** 9))
+        os.environ["TEST_DATA_SEED"] = seed
+    return int(seed)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate or show the cached test data pool for a seed")
+    parser.add_argument("--seed", type=int, default=None, help="Seed to build (default: TEST_DATA_SEED or new)")
+    parser.add_argument("--size", type=int, default=None, help="Number of checkout identities")
+    parser.add_argument("--show", type=int, default=5, help="How many identities to print")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    pool = TestDataPool(args.seed, args.size)
+    identities = pool.data["identities"]
+    print(f"Seed {pool.seed}: {len(identities)} identities in {pool.path}")
+    for identity in identities[:args.show]:
+        print(f"  {identity['first_name']!r} {identity['last_name']!r} {identity['postal_code']!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())